@@ -5,10 +5,11 @@ from the package namespace: `from jyapystock import StockPriceProvider`.
 """
 
 from .stock_price_provider import StockPriceProvider
+from .models import Quote, BarSeries
 import logging
 
 
-__all__ = ["StockPriceProvider"]
+__all__ = ["StockPriceProvider", "Quote", "BarSeries"]
 
 
 # Create a logger for your library
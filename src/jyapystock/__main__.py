@@ -0,0 +1,3 @@
+from jyapystock.cli import main
+
+main()
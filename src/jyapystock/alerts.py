@@ -0,0 +1,188 @@
+"""
+Price alerts for jyapystock.
+`AlertEngine` keeps the thresholds of every alert in sorted lists per symbol,
+field and direction. A new quote only looks at the thresholds between the previous
+and the new value, found by binary search, so evaluating it costs O(log n + k) for
+k triggered alerts regardless of how many alerts are registered. Attach the engine
+to a `StockPriceProvider` to evaluate every quote it fetches.
+"""
+
+import itertools
+import logging
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+ABOVE = "above"
+BELOW = "below"
+# Quote fields alerts can watch: the last price and the % change from the previous close
+ALERT_FIELDS = ("price", "change_percent")
+
+
+class Alert:
+    """One threshold rule: `field` of `symbol`'s quote crossing `threshold` in `direction`.
+
+    An 'above' alert fires when the value rises to or past the threshold, a 'below' alert
+    when it falls to or past it. With `once=True` (default) the alert is removed after
+    firing; otherwise it fires again on every new crossing.
+    """
+
+    __slots__ = ("id", "symbol", "field", "direction", "threshold", "once", "callback", "data")
+
+    def __init__(self, id: int, symbol: str, field: str, direction: str, threshold: float, once: bool = True,
+                 callback: Optional[Callable[["Alert", dict], None]] = None, data=None):
+        self.id = id
+        self.symbol = symbol
+        self.field = field
+        self.direction = direction
+        self.threshold = threshold
+        self.once = once
+        self.callback = callback
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"Alert({self.id}, {self.symbol} {self.field} {self.direction} {self.threshold})"
+
+
+class AlertEngine:
+    """Indexed alert evaluation for live quotes.
+
+    Register rules with `add` (or `add_move` for "moves more than x%"), then feed quotes
+    with `on_quote(symbol, quote)`, or `attach(provider)` to receive every quote the
+    provider fetches. Triggered alerts are returned and passed to their own callback and
+    to the engine's `callback`.
+    """
+
+    def __init__(self, callback: Optional[Callable[[Alert, dict], None]] = None):
+        self.callback = callback
+        self._alerts: Dict[int, Alert] = {}
+        # (SYMBOL, field, direction) -> sorted [(threshold, id)]
+        self._index: Dict[Tuple[str, str, str], List[Tuple[float, int]]] = {}
+        # (SYMBOL, field) -> last value seen
+        self._last: Dict[Tuple[str, str], float] = {}
+        # SYMBOL -> ids of alerts added while their condition already held
+        self._pending: Dict[str, Set[int]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, symbol: str, direction: str, threshold: float, field: str = "price", once: bool = True,
+            callback: Optional[Callable[[Alert, dict], None]] = None, data=None) -> Alert:
+        """Register an alert, e.g. `add("RELIANCE", "above", 3000)`.
+
+        An alert whose condition already holds for the last value seen fires on the next
+        quote that still satisfies it; otherwise it fires when a quote crosses the threshold.
+        """
+        if direction not in (ABOVE, BELOW):
+            raise ValueError(f"Unknown direction: {direction}. Valid options are: {[ABOVE, BELOW]}")
+        if field not in ALERT_FIELDS:
+            raise ValueError(f"Unknown field: {field}. Valid options are: {list(ALERT_FIELDS)}")
+        symbol = symbol.upper()
+        with self._lock:
+            alert = Alert(next(self._ids), symbol, field, direction, float(threshold), once, callback, data)
+            self._alerts[alert.id] = alert
+            insort(self._index.setdefault((symbol, field, direction), []), (alert.threshold, alert.id))
+            if self._satisfied(alert, self._last.get((symbol, field))):
+                self._pending.setdefault(symbol, set()).add(alert.id)
+        return alert
+
+    def add_move(self, symbol: str, percent: float, **options) -> Tuple[Alert, Alert]:
+        """Alerts for the day's change moving more than `percent` % either way (on `change_percent`)."""
+        return (self.add(symbol, ABOVE, abs(percent), field="change_percent", **options),
+                self.add(symbol, BELOW, -abs(percent), field="change_percent", **options))
+
+    @staticmethod
+    def _satisfied(alert: Alert, value: Optional[float]) -> bool:
+        if value is None:
+            return False
+        return value >= alert.threshold if alert.direction == ABOVE else value <= alert.threshold
+
+    def remove(self, alert: Union[Alert, int]) -> bool:
+        """Unregister an alert (or alert id); returns False if it was not registered."""
+        alert_id = alert.id if isinstance(alert, Alert) else alert
+        with self._lock:
+            return self._drop(alert_id)
+
+    def _drop(self, alert_id: int) -> bool:
+        alert = self._alerts.pop(alert_id, None)
+        if alert is None:
+            return False
+        self._pending.get(alert.symbol, set()).discard(alert_id)
+        entries = self._index[(alert.symbol, alert.field, alert.direction)]
+        i = bisect_left(entries, (alert.threshold, alert.id))
+        if i < len(entries) and entries[i][1] == alert.id:
+            del entries[i]
+        return True
+
+    def alerts(self, symbol: Optional[str] = None) -> List[Alert]:
+        with self._lock:
+            if symbol is None:
+                return list(self._alerts.values())
+            return [a for a in self._alerts.values() if a.symbol == symbol.upper()]
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def _crossed(self, symbol: str, field: str, value: float) -> List[Alert]:
+        """Alerts whose threshold lies between the last value and `value` (caller holds the lock)."""
+        last = self._last.get((symbol, field))
+        self._last[(symbol, field)] = value
+        triggered = []
+        up = self._index.get((symbol, field, ABOVE))
+        if up and (last is None or value > last):
+            # thresholds in (last, value]
+            lo = 0 if last is None else bisect_right(up, (last, float("inf")))
+            hi = bisect_right(up, (value, float("inf")))
+            triggered.extend(self._alerts[i] for _, i in up[lo:hi])
+        down = self._index.get((symbol, field, BELOW))
+        if down and (last is None or value < last):
+            # thresholds in [value, last)
+            lo = bisect_left(down, (value, -1))
+            hi = len(down) if last is None else bisect_left(down, (last, -1))
+            triggered.extend(self._alerts[i] for _, i in down[lo:hi])
+        return triggered
+
+    def on_quote(self, symbol: str, quote: Optional[dict]) -> List[Alert]:
+        """Evaluate one quote (a dict or `Quote` with 'price'/'change_percent') and fire crossed alerts."""
+        if quote is None:
+            return []
+        symbol = symbol.upper()
+        with self._lock:
+            values = {}
+            for field in ALERT_FIELDS:
+                value = quote.get(field)
+                if value is not None and value == value:  # skip missing and NaN values
+                    values[field] = float(value)
+            triggered = []
+            pending = self._pending.get(symbol)
+            if pending:
+                # Alerts stay pending until a quote carries their field
+                for alert_id in [i for i in pending if self._alerts[i].field in values]:
+                    pending.discard(alert_id)
+                    alert = self._alerts[alert_id]
+                    if self._satisfied(alert, values[alert.field]):
+                        triggered.append(alert)
+                if not pending:
+                    del self._pending[symbol]
+            seen = {a.id for a in triggered}
+            for field, value in values.items():
+                triggered.extend(a for a in self._crossed(symbol, field, value) if a.id not in seen)
+            for alert in triggered:
+                if alert.once:
+                    self._drop(alert.id)
+        for alert in triggered:
+            for callback in (alert.callback, self.callback):
+                if callback is not None:
+                    try:
+                        callback(alert, quote)
+                    except Exception as e:
+                        logger.error(f"Alert callback failed for {alert}: {str(e)}")
+        return triggered
+
+    def attach(self, provider):
+        """Evaluate every quote `provider` fetches from now on."""
+        provider.add_quote_listener(self.on_quote)
+
+    def detach(self, provider):
+        provider.remove_quote_listener(self.on_quote)
@@ -3,20 +3,25 @@ Provides live and historical fetchers. Historical function accepts
 `start` and `end` as either `str` (ISO date) or `datetime` and normalizes them.
 """
 import os
-import requests
-from typing import Union
+from typing import Dict, List, Optional, Union
 from datetime import datetime
 from dateutil.parser import parse
+from jyapystock.deadline import Deadline, is_expired
+from jyapystock.http_client import http_get
+from jyapystock.sources import SourceBackend
 
+# Most symbols REALTIME_BULK_QUOTES accepts per call
+BULK_QUOTE_LIMIT = 100
 
-def get_alpha_vantage_live_price(symbol: str, api_key: str) -> dict:
+
+def get_alpha_vantage_live_price(symbol: str, api_key: str, deadline: Optional[Deadline] = None) -> dict:
     """Fetch live quote data including price and change percent.
     
     Returns a dict with 'timestamp', 'price', and 'change_percent', or None if not available.
     """
     url = f"https://www.alphavantage.co/query?function=GLOBAL_QUOTE&symbol={symbol}&apikey={api_key}"
     try:
-        resp = requests.get(url, timeout=10)
+        resp = http_get(url, timeout=10, deadline=deadline)
         data = resp.json()
     except Exception:
         return None
@@ -37,7 +42,47 @@ def get_alpha_vantage_live_price(symbol: str, api_key: str) -> dict:
         return None
 
 
-def get_alpha_vantage_historical_price(symbol: str, start: Union[str, datetime], end: Union[str, datetime], api_key: str) -> list:
+def get_alpha_vantage_live_prices(symbols: List[str], api_key: str, deadline: Optional[Deadline] = None) -> Dict[str, dict]:
+    """Fetch live quotes for many symbols with REALTIME_BULK_QUOTES, up to `BULK_QUOTE_LIMIT` per call.
+
+    Returns a dict mapping each symbol that was quoted to a dict with 'timestamp', 'price' and
+    'change_percent'; symbols missing from the result are left to the per-symbol fetcher. Stops
+    after the first call that returns no data (e.g. the key does not include bulk quotes).
+    """
+    names = {}
+    for symbol in symbols:
+        names.setdefault(symbol.upper(), symbol)
+    batch = list(names)
+    result = {}
+    for i in range(0, len(batch), BULK_QUOTE_LIMIT):
+        if is_expired(deadline):
+            break
+        chunk = ",".join(batch[i:i + BULK_QUOTE_LIMIT])
+        url = f"https://www.alphavantage.co/query?function=REALTIME_BULK_QUOTES&symbol={chunk}&apikey={api_key}"
+        try:
+            resp = http_get(url, timeout=20, deadline=deadline)
+            rows = resp.json().get("data")
+        except Exception:
+            break
+        if not rows:
+            break
+        for row in rows:
+            try:
+                symbol = names.get(str(row["symbol"]).upper())
+                if symbol is None:
+                    continue
+                change_percent = str(row.get("change_percent") or "0").rstrip("%")
+                result[symbol] = {
+                    "timestamp": row.get("timestamp", ""),
+                    "price": float(row["close"]),
+                    "change_percent": round(float(change_percent), 2)
+                }
+            except Exception:
+                continue
+    return result
+
+
+def get_alpha_vantage_historical_price(symbol: str, start: Union[str, datetime], end: Union[str, datetime], api_key: str, deadline: Optional[Deadline] = None) -> list:
     """Fetch historical daily-adjusted data and return list of records.
 
     `start` and `end` may be strings (ISO like '2023-01-01') or datetime objects.
@@ -64,7 +109,7 @@ def get_alpha_vantage_historical_price(symbol: str, start: Union[str, datetime],
 
     url = f"https://www.alphavantage.co/query?function=TIME_SERIES_DAILY_ADJUSTED&symbol={symbol}&outputsize=full&apikey={api_key}"
     try:
-        resp = requests.get(url, timeout=20)
+        resp = http_get(url, timeout=20, deadline=deadline)
         data = resp.json()
     except Exception:
         return None
@@ -97,3 +142,20 @@ def get_alpha_vantage_historical_price(symbol: str, start: Union[str, datetime],
         return prices
     except Exception:
         return []
+
+
+class AlphaVantageBackend(SourceBackend):
+    """Alpha Vantage (USA); enabled only when the provider has an API key."""
+
+    name = "alphavantage"
+    countries = ("usa",)
+    exchanges = ("nasdaq", "nyse")
+
+    def enabled(self, provider):
+        return bool(provider.alpha_vantage_api_key)
+
+    def live_price(self, provider, symbol, deadline):
+        return get_alpha_vantage_live_price(symbol, provider.alpha_vantage_api_key, deadline=deadline)
+
+    def historical_prices(self, provider, symbol, start, end, deadline):
+        return get_alpha_vantage_historical_price(symbol, start, end, provider.alpha_vantage_api_key, deadline=deadline)
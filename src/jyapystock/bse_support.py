@@ -9,6 +9,10 @@ import tempfile
 from typing import Optional, Union
 from datetime import datetime
 from dateutil.parser import parse
+from jyapystock.trading_calendar import get_calendar
+from jyapystock.deadline import Deadline, DeadlineExceeded, is_expired
+from jyapystock.throttle import get_limiter
+from jyapystock.sources import SourceBackend
 
 
 # Global BSE instance
@@ -24,12 +28,19 @@ def _get_bse_instance():
     return _bse_instance
 
 
-def get_bse_live_price(symbol: str) -> Optional[dict]:
+def _limited(fn, deadline: Optional[Deadline] = None):
+    """Run a BSE client call under the shared per-host limit, backing off when BSE throttles."""
+    return get_limiter("bse").call(fn, deadline=deadline)
+
+
+def get_bse_live_price(symbol: str, deadline: Optional[Deadline] = None) -> Optional[dict]:
     """
     Fetch live quote for an Indian stock using BSE API.
     
     Returns a dict with 'timestamp', 'price', and 'change_percent', or None if not available.
     """
+    if is_expired(deadline):
+        return None
     try:
         bse = _get_bse_instance()
         # Convert symbol to scrip code used by BSE
@@ -48,11 +59,11 @@ def get_bse_live_price(symbol: str) -> Optional[dict]:
             except Exception:
                 code = None
 
-        if not code:
+        if not code or is_expired(deadline):
             return None
 
         # quote expects the scrip code
-        result = bse.quote(code)
+        result = _limited(lambda: bse.quote(code), deadline)
         if not result:
             return None
 
@@ -85,13 +96,17 @@ def get_bse_live_price(symbol: str) -> Optional[dict]:
         return None
 
 
-def get_bse_historical_prices(symbol: str, start: Union[str, datetime], end: Union[str, datetime]) -> Optional[list]:
+def get_bse_historical_prices(symbol: str, start: Union[str, datetime], end: Union[str, datetime], deadline: Optional[Deadline] = None) -> Optional[list]:
     """
     Fetch historical prices for an Indian stock from BSE.
     
     `start` and `end` may be strings (ISO like '2023-01-01') or datetime objects.
     Returns a list of records with date/open/high/low/close/volume, or None if not available.
+    Once `deadline` expires the days fetched so far are returned. Request errors (e.g. BSE
+    throttling) are raised rather than skipping the day, so windowed fetches retry the window.
     """
+    if is_expired(deadline):
+        return None
     try:
         # Normalize start/end to date objects
         if isinstance(start, str):
@@ -117,16 +132,30 @@ def get_bse_historical_prices(symbol: str, start: Union[str, datetime], end: Uni
             code = None
 
         records = []
-        # iterate through each date in range inclusive
+        # iterate through each trading day in range inclusive; there is no bhavcopy for weekends and holidays
+        calendar = get_calendar("bse")
         curr = start_dt
         import pandas as _pd
         from datetime import timedelta as _td
         while curr <= end_dt:
+            if is_expired(deadline):
+                logging.error(f"Deadline reached fetching BSE history for {symbol}; stopping at {curr}.")
+                break
+            if not calendar.is_trading_day(curr):
+                curr = curr + _td(days=1)
+                continue
+            try:
+                path = _limited(lambda: bse.bhavcopyReport(curr), deadline)
+            except RuntimeError:
+                # No report published for the day
+                path = None
+            except DeadlineExceeded:
+                logging.error(f"Deadline reached fetching BSE history for {symbol}; stopping at {curr}.")
+                break
+            if path is None:
+                curr = curr + _td(days=1)
+                continue
             try:
-                path = bse.bhavcopyReport(curr)
-                if path is None:
-                    curr = curr + _td(days=1)
-                    continue
                 df = _pd.read_csv(path)
                 # Try to find by FinInstrmId or ticker symbol
                 if code is not None and 'FinInstrmId' in df.columns:
@@ -155,6 +184,9 @@ def get_bse_historical_prices(symbol: str, start: Union[str, datetime], end: Uni
             curr = curr + _td(days=1)
 
         return records if records else None
+    except OSError:
+        # Request failures (connection errors, timeouts, throttling) are not "no data"
+        raise
     except Exception as e:
         logging.error(f"Error fetching historical prices for {symbol} from BSE: {str(e)}")
         return None
@@ -167,3 +199,17 @@ def change_date_format(date_str: str) -> str:
     except Exception as e:
         logging.error(f"Error converting date format: {str(e)}")
         return date_str  # Return original if conversion fails
+
+
+class BSEBackend(SourceBackend):
+    """Bombay Stock Exchange through the `bse` client."""
+
+    name = "bse"
+    countries = ("india",)
+    exchanges = ("bse",)
+
+    def live_price(self, provider, symbol, deadline):
+        return get_bse_live_price(symbol, deadline=deadline)
+
+    def historical_prices(self, provider, symbol, start, end, deadline):
+        return get_bse_historical_prices(symbol, start, end, deadline=deadline)
@@ -0,0 +1,119 @@
+"""
+In-memory caching helpers for jyapystock.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class TTLCache:
+    """Thread-safe in-memory cache where every entry carries its own expiry time.
+
+    With `max_entries`, adding a new key to a full cache evicts entries first (see `_evict`);
+    `on_evict(key)` is called for each of them, outside the cache's lock.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, on_evict: Optional[Callable[[Hashable], None]] = None):
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._data: Dict[Hashable, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for `key`, or `default` if it is missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        """Cache `value` under `key` for `ttl` seconds."""
+        evicted = []
+        with self._lock:
+            if self.max_entries is not None and key not in self._data and len(self._data) >= self.max_entries:
+                evicted = self._evict()
+            self._data[key] = (value, time.time() + ttl)
+        if self.on_evict is not None:
+            for k in evicted:
+                self.on_evict(k)
+
+    def expires_at(self, key: Hashable) -> Optional[float]:
+        """Epoch seconds at which `key` expires, or None if it is not cached."""
+        with self._lock:
+            entry = self._data.get(key)
+            return entry[1] if entry is not None else None
+
+    def keys(self) -> List[Hashable]:
+        """Keys of entries that have not expired yet."""
+        now = time.time()
+        with self._lock:
+            return [k for k, (_, expires_at) in self._data.items() if expires_at > now]
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return entry[0] if entry is not None else default
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def _evict(self) -> List[Hashable]:
+        """Drop expired entries, or the entry closest to expiry if none have expired; returns their keys."""
+        now = time.time()
+        expired = [k for k, (_, expires_at) in self._data.items() if expires_at <= now]
+        if not expired and self._data:
+            expired = [min(self._data, key=lambda k: self._data[k][1])]
+        for k in expired:
+            del self._data[k]
+        return expired
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one.
+
+    While a call for `key` is running, further `do(key, fn)` callers wait for it and
+    share its result (or exception) instead of starting their own.
+    """
+
+    class _Call:
+        __slots__ = ("done", "value", "error")
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.value = None
+            self.error = None
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "SingleFlight._Call"] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = SingleFlight._Call()
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.value = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        if call.error is not None:
+            raise call.error
+        return call.value
@@ -0,0 +1,55 @@
+"""
+Command line entry point for jyapystock.
+
+    jyapystock serve --country USA --port 8050
+"""
+
+import argparse
+import logging
+from typing import List, Optional
+
+
+def _serve(args: argparse.Namespace):
+    from jyapystock.server import serve
+    from jyapystock.stock_price_provider import StockPriceProvider
+
+    provider = StockPriceProvider(
+        country=args.country,
+        source=args.source.split(",") if args.source else None,
+        exchange=args.exchange,
+        alpha_vantage_api_key=args.alpha_vantage_api_key,
+        http_cache=args.http_cache,
+        max_workers=args.max_workers,
+        timeout=args.timeout,
+    )
+    serve(provider, host=args.host, port=args.port, live_ttl=args.live_ttl,
+          history_ttl=args.history_ttl, info_ttl=args.info_ttl)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="jyapystock", description="Live and historical stock prices for Indian and American exchanges.")
+    parser.add_argument("--log-level", default="INFO", help="Logging level (default: INFO)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run a local caching quote service over HTTP")
+    serve_parser.add_argument("--country", required=True, help="'india' or 'usa'")
+    serve_parser.add_argument("--source", help="Comma separated sources in fallback order (default: auto)")
+    serve_parser.add_argument("--exchange", help="Restrict to one exchange, e.g. 'nse' or 'nasdaq'")
+    serve_parser.add_argument("--alpha-vantage-api-key", help="Alpha Vantage key (default: $ALPHAVANTAGE_API_KEY)")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8050, help="Port to listen on (default: 8050)")
+    serve_parser.add_argument("--http-cache", action="store_true", help="Revalidate NASDAQ/NYSE responses with conditional requests")
+    serve_parser.add_argument("--max-workers", type=int, default=4, help="Concurrent upstream fetches per batch (default: 4)")
+    serve_parser.add_argument("--timeout", type=float, help="End-to-end budget in seconds for each upstream lookup")
+    serve_parser.add_argument("--live-ttl", type=float, default=5.0, help="Seconds live quotes are shared between clients (default: 5)")
+    serve_parser.add_argument("--history-ttl", type=float, default=900.0, help="Seconds historical data is cached (default: 900)")
+    serve_parser.add_argument("--info-ttl", type=float, default=3600.0, help="Seconds stock info is cached (default: 3600)")
+    serve_parser.set_defaults(func=_serve)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Deadline budgets for jyapystock.
+A `Deadline` is created once per provider call and passed down to every source and
+symbol-variant attempt, so per-request timeouts shrink to what is left of the
+overall budget and the fallback chain stops once the budget is spent.
+"""
+
+import time
+from typing import Optional, Union
+
+# Shortest per-request timeout handed to a client; below this a request cannot complete anyway
+MIN_REQUEST_TIMEOUT = 0.05
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised by `Deadline.check` once the budget is spent."""
+
+
+class Deadline:
+    """Wall-clock budget measured on the monotonic clock. `timeout=None` means no limit."""
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.expires_at = time.monotonic() + timeout if timeout is not None else None
+
+    @classmethod
+    def coerce(cls, value: Union[None, float, "Deadline"]) -> "Deadline":
+        """Accept a Deadline, a timeout in seconds, or None (unbounded)."""
+        if isinstance(value, Deadline):
+            return value
+        return cls(value)
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None for an unbounded deadline."""
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def timeout(self, default: float) -> float:
+        """Per-request timeout: `default`, capped by the remaining budget."""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        return max(min(default, remaining), MIN_REQUEST_TIMEOUT)
+
+    def check(self):
+        if self.expired():
+            raise DeadlineExceeded("deadline exceeded")
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining()!r})"
+
+
+def request_timeout(deadline: Optional[Deadline], default: float) -> float:
+    """`default` when there is no deadline, otherwise the deadline-capped timeout."""
+    return deadline.timeout(default) if deadline is not None else default
+
+
+def is_expired(deadline: Optional[Deadline]) -> bool:
+    return deadline is not None and deadline.expired()
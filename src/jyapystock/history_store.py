@@ -0,0 +1,143 @@
+"""
+Memory-mapped daily history store for jyapystock.
+Each symbol is one file holding fixed-width, date-sorted columns (date, open,
+high, low, close, volume). Readers memory-map the file and get zero-copy NumPy
+views, so any number of processes share one physical copy via the page cache.
+
+File layout (little endian):
+    64-byte header: magic b"JYAHIST1", uint64 row count, zero padding
+    n x int64   dates as days since 1970-01-01
+    n x float64 open, high, low, close, volume (each a contiguous column, NaN for missing)
+"""
+
+import os
+import struct
+import tempfile
+from datetime import date, datetime
+from typing import Iterable, List, Optional, Union
+import numpy as np
+from dateutil.parser import parse
+
+_MAGIC = b"JYAHIST1"
+_HEADER_SIZE = 64
+_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def _to_day(value: Union[str, date, datetime]) -> np.datetime64:
+    if isinstance(value, str):
+        value = parse(value).date()
+    elif isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, "D")
+
+
+class HistoryView:
+    """Read-only, memory-mapped view of one symbol's history.
+
+    `dates` is a `datetime64[D]` array and `open`/`high`/`low`/`close`/`volume`
+    are `float64` arrays; all of them are views onto the mapped file.
+    """
+
+    def __init__(self, dates: np.ndarray, columns: np.ndarray):
+        self.dates = dates
+        self._columns = columns
+        for i, name in enumerate(_COLUMNS):
+            setattr(self, name, columns[i])
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def slice(self, start: Optional[Union[str, date, datetime]] = None, end: Optional[Union[str, date, datetime]] = None) -> "HistoryView":
+        """Return the rows with start <= date <= end using binary search (no copy)."""
+        lo = int(np.searchsorted(self.dates, _to_day(start), side="left")) if start is not None else 0
+        hi = int(np.searchsorted(self.dates, _to_day(end), side="right")) if end is not None else len(self.dates)
+        return HistoryView(self.dates[lo:hi], self._columns[:, lo:hi])
+
+    def to_records(self) -> List[dict]:
+        """Materialize the view as the list of records returned by `get_historical_price`.
+
+        Whole volumes come back as ints, as the sources report them.
+        """
+        records = []
+        for i in range(len(self.dates)):
+            record = {"date": str(self.dates[i])}
+            for c, name in enumerate(_COLUMNS):
+                value = float(self._columns[c, i])
+                if np.isnan(value):
+                    value = None
+                elif name == "volume" and value.is_integer():
+                    value = int(value)
+                record[name] = value
+            records.append(record)
+        return records
+
+
+class HistoryStore:
+    """Directory of per-symbol history files that can be shared across processes."""
+
+    def __init__(self, root: str):
+        self.root = os.path.expanduser(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, symbol: str) -> str:
+        safe_symbol = "".join(c if c.isalnum() or c in "-_." else "_" for c in symbol.upper())
+        return os.path.join(self.root, f"{safe_symbol}.hist")
+
+    def open(self, symbol: str) -> Optional[HistoryView]:
+        """Memory-map the history of `symbol`, or return None if nothing is stored."""
+        path = self.path(symbol)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as fh:
+            header = fh.read(_HEADER_SIZE)
+        if len(header) < _HEADER_SIZE or header[:8] != _MAGIC:
+            raise ValueError(f"Not a jyapystock history file: {path}")
+        (rows,) = struct.unpack_from("<Q", header, 8)
+        if rows == 0:
+            return HistoryView(np.empty(0, dtype="datetime64[D]"), np.empty((len(_COLUMNS), 0)))
+        raw = np.memmap(path, dtype="<i8", mode="r", offset=_HEADER_SIZE, shape=(len(_COLUMNS) + 1, rows))
+        return HistoryView(raw[0].view("datetime64[D]"), raw[1:].view("<f8"))
+
+    def read(self, symbol: str, start: Optional[Union[str, date, datetime]] = None, end: Optional[Union[str, date, datetime]] = None) -> Optional[HistoryView]:
+        """Open `symbol` and slice it to [start, end]."""
+        view = self.open(symbol)
+        if view is None:
+            return None
+        return view.slice(start, end)
+
+    def write(self, symbol: str, records: Iterable[dict], merge: bool = True):
+        """Store daily records (as returned by `get_historical_price`) for `symbol`.
+
+        With `merge`, the records are combined with what is already stored, new
+        values winning for dates present in both. The file is replaced atomically,
+        so readers holding an older mapping keep seeing consistent data.
+        """
+        by_day = {}
+        if merge:
+            existing = self.open(symbol)
+            if existing is not None:
+                for i, day in enumerate(existing.dates.astype("int64")):
+                    by_day[int(day)] = existing._columns[:, i].copy()
+        for record in records:
+            day = int(_to_day(record["date"]).astype("int64"))
+            values = np.array([np.nan if record.get(name) is None else float(record[name]) for name in _COLUMNS])
+            by_day[day] = values
+
+        days = np.array(sorted(by_day), dtype="<i8")
+        columns = np.empty((len(_COLUMNS), len(days)), dtype="<f8")
+        for i, day in enumerate(days):
+            columns[:, i] = by_day[int(day)]
+
+        header = _MAGIC + struct.pack("<Q", len(days))
+        header += b"\0" * (_HEADER_SIZE - len(header))
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(header)
+                fh.write(days.tobytes())
+                fh.write(columns.tobytes())
+            os.replace(tmp_path, self.path(symbol))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
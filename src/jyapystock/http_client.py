@@ -0,0 +1,211 @@
+"""
+HTTP helpers for jyapystock's JSON sources (NASDAQ, NYSE).
+`http_get` is a drop-in for `requests.get`. When it is given an `HTTPCache` (a
+provider's own `http_cache`) or one is installed process-wide with `set_http_cache`,
+responses are stored with their validators (ETag, Last-Modified, Cache-Control
+max-age), fresh entries are served locally and stale ones are revalidated with
+conditional requests, so unchanged bodies are not re-downloaded. Requests that do
+go upstream pass through the per-host limiter from `jyapystock.throttle`.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import requests
+from jyapystock.deadline import Deadline, request_timeout
+from jyapystock.throttle import get_limiter
+
+logger = logging.getLogger(__name__)
+
+
+_UNPARSED = object()
+
+
+def _copy_json(value: Any) -> Any:
+    """Copy a parsed JSON value; only dicts and lists are mutable, so nothing else is copied."""
+    if isinstance(value, dict):
+        return {k: _copy_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(v) for v in value]
+    return value
+
+
+class _Entry:
+    __slots__ = ("content", "headers", "url", "etag", "last_modified", "expires_at", "parsed", "parse_lock")
+
+    def __init__(self, response: requests.Response, expires_at: float):
+        self.content = response.content
+        self.headers = dict(response.headers)
+        self.url = response.url
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.expires_at = expires_at
+        # Parsed body, shared by every hit and 304 on this entry; a changed body gets a new entry
+        self.parsed = _UNPARSED
+        self.parse_lock = threading.Lock()
+
+    def json(self) -> Any:
+        if self.parsed is _UNPARSED:
+            with self.parse_lock:
+                if self.parsed is _UNPARSED:
+                    self.parsed = json.loads(self.content)
+        return self.parsed
+
+
+class CachedResponse:
+    """Minimal `requests.Response` stand-in for a body served from the cache.
+
+    The body is parsed once per entry; `json()` hands out a copy of it, so each caller
+    gets its own objects.
+    """
+
+    status_code = 200
+    ok = True
+
+    def __init__(self, entry: _Entry):
+        self._entry = entry
+        self.headers = entry.headers
+        self.url = entry.url
+
+    def __bool__(self) -> bool:
+        return True
+
+    @property
+    def content(self) -> bytes:
+        return self._entry.content
+
+    @property
+    def text(self) -> str:
+        return self._entry.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return _copy_json(self._entry.json())
+
+    def raise_for_status(self):
+        return None
+
+
+def _max_age(headers) -> Optional[float]:
+    """Freshness lifetime from Cache-Control; None when the response must not be stored."""
+    cache_control = headers.get("Cache-Control", "")
+    directives = {}
+    for part in cache_control.split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    if "max-age" in directives:
+        try:
+            return max(float(directives["max-age"]), 0.0)
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+class HTTPCache:
+    """In-memory HTTP cache keyed by URL and query parameters.
+
+    `default_max_age` applies when a response carries validators but no
+    Cache-Control max-age; it defaults to 0, i.e. every reuse is revalidated.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_max_age: float = 0.0):
+        self.max_entries = max_entries
+        self.default_max_age = default_max_age
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(url: str, params: Optional[Dict[str, Any]]) -> tuple:
+        return (url, tuple(sorted((params or {}).items())))
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, timeout: float = 10, deadline: Optional[Deadline] = None, **kwargs):
+        key = self._key(url, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and entry.expires_at > time.time():
+            return CachedResponse(entry)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.etag:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request_headers["If-Modified-Since"] = entry.last_modified
+        response = _limited_get(url, params=params, headers=request_headers, timeout=timeout, deadline=deadline, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            max_age = _max_age(response.headers)
+            entry.expires_at = time.time() + (max_age if max_age else self.default_max_age)
+            return CachedResponse(entry)
+        if response.status_code == 200:
+            entry = self._store(key, response)
+            if entry is not None:
+                return CachedResponse(entry)
+        return response
+
+    def _store(self, key: tuple, response: requests.Response) -> Optional[_Entry]:
+        max_age = _max_age(response.headers)
+        if max_age is None:
+            return None
+        if not max_age and not (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            # Neither fresh for a while nor revalidatable: nothing to gain from keeping it
+            return None
+        entry = _Entry(response, time.time() + (max_age or self.default_max_age))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _limited_get(url: str, timeout: float = 10, deadline: Optional[Deadline] = None, **kwargs):
+    """`requests.get` under the host's concurrency/rate limit, with `timeout` capped by `deadline`.
+
+    Throttling statuses (the host's `throttle_statuses`) and timeouts that used the full `timeout`
+    make the host back off; a timeout cut short by the deadline does not.
+    """
+    limiter = get_limiter(url)
+    return limiter.call(lambda: requests.get(url, timeout=request_timeout(deadline, timeout), **kwargs),
+                        deadline=deadline, is_throttled=limiter.throttled_response, timeout=timeout)
+
+
+# Process-wide cache used by http_get when no cache is passed; None disables caching
+_http_cache: Optional[HTTPCache] = None
+
+
+def set_http_cache(cache: Optional[HTTPCache]):
+    """Install (or with None, remove) the process-wide HTTP cache used by the NASDAQ and NYSE fetchers.
+
+    It applies to every provider in the process that has no `http_cache` of its own.
+    """
+    global _http_cache
+    _http_cache = cache
+
+
+def get_http_cache() -> Optional[HTTPCache]:
+    return _http_cache
+
+
+def http_get(url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, timeout: float = 10, deadline: Optional[Deadline] = None, cache: Optional[HTTPCache] = None, **kwargs):
+    """GET `url` through `cache` (default: the process-wide HTTPCache, if installed) and the host's request limiter.
+
+    `timeout` is the full per-request timeout; it is capped by `deadline`'s remaining budget here.
+    """
+    cache = cache if cache is not None else _http_cache
+    if cache is not None:
+        return cache.get(url, params=params, headers=headers, timeout=timeout, deadline=deadline, **kwargs)
+    return _limited_get(url, params=params, headers=headers, timeout=timeout, deadline=deadline, **kwargs)
@@ -0,0 +1,402 @@
+"""
+Technical indicators for jyapystock.
+
+Two complementary entry points:
+
+* Panel functions (`sma`, `ema`, `rsi`, `atr`, `volatility`, `rolling_high`,
+  `rolling_low`) work on NumPy arrays shaped (dates, symbols) and compute an
+  indicator for every symbol at once. `build_panel` turns per-symbol histories
+  (as returned by `get_historical_price`) into such date-aligned arrays; NaN
+  rows (a later listing, a missing bar) are skipped per symbol.
+* `IndicatorEngine` keeps per-symbol running state so each new bar updates
+  SMA/EMA/RSI/ATR/volatility/rolling high-low in O(1) instead of recomputing
+  the whole window.
+"""
+
+import math
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def build_panel(histories: Dict[str, Sequence[dict]], fields: Iterable[str] = ("open", "high", "low", "close", "volume")) -> Tuple[np.ndarray, List[str], Dict[str, np.ndarray]]:
+    """Align per-symbol daily records on the union of their dates.
+
+    Returns (dates, symbols, panels) where `dates` is a sorted `datetime64[D]`
+    array, `symbols` the column order and `panels[field]` a float64 array shaped
+    (len(dates), len(symbols)) with NaN where a symbol has no bar.
+    """
+    symbols = [s for s, records in histories.items() if records]
+    all_dates = sorted({r["date"][:10] for s in symbols for r in histories[s]})
+    dates = np.array(all_dates, dtype="datetime64[D]")
+    row_of = {d: i for i, d in enumerate(all_dates)}
+    fields = list(fields)
+    panels = {f: np.full((len(dates), len(symbols)), np.nan) for f in fields}
+    for col, symbol in enumerate(symbols):
+        for record in histories[symbol]:
+            row = row_of[record["date"][:10]]
+            for f in fields:
+                value = record.get(f)
+                if value is not None:
+                    panels[f][row, col] = value
+    return dates, symbols, panels
+
+
+def _as_2d(values) -> Tuple[np.ndarray, bool]:
+    arr = np.asarray(values, dtype=float)
+    if arr.ndim == 1:
+        return arr[:, None], True
+    return arr, False
+
+
+def _restore(arr: np.ndarray, squeeze: bool) -> np.ndarray:
+    return arr[:, 0] if squeeze else arr
+
+
+def _on_valid(fn, arrays: Sequence[np.ndarray], *args) -> np.ndarray:
+    """Run the dense kernel `fn(*arrays, *args)` over each column's valid rows only.
+
+    Rows where any input is NaN (before a listing, or a day a symbol has no bar in a
+    panel aligned on the union of dates) are left out: each column's valid values are
+    packed to the top, so every column starts at its own first observation and windows
+    span consecutive observations across gaps. Results are scattered back to the
+    original rows; skipped rows are NaN.
+    """
+    mask = ~np.isnan(arrays[0])
+    for arr in arrays[1:]:
+        mask &= ~np.isnan(arr)
+    if mask.all():
+        return fn(*arrays, *args)
+    rank = np.cumsum(mask, axis=0) - 1
+    rows, cols = np.nonzero(mask)
+    packed_rows = rank[rows, cols]
+    depth = int(mask.sum(axis=0).max()) if mask.any() else 0
+    packed = []
+    for arr in arrays:
+        dense = np.full((depth, arr.shape[1]), np.nan)
+        dense[packed_rows, cols] = arr[rows, cols]
+        packed.append(dense)
+    out = np.full(arrays[0].shape, np.nan)
+    if depth:
+        out[rows, cols] = fn(*packed, *args)[packed_rows, cols]
+    return out
+
+
+def _sma(arr: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(arr.shape, np.nan)
+    if len(arr) >= window:
+        csum = np.cumsum(np.vstack([np.zeros((1, arr.shape[1])), arr]), axis=0)
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def sma(values, window: int) -> np.ndarray:
+    """Simple moving average along axis 0 over the last `window` valid values of each column.
+
+    NaN until a column has `window` observations; NaN rows are skipped rather than poisoning later values.
+    """
+    arr, squeeze = _as_2d(values)
+    return _restore(_on_valid(_sma, (arr,), window), squeeze)
+
+
+def _ema(arr: np.ndarray, span: int) -> np.ndarray:
+    alpha = 2.0 / (span + 1)
+    out = np.empty(arr.shape)
+    if len(arr):
+        out[0] = arr[0]
+        for t in range(1, len(arr)):
+            out[t] = alpha * arr[t] + (1 - alpha) * out[t - 1]
+    return out
+
+
+def ema(values, span: int) -> np.ndarray:
+    """Exponential moving average (alpha = 2 / (span + 1)) seeded with each column's first valid value."""
+    arr, squeeze = _as_2d(values)
+    return _restore(_on_valid(_ema, (arr,), span), squeeze)
+
+
+def _wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder smoothing: SMA of the first `period` values, then avg = (avg * (p - 1) + x) / p."""
+    out = np.full(values.shape, np.nan)
+    if len(values) < period:
+        return out
+    out[period - 1] = values[:period].mean(axis=0)
+    for t in range(period, len(values)):
+        out[t] = (out[t - 1] * (period - 1) + values[t]) / period
+    return out
+
+
+def _rsi(arr: np.ndarray, period: int) -> np.ndarray:
+    out = np.full(arr.shape, np.nan)
+    if len(arr) > period:
+        change = np.diff(arr, axis=0)
+        avg_gain = _wilder(np.clip(change, 0, None), period)
+        avg_loss = _wilder(np.clip(-change, 0, None), period)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = avg_gain / avg_loss
+            out[1:] = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + rs))
+        out[1:period] = np.nan
+    return out
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing; NaN for each column's first `period` closes."""
+    arr, squeeze = _as_2d(close)
+    return _restore(_on_valid(_rsi, (arr,), period), squeeze)
+
+
+def _atr(h: np.ndarray, l: np.ndarray, c: np.ndarray, period: int) -> np.ndarray:
+    out = np.full(c.shape, np.nan)
+    if len(c) > period:
+        prev_close = c[:-1]
+        true_range = np.maximum(h[1:] - l[1:], np.maximum(np.abs(h[1:] - prev_close), np.abs(l[1:] - prev_close)))
+        out[1:] = _wilder(true_range, period)
+    return out
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range with Wilder smoothing; NaN for each column's first `period` bars."""
+    h, squeeze = _as_2d(high)
+    l, _ = _as_2d(low)
+    c, _ = _as_2d(close)
+    return _restore(_on_valid(_atr, (h, l, c), period), squeeze)
+
+
+def _volatility(arr: np.ndarray, window: int) -> np.ndarray:
+    out = np.full(arr.shape, np.nan)
+    if len(arr) > window:
+        returns = np.diff(np.log(arr), axis=0)
+        mean = _sma(returns, window)
+        mean_sq = _sma(returns * returns, window)
+        variance = np.clip((mean_sq - mean * mean) * window / (window - 1), 0, None)
+        out[1:] = np.sqrt(variance)
+    return out
+
+
+def volatility(close, window: int = 20, annualize: bool = True,
+               periods_per_year: float = TRADING_DAYS_PER_YEAR) -> np.ndarray:
+    """Rolling sample standard deviation of log returns over `window` returns.
+
+    Returns are taken between consecutive valid closes of each column, so a missing bar
+    or a later listing only delays that column. Annualizing scales by sqrt(`periods_per_year`),
+    the number of bars per year (252 for daily bars).
+    """
+    arr, squeeze = _as_2d(close)
+    out = _on_valid(_volatility, (arr,), window)
+    if annualize:
+        out *= math.sqrt(periods_per_year)
+    return _restore(out, squeeze)
+
+
+def _rolling_extreme_dense(arr: np.ndarray, window: int, reducer) -> np.ndarray:
+    out = np.full(arr.shape, np.nan)
+    if len(arr) >= window:
+        view = np.lib.stride_tricks.sliding_window_view(arr, window, axis=0)
+        out[window - 1:] = reducer(view, axis=-1)
+    return out
+
+
+def _rolling_extreme(values, window: int, reducer) -> np.ndarray:
+    arr, squeeze = _as_2d(values)
+    return _restore(_on_valid(_rolling_extreme_dense, (arr,), window, reducer), squeeze)
+
+
+def rolling_high(values, window: int = TRADING_DAYS_PER_YEAR) -> np.ndarray:
+    """Rolling maximum over the last `window` valid values (52-week high for daily highs by default)."""
+    return _rolling_extreme(values, window, np.max)
+
+
+def rolling_low(values, window: int = TRADING_DAYS_PER_YEAR) -> np.ndarray:
+    """Rolling minimum over the last `window` valid values (52-week low for daily lows by default)."""
+    return _rolling_extreme(values, window, np.min)
+
+
+def last_sma(values: Sequence[float], window: int) -> float:
+    """Mean of the last `window` values, or NaN if there are fewer than `window`."""
+    if len(values) < window:
+        return math.nan
+    return float(np.mean(np.asarray(values[-window:], dtype=float)))
+
+
+class _SMA:
+    __slots__ = ("window", "values", "total")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+
+    def update(self, x: float) -> float:
+        self.values.append(x)
+        self.total += x
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+        return self.total / self.window if len(self.values) == self.window else math.nan
+
+
+class _EMA:
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self.value = None
+
+    def update(self, x: float) -> float:
+        self.value = x if self.value is None else self.alpha * x + (1 - self.alpha) * self.value
+        return self.value
+
+
+class _Wilder:
+    __slots__ = ("period", "count", "total", "value")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.total = 0.0
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        if self.count < self.period:
+            self.count += 1
+            self.total += x
+            if self.count == self.period:
+                self.value = self.total / self.period
+        else:
+            self.value = (self.value * (self.period - 1) + x) / self.period
+        return self.value
+
+
+class _RollingVariance:
+    """Sample variance over the last `window` values using running sums."""
+
+    __slots__ = ("window", "values", "total", "total_sq")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def update(self, x: float) -> float:
+        self.values.append(x)
+        self.total += x
+        self.total_sq += x * x
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+        n = len(self.values)
+        if n < self.window:
+            return math.nan
+        return max((self.total_sq - self.total * self.total / n) / (n - 1), 0.0)
+
+
+class _RollingExtreme:
+    """Rolling max (or min) with a monotonic deque: amortized O(1) per update.
+
+    NaN until `window` values have been seen, like `rolling_high`/`rolling_low`.
+    """
+
+    __slots__ = ("window", "sign", "items", "index")
+
+    def __init__(self, window: int, maximum: bool):
+        self.window = window
+        self.sign = 1.0 if maximum else -1.0
+        self.items = deque()
+        self.index = 0
+
+    def update(self, x: float) -> float:
+        key = self.sign * x
+        while self.items and self.items[-1][1] <= key:
+            self.items.pop()
+        self.items.append((self.index, key))
+        if self.items[0][0] <= self.index - self.window:
+            self.items.popleft()
+        self.index += 1
+        if self.index < self.window:
+            return math.nan
+        return self.sign * self.items[0][1]
+
+
+class _SymbolState:
+    def __init__(self, sma_windows, ema_spans, rsi_period, atr_period, volatility_window, high_low_window):
+        self.sma = {w: _SMA(w) for w in sma_windows}
+        self.ema = {s: _EMA(s) for s in ema_spans}
+        self.rsi_gain = _Wilder(rsi_period)
+        self.rsi_loss = _Wilder(rsi_period)
+        self.atr = _Wilder(atr_period)
+        self.returns = _RollingVariance(volatility_window)
+        self.high = _RollingExtreme(high_low_window, maximum=True)
+        self.low = _RollingExtreme(high_low_window, maximum=False)
+        self.prev_close = None
+        self.values: Dict[str, float] = {}
+
+
+class IndicatorEngine:
+    """Incrementally maintained indicators for many symbols.
+
+    Seed each symbol once with its history, then call `update` with every new
+    daily bar; each update costs O(1) per indicator regardless of window size.
+    """
+
+    def __init__(self, sma_windows: Iterable[int] = (20, 50, 200), ema_spans: Iterable[int] = (12, 26),
+                 rsi_period: int = 14, atr_period: int = 14, volatility_window: int = 20,
+                 high_low_window: int = TRADING_DAYS_PER_YEAR):
+        self._config = (tuple(sma_windows), tuple(ema_spans), rsi_period, atr_period, volatility_window, high_low_window)
+        self._states: Dict[str, _SymbolState] = {}
+
+    def seed(self, symbol: str, records: Iterable[dict]) -> Dict[str, float]:
+        """Reset `symbol` and replay its daily history (oldest first)."""
+        self._states.pop(symbol, None)
+        values = {}
+        for record in records:
+            values = self.update(symbol, record)
+        return values
+
+    def update(self, symbol: str, bar: dict) -> Dict[str, float]:
+        """Feed the next daily bar (with 'close' and optionally 'high'/'low') and return the indicators."""
+        state = self._states.get(symbol)
+        if state is None:
+            state = self._states[symbol] = _SymbolState(*self._config)
+        close = float(bar["close"])
+        high = float(bar["high"]) if bar.get("high") is not None else close
+        low = float(bar["low"]) if bar.get("low") is not None else close
+        values = {}
+        for window, s in state.sma.items():
+            values[f"sma_{window}"] = s.update(close)
+        for span, e in state.ema.items():
+            values[f"ema_{span}"] = e.update(close)
+
+        prev = state.prev_close
+        if prev is None:
+            values["rsi"] = math.nan
+            values["atr"] = math.nan
+            values["volatility"] = math.nan
+        else:
+            change = close - prev
+            gain = state.rsi_gain.update(max(change, 0.0))
+            loss = state.rsi_loss.update(max(-change, 0.0))
+            if math.isnan(gain) or math.isnan(loss):
+                values["rsi"] = math.nan
+            else:
+                values["rsi"] = 100.0 if loss == 0 else 100.0 - 100.0 / (1.0 + gain / loss)
+            true_range = max(high - low, abs(high - prev), abs(low - prev))
+            values["atr"] = state.atr.update(true_range)
+            variance = state.returns.update(math.log(close / prev)) if prev > 0 and close > 0 else math.nan
+            values["volatility"] = math.sqrt(variance * TRADING_DAYS_PER_YEAR) if not math.isnan(variance) else math.nan
+        values["high_52w"] = state.high.update(high)
+        values["low_52w"] = state.low.update(low)
+
+        state.prev_close = close
+        state.values = values
+        return values
+
+    def values(self, symbol: str) -> Optional[Dict[str, float]]:
+        """Latest indicator values for `symbol`, or None if it has not been seeded."""
+        state = self._states.get(symbol)
+        return dict(state.values) if state is not None else None
+
+    def symbols(self) -> List[str]:
+        return list(self._states)
@@ -0,0 +1,182 @@
+"""
+Intraday bar cache for jyapystock.
+Keeps intraday bars per (symbol, interval) in memory and, optionally, in
+append-only JSON Lines files on disk so a refresh only has to fetch bars newer
+than the last cached one.
+"""
+
+import json
+import logging
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+from dateutil.parser import parse
+
+logger = logging.getLogger(__name__)
+
+# Supported intraday intervals and their length in minutes
+INTRADAY_INTERVALS = {
+    "1m": 1,
+    "2m": 2,
+    "5m": 5,
+    "15m": 15,
+    "30m": 30,
+    "60m": 60,
+    "1h": 60,
+    "90m": 90,
+}
+
+
+def to_epoch(value: Union[str, datetime]) -> float:
+    """Convert an ISO string or datetime to epoch seconds (naive values are local time)."""
+    if isinstance(value, str):
+        value = parse(value)
+    return value.timestamp()
+
+
+class _Entry:
+    """Bars for one (symbol, interval) kept sorted by time with a parallel epoch index."""
+
+    def __init__(self):
+        self.bars: List[dict] = []
+        self.epochs: List[float] = []
+        # Number of lines in the on-disk file, used to decide when to compact it
+        self.disk_lines = 0
+
+
+class IntradayBarCache:
+    """Append-only cache of intraday bars keyed by (symbol, interval).
+
+    Bars are dicts with 'datetime' (ISO string with UTC offset), 'open', 'high',
+    'low', 'close' and 'volume'. When `cache_dir` is given, bars are also written
+    to `<cache_dir>/<SYMBOL>_<interval>.jsonl` and reloaded lazily on first use.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, symbol: str, interval: str) -> str:
+        safe_symbol = "".join(c if c.isalnum() or c in "-_." else "_" for c in symbol.upper())
+        return os.path.join(self.cache_dir, f"{safe_symbol}_{interval}.jsonl")
+
+    def _entry(self, symbol: str, interval: str) -> _Entry:
+        key = (symbol.upper(), interval)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = _Entry()
+            if self.cache_dir:
+                self._load(entry, self._path(symbol, interval))
+            self._entries[key] = entry
+        return entry
+
+    def _load(self, entry: _Entry, path: str):
+        if not os.path.exists(path):
+            return
+        by_epoch = {}
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    entry.disk_lines += 1
+                    try:
+                        bar = json.loads(line)
+                        # Later lines override earlier ones for the same bar
+                        by_epoch[to_epoch(bar["datetime"])] = bar
+                    except Exception:
+                        logger.error(f"Skipping malformed cached bar in {path}: {line}")
+        except OSError as e:
+            logger.error(f"Failed to read intraday cache file {path}: {str(e)}")
+            return
+        entry.epochs = sorted(by_epoch)
+        entry.bars = [by_epoch[e] for e in entry.epochs]
+
+    def get(self, symbol: str, interval: str, start: Optional[Union[str, datetime]] = None, end: Optional[Union[str, datetime]] = None) -> List[dict]:
+        """Return cached bars for `symbol`/`interval`, optionally limited to [start, end]."""
+        with self._lock:
+            entry = self._entry(symbol, interval)
+            lo = bisect_left(entry.epochs, to_epoch(start)) if start is not None else 0
+            hi = bisect_right(entry.epochs, to_epoch(end)) if end is not None else len(entry.epochs)
+            return list(entry.bars[lo:hi])
+
+    def first_timestamp(self, symbol: str, interval: str) -> Optional[float]:
+        """Epoch seconds of the oldest cached bar, or None if nothing is cached."""
+        with self._lock:
+            entry = self._entry(symbol, interval)
+            return entry.epochs[0] if entry.epochs else None
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[float]:
+        """Epoch seconds of the newest cached bar, or None if nothing is cached."""
+        with self._lock:
+            entry = self._entry(symbol, interval)
+            return entry.epochs[-1] if entry.epochs else None
+
+    def merge(self, symbol: str, interval: str, bars: List[dict]):
+        """Merge freshly fetched bars into the cache.
+
+        New bars replace cached bars with the same timestamp (the last bar of a
+        running session is usually still forming), everything else is appended.
+        """
+        if not bars:
+            return
+        incoming = []
+        for bar in bars:
+            try:
+                incoming.append((to_epoch(bar["datetime"]), bar))
+            except Exception:
+                logger.error(f"Skipping intraday bar without a valid datetime for {symbol}: {bar}")
+        incoming.sort(key=lambda item: item[0])
+        with self._lock:
+            entry = self._entry(symbol, interval)
+            if entry.epochs and incoming and incoming[0][0] > entry.epochs[-1]:
+                # Fast path: pure append
+                entry.epochs.extend(e for e, _ in incoming)
+                entry.bars.extend(b for _, b in incoming)
+            else:
+                by_epoch = dict(zip(entry.epochs, entry.bars))
+                by_epoch.update(incoming)
+                entry.epochs = sorted(by_epoch)
+                entry.bars = [by_epoch[e] for e in entry.epochs]
+            if self.cache_dir:
+                self._persist(entry, symbol, interval, [b for _, b in incoming])
+
+    def _persist(self, entry: _Entry, symbol: str, interval: str, new_bars: List[dict]):
+        path = self._path(symbol, interval)
+        try:
+            if entry.disk_lines + len(new_bars) > 2 * len(entry.bars):
+                # Too many superseded lines, rewrite the file compactly
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as fh:
+                    for bar in entry.bars:
+                        fh.write(json.dumps(bar) + "\n")
+                os.replace(tmp_path, path)
+                entry.disk_lines = len(entry.bars)
+            else:
+                with open(path, "a", encoding="utf-8") as fh:
+                    for bar in new_bars:
+                        fh.write(json.dumps(bar) + "\n")
+                entry.disk_lines += len(new_bars)
+        except OSError as e:
+            logger.error(f"Failed to write intraday cache file {path}: {str(e)}")
+
+    def clear(self, symbol: Optional[str] = None, interval: Optional[str] = None):
+        """Drop cached bars (all of them, or only those matching `symbol`/`interval`)."""
+        with self._lock:
+            keys = [k for k in self._entries
+                    if (symbol is None or k[0] == symbol.upper()) and (interval is None or k[1] == interval)]
+            if symbol is not None and interval is not None:
+                # The entry may live only on disk if it was never loaded
+                keys = list(set(keys) | {(symbol.upper(), interval)})
+            for key in keys:
+                self._entries.pop(key, None)
+                if self.cache_dir:
+                    path = self._path(key[0], key[1])
+                    if os.path.exists(path):
+                        os.remove(path)
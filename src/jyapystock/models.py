@@ -0,0 +1,261 @@
+"""
+Compact result types for jyapystock.
+`Quote` is a slotted replacement for the live-price dict and `BarSeries` stores
+daily OHLCV bars in contiguous typed arrays. Both keep dict/list style access so
+code written against the plain dict results keeps working. `ListingTable` holds an
+exchange-wide quote snapshot column-wise.
+"""
+
+import math
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Union
+
+_QUOTE_FIELDS = ("timestamp", "price", "change_percent")
+_BAR_FIELDS = ("date", "open", "high", "low", "close", "volume")
+_PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+
+# Upper bounds (USD) of the small, mid and large cap tiers; anything above is mega cap
+MARKET_CAP_BOUNDS = (2_000_000_000, 10_000_000_000, 200_000_000_000)
+MARKET_CAP_TYPES = ("small_cap", "mid_cap", "large_cap", "mega_cap")
+
+
+def market_cap_type(market_cap: Optional[object]) -> str:
+    """Classify a market capitalization as 'small_cap'/'mid_cap'/'large_cap'/'mega_cap', or 'N/A'."""
+    if not isinstance(market_cap, (int, float)) or math.isnan(market_cap):
+        return "N/A"
+    return MARKET_CAP_TYPES[bisect_right(MARKET_CAP_BOUNDS, market_cap)]
+
+
+class Quote(Mapping):
+    """Live quote with 'timestamp', 'price' and 'change_percent'.
+
+    Behaves like a read-mostly dict: `quote["price"]`, `quote.get(...)`, `dict(quote)`
+    and comparison against plain dicts all work.
+    """
+
+    __slots__ = _QUOTE_FIELDS
+
+    def __init__(self, timestamp=None, price: Optional[float] = None, change_percent: Optional[float] = None):
+        self.timestamp = timestamp
+        self.price = price
+        self.change_percent = change_percent
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> Optional["Quote"]:
+        if data is None:
+            return None
+        if isinstance(data, Quote):
+            return data
+        return cls(data.get("timestamp"), data.get("price"), data.get("change_percent"))
+
+    def __getitem__(self, key):
+        if key not in _QUOTE_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in _QUOTE_FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_QUOTE_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_QUOTE_FIELDS)
+
+    def to_dict(self) -> dict:
+        return {k: getattr(self, k) for k in _QUOTE_FIELDS}
+
+    def __repr__(self) -> str:
+        return f"Quote(timestamp={self.timestamp!r}, price={self.price!r}, change_percent={self.change_percent!r})"
+
+
+def _to_float(value) -> float:
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _from_float(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _from_volume(value: float) -> Union[int, float, None]:
+    """Volume back as the int the sources report; a fractional value (e.g. traded value) stays a float."""
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+class BarSeries(Sequence):
+    """Daily OHLCV bars stored column-wise in typed arrays.
+
+    Dates are kept as proleptic Gregorian ordinals (`array('q')`) and prices and
+    volume as doubles (`array('d')`), missing values as NaN. Indexing returns a
+    plain record dict, with whole volumes as ints, (`date`/`open`/`high`/`low`/`close`/`volume`), slicing
+    returns another `BarSeries`, so the series can be used wherever the list of
+    records returned by `get_historical_price` was used.
+    """
+
+    __slots__ = ("dates",) + _PRICE_FIELDS
+
+    def __init__(self):
+        self.dates = array("q")
+        self.open = array("d")
+        self.high = array("d")
+        self.low = array("d")
+        self.close = array("d")
+        self.volume = array("d")
+
+    @classmethod
+    def from_records(cls, records: Optional[Iterable[dict]]) -> Optional["BarSeries"]:
+        if records is None:
+            return None
+        if isinstance(records, BarSeries):
+            return records
+        series = cls()
+        for record in records:
+            series.append(record)
+        return series
+
+    def append(self, record: dict):
+        """Append one record with a 'date' ('yyyy-mm-dd' string or date) and OHLCV values."""
+        day = record["date"]
+        if isinstance(day, str):
+            day = date.fromisoformat(day[:10])
+        self.dates.append(day.toordinal())
+        for field in _PRICE_FIELDS:
+            getattr(self, field).append(_to_float(record.get(field)))
+
+    def extend(self, records: Iterable[dict]):
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            series = BarSeries()
+            for field in self.__slots__:
+                setattr(series, field, getattr(self, field)[index])
+            return series
+        if index < 0:
+            index += len(self.dates)
+        if not 0 <= index < len(self.dates):
+            raise IndexError("BarSeries index out of range")
+        record = {"date": date.fromordinal(self.dates[index]).isoformat()}
+        for field in _PRICE_FIELDS[:-1]:
+            record[field] = _from_float(getattr(self, field)[index])
+        record["volume"] = _from_volume(self.volume[index])
+        return record
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (BarSeries, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        if not self.dates:
+            return "BarSeries([])"
+        first = date.fromordinal(self.dates[0]).isoformat()
+        last = date.fromordinal(self.dates[-1]).isoformat()
+        return f"BarSeries({len(self)} bars, {first} to {last})"
+
+    def column(self, name: str) -> array:
+        """Return the underlying typed array for 'date' (ordinals) or an OHLCV field."""
+        if name == "date":
+            return self.dates
+        if name not in _PRICE_FIELDS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def to_records(self) -> List[dict]:
+        """Materialize the series as the list of record dicts."""
+        return list(self)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column buffers."""
+        return sum(len(getattr(self, f)) * getattr(self, f).itemsize for f in self.__slots__)
+
+
+_LISTING_TEXT_FIELDS = ("name", "sector", "industry")
+_LISTING_NUMBER_FIELDS = ("price", "change_percent", "market_cap", "volume")
+
+
+class ListingTable(Mapping):
+    """Exchange-wide quote snapshot stored column-wise, keyed by symbol.
+
+    Text columns ('name', 'sector', 'industry') are lists and numeric columns
+    ('price', 'change_percent', 'market_cap', 'volume') are `array('d')` with
+    missing values as NaN, so whole-market scans run over flat buffers. Looking up
+    a symbol returns a record dict that also carries its 'market_cap_type'.
+    """
+
+    __slots__ = ("symbols", "timestamp", "_index") + _LISTING_TEXT_FIELDS + _LISTING_NUMBER_FIELDS
+
+    def __init__(self, timestamp=None):
+        self.timestamp = timestamp
+        self.symbols: List[str] = []
+        self._index = {}
+        for field in _LISTING_TEXT_FIELDS:
+            setattr(self, field, [])
+        for field in _LISTING_NUMBER_FIELDS:
+            setattr(self, field, array("d"))
+
+    def append(self, symbol: str, **values):
+        """Add a row; a symbol that is already present keeps its first row."""
+        symbol = symbol.upper()
+        if symbol in self._index:
+            return
+        self._index[symbol] = len(self.symbols)
+        self.symbols.append(symbol)
+        for field in _LISTING_TEXT_FIELDS:
+            getattr(self, field).append(values.get(field) or "")
+        for field in _LISTING_NUMBER_FIELDS:
+            getattr(self, field).append(_to_float(values.get(field)))
+
+    def __getitem__(self, symbol: str) -> dict:
+        i = self._index[symbol.upper()]
+        record = {"symbol": self.symbols[i]}
+        for field in _LISTING_TEXT_FIELDS:
+            record[field] = getattr(self, field)[i]
+        for field in _LISTING_NUMBER_FIELDS:
+            record[field] = _from_float(getattr(self, field)[i])
+        record["market_cap_type"] = market_cap_type(record["market_cap"])
+        return record
+
+    def __contains__(self, symbol) -> bool:
+        return isinstance(symbol, str) and symbol.upper() in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.symbols)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __repr__(self) -> str:
+        return f"ListingTable({len(self)} symbols, timestamp={self.timestamp!r})"
+
+    def column(self, name: str):
+        """Return the column for 'symbol', a text field (list) or a numeric field (array('d'))."""
+        if name == "symbol":
+            return self.symbols
+        if name not in _LISTING_TEXT_FIELDS + _LISTING_NUMBER_FIELDS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def market_cap_types(self) -> List[str]:
+        """'market_cap_type' of every row, in row order."""
+        return [market_cap_type(_from_float(cap)) for cap in self.market_cap]
+
+    def to_records(self) -> List[dict]:
+        return [self[s] for s in self.symbols]
@@ -2,16 +2,24 @@
 NASDAQ support for jyapystock.
 Provides helper functions to fetch live and historical prices from Nasdaq's public API.
 """
-import requests
 import logging
 from datetime import datetime
 from typing import Optional, Union
 from dateutil.parser import parse
+from jyapystock.http_client import HTTPCache, http_get
+from jyapystock.throttle import throttled_response
+from jyapystock.deadline import Deadline, is_expired
+from jyapystock.models import ListingTable
+from jyapystock.sources import SourceBackend
 
 # Standard naming convention for library loggers
 logger = logging.getLogger(__name__)
 
-def get_nasdaq_live_price(symbol: str, country: str) -> Optional[dict]:
+# Stock screener listing every US-listed stock in one response (optionally one exchange)
+SCREENER_URL = "https://api.nasdaq.com/api/screener/stocks?tableonly=true&download=true"
+SCREENER_EXCHANGES = ("nasdaq", "nyse", "amex")
+
+def get_nasdaq_live_price(symbol: str, country: str, deadline: Optional[Deadline] = None, http_cache: Optional[HTTPCache] = None) -> Optional[dict]:
     """
     Returns a dict with 'timestamp', 'price', and 'change_percent', or None if not available.
     """
@@ -26,9 +34,14 @@ def get_nasdaq_live_price(symbol: str, country: str) -> Optional[dict]:
                 }
     url_stocks = f"https://api.nasdaq.com/api/quote/{symbol}/info?assetclass=stocks"
     url_etf = f"https://api.nasdaq.com/api/quote/{symbol}/info?assetclass=etf"
+    error = None
     for url in [url_stocks, url_etf]:
+        if is_expired(deadline):
+            break
         try:
-            get_response = requests.get(url, headers=headers, timeout=10)
+            get_response = http_get(url, headers=headers, timeout=10, deadline=deadline, cache=http_cache)
+            if throttled_response(get_response) or get_response.status_code >= 500:
+                get_response.raise_for_status()
             if get_response and get_response.status_code == 200:
                 json_data = get_response.json()
                 if 'data' in json_data and json_data['data']:
@@ -70,9 +83,11 @@ def get_nasdaq_live_price(symbol: str, country: str) -> Optional[dict]:
     return None
 
 
-def get_nasdaq_historical_prices(symbol: str, start: Union[str, datetime], end: Union[str, datetime], country: str) -> Optional[list]:
+def get_nasdaq_historical_prices(symbol: str, start: Union[str, datetime], end: Union[str, datetime], country: str, deadline: Optional[Deadline] = None, http_cache: Optional[HTTPCache] = None) -> Optional[list]:
     """
     Returns a list of records with Open/High/Low/Close/Volume or None if not found.
+    Raises the request error (or HTTP error for a throttled or 5xx response) when neither
+    URL returned data because the request failed, so windowed fetches retry the window.
     """
     if country != "usa":
         return None  # NASDAQ support only for USA
@@ -97,13 +112,17 @@ def get_nasdaq_historical_prices(symbol: str, start: Union[str, datetime], end:
                 'accept-encoding': "gzip, deflate, br",
                 'Accept-Language': 'en-US,en;q=0.9',
                 'Connection': "close",
-                'cache-control': "no-cache",
                 'Referer': 'https://www.nasdaq.com/'
             }
 
+    error = None
     for url in [url_stocks, url_etf]:
+        if is_expired(deadline):
+            break
         try:
-            get_response = requests.get(url, headers=headers, timeout=10)
+            get_response = http_get(url, headers=headers, timeout=10, deadline=deadline, cache=http_cache)
+            if throttled_response(get_response) or get_response.status_code >= 500:
+                get_response.raise_for_status()
             if get_response and get_response.status_code == 200:
                 json_data = get_response.json()
                 if 'data' in json_data and json_data['data'] and 'tradesTable' in json_data['data']:
@@ -143,9 +162,15 @@ def get_nasdaq_historical_prices(symbol: str, start: Union[str, datetime], end:
                     logger.error(f"No historical data found for {symbol} in NASDAQ API response {json_data}.")
             else:
                 logger.error(f"Failed to fetch historical prices for {symbol} from NASDAQ API. Status code: {get_response.status_code}")
+        except OSError as e:
+            # Request failures (connection errors, timeouts, throttling) are not "no data"
+            logger.error(f"Request for historical prices for {symbol} from NASDAQ API failed: {str(e)}")
+            error = e
         except Exception as e:
             logger.error(f"Exception occurred while fetching historical prices for {symbol} from NASDAQ API: {str(e)}")
 
+    if error is not None:
+        raise error
     return None
     
 def get_float_or_none_from_string(input):
@@ -159,3 +184,76 @@ def get_float_or_none_from_string(input):
         except Exception as e:
             logger.error(f"Error converting string to float: '{input}' - {str(e)}")
     return None
+
+
+def _screener_number(value) -> Optional[float]:
+    """Parse screener cells like '$123.45', '-0.532%' or '1,234,567.00'; blanks and 'NA' are None."""
+    if value is None:
+        return None
+    try:
+        return float(str(value).replace('$', '').replace(',', '').replace('%', '').strip())
+    except ValueError:
+        return None
+
+
+def get_nasdaq_screener(exchange: Optional[str] = None, deadline: Optional[Deadline] = None, http_cache: Optional[HTTPCache] = None) -> Optional[ListingTable]:
+    """
+    Returns a `ListingTable` with name, sector, industry, price, change_percent, market_cap and volume
+    for every stock listed on NASDAQ, NYSE and AMEX (or only `exchange`), or None if not available.
+    """
+    url = SCREENER_URL
+    if exchange:
+        if exchange.lower() not in SCREENER_EXCHANGES:
+            raise ValueError(f"Unknown exchange: {exchange}. Valid options are: {list(SCREENER_EXCHANGES)}")
+        url += f"&exchange={exchange.lower()}"
+    headers = {
+                'Accept': 'application/json, text/plain, */*',
+                'Origin': 'https://www.nasdaq.com',
+                'Referer': 'https://www.nasdaq.com/',
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0)'
+            }
+    try:
+        get_response = http_get(url, headers=headers, timeout=30, deadline=deadline, cache=http_cache)
+        if not get_response or get_response.status_code != 200:
+            logger.error(f"Failed to fetch the stock screener from NASDAQ API. Status code: {getattr(get_response, 'status_code', None)}")
+            return None
+        data = get_response.json().get('data') or {}
+        # The download form returns data.rows; the paged table nests them under data.table.rows
+        rows = data.get('rows') or (data.get('table') or {}).get('rows') or []
+        table = ListingTable(timestamp=data.get('asOf'))
+        for row in rows:
+            symbol = (row.get('symbol') or '').strip()
+            if not symbol:
+                continue
+            table.append(
+                symbol,
+                name=row.get('name'),
+                sector=row.get('sector'),
+                industry=row.get('industry'),
+                price=_screener_number(row.get('lastsale')),
+                change_percent=_screener_number(row.get('pctchange')),
+                market_cap=_screener_number(row.get('marketCap')),
+                volume=_screener_number(row.get('volume')),
+            )
+        if not len(table):
+            logger.error("No rows found in the NASDAQ stock screener response.")
+            return None
+        return table
+    except Exception as e:
+        logger.error(f"Exception occurred while fetching the stock screener from NASDAQ API: {str(e)}")
+    return None
+
+
+class NasdaqBackend(SourceBackend):
+    """Nasdaq's public quote API (USA)."""
+
+    name = "nasdaq"
+    countries = ("usa",)
+    exchanges = ("nasdaq",)
+
+    def live_price(self, provider, symbol, deadline):
+        return get_nasdaq_live_price(symbol, provider.country, deadline=deadline, http_cache=provider.http_cache)
+
+    def historical_prices(self, provider, symbol, start, end, deadline):
+        return get_nasdaq_historical_prices(symbol, start, end, provider.country, deadline=deadline,
+                                            http_cache=provider.http_cache)
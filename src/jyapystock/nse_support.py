@@ -5,15 +5,41 @@ Provides helper functions to fetch live and historical prices for Indian stocks.
 
 from nse import NSE
 import logging
+import os
 import tempfile
-from typing import Optional, Union
-from datetime import datetime
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Union
+from datetime import date, datetime, timedelta, timezone
 from dateutil.parser import parse
+from jyapystock.deadline import Deadline, is_expired
+from jyapystock.throttle import get_limiter
+from jyapystock.sources import SourceBackend
+from jyapystock.intraday_cache import INTRADAY_INTERVALS
 
 
 # Global NSE instance
 _nse_instance = None
 
+# Indian Standard Time, used by NSE for all session timestamps
+_IST = timezone(timedelta(hours=5, minutes=30))
+
+# Security series kept in end-of-day snapshots: regular equities and the trade-for-trade segment
+BHAVCOPY_SERIES = ("EQ", "BE")
+
+# Bhavcopy column names, UDiFF format (from 8 July 2024) and the older cm*bhav.csv format
+_BHAVCOPY_COLUMNS = {
+    "TckrSymb": "symbol", "SctySrs": "series", "TradDt": "date", "OpnPric": "open", "HghPric": "high",
+    "LwPric": "low", "ClsPric": "close", "TtlTradgVol": "volume",
+    "SYMBOL": "symbol", "SERIES": "series", "TIMESTAMP": "date", "OPEN": "open", "HIGH": "high",
+    "LOW": "low", "CLOSE": "close", "TOTTRDQTY": "volume",
+}
+
+# Parsed snapshots of recent days; a published bhavcopy never changes
+_BHAVCOPY_CACHE_DAYS = 5
+_bhavcopy_cache: "OrderedDict[tuple, Dict[str, dict]]" = OrderedDict()
+_bhavcopy_lock = threading.Lock()
+
 
 def _get_nse_instance():
     """Get or create a singleton NSE instance."""
@@ -24,16 +50,23 @@ def _get_nse_instance():
     return _nse_instance
 
 
-def get_nse_live_price(symbol: str) -> Optional[dict]:
+def _limited(fn, deadline: Optional[Deadline] = None):
+    """Run an NSE client call under the shared per-host limit, backing off when NSE throttles."""
+    return get_limiter("nse").call(fn, deadline=deadline)
+
+
+def get_nse_live_price(symbol: str, deadline: Optional[Deadline] = None) -> Optional[dict]:
     """
     Fetch live quote for an Indian stock using NSE API.
     
     Returns a dict with 'timestamp', 'price', and 'change_percent', or None if not available.
     """
+    if is_expired(deadline):
+        return None
     try:
         nse = _get_nse_instance()
         # equityQuote returns simple data, quote returns detailed data
-        result = nse.quote(symbol)
+        result = _limited(lambda: nse.quote(symbol), deadline)
         
         if not result or 'priceInfo' not in result:
             return None
@@ -58,13 +91,103 @@ def get_nse_live_price(symbol: str) -> Optional[dict]:
         return None
 
 
-def get_nse_historical_prices(symbol: str, start: Union[str, datetime], end: Union[str, datetime]) -> Optional[list]:
+def get_nse_index_quotes(index: str = "NIFTY 50", deadline: Optional[Deadline] = None) -> Optional[Dict[str, dict]]:
+    """
+    Fetch quotes for every constituent of an NSE index (e.g. 'NIFTY 50', 'NIFTY 500') in one request.
+
+    Returns a dict mapping each constituent's NSE symbol to a dict with 'timestamp', 'price' and
+    'change_percent' (same shape as `get_nse_live_price`), or None if not available.
+    """
+    if is_expired(deadline):
+        return None
+    try:
+        nse = _get_nse_instance()
+        result = _limited(lambda: nse.listEquityStocksByIndex(index=index), deadline)
+        rows = result.get('data') if isinstance(result, dict) else None
+        if not rows:
+            return None
+        index_timestamp = result.get('timestamp', '')
+        quotes = {}
+        for row in rows:
+            symbol = row.get('symbol')
+            last_price = row.get('lastPrice')
+            # The first row describes the index itself
+            if not symbol or last_price is None or symbol == index or row.get('priority') == 1:
+                continue
+            quotes[symbol.upper()] = {
+                "timestamp": row.get('lastUpdateTime') or index_timestamp,
+                "price": last_price,
+                "change_percent": round(row.get('pChange') or 0, 2)
+            }
+        return quotes or None
+    except Exception as e:
+        logging.error(f"Error fetching index quotes for {index} from NSE: {str(e)}")
+        return None
+
+
+def get_nse_bhavcopy(day: Union[str, date, datetime], series: Optional[Iterable[str]] = BHAVCOPY_SERIES,
+                     deadline: Optional[Deadline] = None) -> Optional[Dict[str, dict]]:
+    """
+    End-of-day bars for every NSE equity on `day` from the exchange's daily bhavcopy.
+
+    The bhavcopy is downloaded once and parsed column-wise; results are cached for recent days.
+    Only rows whose series is in `series` are kept (None keeps all series).
+    Returns a dict mapping each NSE symbol to a record with date/open/high/low/close/volume,
+    or None if the bhavcopy is not available (e.g. a holiday or not yet published).
+    """
+    if isinstance(day, str):
+        day = parse(day).date()
+    elif isinstance(day, datetime):
+        day = day.date()
+    series = tuple(series) if series is not None else None
+    key = (day, series)
+    with _bhavcopy_lock:
+        if key in _bhavcopy_cache:
+            _bhavcopy_cache.move_to_end(key)
+            return _bhavcopy_cache[key]
+    if is_expired(deadline):
+        return None
+    try:
+        import pandas as _pd
+        nse = _get_nse_instance()
+        path = _limited(lambda: nse.equityBhavcopy(datetime.combine(day, datetime.min.time())), deadline)
+        try:
+            frame = _pd.read_csv(path, usecols=lambda c: c.strip() in _BHAVCOPY_COLUMNS)
+        finally:
+            os.remove(path)
+        frame = frame.rename(columns=lambda c: _BHAVCOPY_COLUMNS[c.strip()])
+        frame["symbol"] = frame["symbol"].str.strip().str.upper()
+        if series is not None:
+            frame = frame[frame["series"].str.strip().isin(series)]
+        frame = frame.drop_duplicates("symbol")
+        # A bhavcopy covers a single trading day, so the date is parsed once
+        frame["date"] = change_date_format(str(frame["date"].iloc[0])) if len(frame) else day.isoformat()
+        for col in ("open", "high", "low", "close"):
+            frame[col] = frame[col].astype(float)
+        frame["volume"] = frame["volume"].astype("int64")
+        bars = dict(zip(frame["symbol"], frame[["date", "open", "high", "low", "close", "volume"]].to_dict("records")))
+    except Exception as e:
+        logging.error(f"Error fetching NSE bhavcopy for {day}: {str(e)}")
+        return None
+    if not bars:
+        return None
+    with _bhavcopy_lock:
+        _bhavcopy_cache[key] = bars
+        while len(_bhavcopy_cache) > _BHAVCOPY_CACHE_DAYS:
+            _bhavcopy_cache.popitem(last=False)
+    return bars
+
+
+def get_nse_historical_prices(symbol: str, start: Union[str, datetime], end: Union[str, datetime], deadline: Optional[Deadline] = None) -> Optional[list]:
     """
     Fetch historical prices for an Indian stock from NSE.
     
     `start` and `end` may be strings (ISO like '2023-01-01') or datetime objects.
     Returns a list of records with date/open/high/low/close/volume, or None if not available.
+    Request errors (e.g. NSE throttling) are raised, so windowed fetches retry the window.
     """
+    if is_expired(deadline):
+        return None
     try:
         # Normalize start/end to date strings
         if isinstance(start, str):
@@ -83,7 +206,7 @@ def get_nse_historical_prices(symbol: str, start: Union[str, datetime], end: Uni
         
         nse = _get_nse_instance()
         # fetch_equity_historical_data returns historical data
-        data = nse.fetch_equity_historical_data(symbol, from_date=start_dt, to_date=end_dt)
+        data = _limited(lambda: nse.fetch_equity_historical_data(symbol, from_date=start_dt, to_date=end_dt), deadline)
         
         if not data or isinstance(data, str):
             # Data might be an error string or None
@@ -130,10 +253,71 @@ def get_nse_historical_prices(symbol: str, start: Union[str, datetime], end: Uni
             ]
         
         return records if records else None
+    except OSError:
+        # Request failures (connection errors, timeouts, throttling) are not "no data"
+        raise
     except Exception as e:
         logging.error(f"Error fetching historical prices for {symbol} from NSE: {str(e)}")
         return None
 
+def get_nse_intraday_bars(symbol: str, interval_minutes: int, start: Union[str, datetime], end: Union[str, datetime], deadline: Optional[Deadline] = None) -> Optional[list]:
+    """
+    Build intraday bars for an Indian stock from NSE's intraday price chart.
+
+    NSE only publishes the current session's price ticks (no volume), so bars are
+    aggregated locally into `interval_minutes` buckets and 'volume' is None.
+    Returns a list of records with datetime/open/high/low/close/volume, or None if not available.
+    """
+    if is_expired(deadline):
+        return None
+    try:
+        start_dt = parse(start) if isinstance(start, str) else start
+        end_dt = parse(end) if isinstance(end, str) else end
+        if start_dt.tzinfo is None:
+            start_dt = start_dt.replace(tzinfo=_IST)
+        if end_dt.tzinfo is None:
+            end_dt = end_dt.replace(tzinfo=_IST)
+
+        nse = _get_nse_instance()
+        result = _limited(lambda: nse._req(f"{nse.base_url}/chart-databyindex", params={"index": f"{symbol.upper()}EQN"}), deadline).json()
+        ticks = result.get('grapthData') if isinstance(result, dict) else None
+        if not ticks:
+            return None
+
+        bucket_ms = interval_minutes * 60 * 1000
+        bars = {}
+        for point in ticks:
+            ms, price = point[0], point[1]
+            if price is None:
+                continue
+            bucket = int(ms) - int(ms) % bucket_ms
+            bar = bars.get(bucket)
+            if bar is None:
+                bars[bucket] = {'open': price, 'high': price, 'low': price, 'close': price}
+            else:
+                bar['high'] = max(bar['high'], price)
+                bar['low'] = min(bar['low'], price)
+                bar['close'] = price
+
+        records = []
+        for bucket in sorted(bars):
+            # NSE chart timestamps are IST wall-clock times encoded as if they were UTC
+            bar_dt = datetime.fromtimestamp(bucket / 1000, tz=timezone.utc).replace(tzinfo=_IST)
+            if start_dt <= bar_dt <= end_dt:
+                bar = bars[bucket]
+                records.append({
+                    'datetime': bar_dt.isoformat(),
+                    'open': float(bar['open']),
+                    'high': float(bar['high']),
+                    'low': float(bar['low']),
+                    'close': float(bar['close']),
+                    'volume': None
+                })
+        return records if records else None
+    except Exception as e:
+        logging.error(f"Error fetching intraday bars for {symbol} from NSE: {str(e)}")
+        return None
+
 def change_date_format(date_str: str) -> str:
     """Convert date to 'yyyy-mm-dd' format."""
     try:
@@ -142,3 +326,20 @@ def change_date_format(date_str: str) -> str:
     except Exception as e:
         logging.error(f"Error converting date format: {str(e)}")
         return date_str  # Return original if conversion fails
+
+
+class NSEBackend(SourceBackend):
+    """National Stock Exchange of India through the `nse` client."""
+
+    name = "nse"
+    countries = ("india",)
+    exchanges = ("nse",)
+
+    def live_price(self, provider, symbol, deadline):
+        return get_nse_live_price(symbol, deadline=deadline)
+
+    def historical_prices(self, provider, symbol, start, end, deadline):
+        return get_nse_historical_prices(symbol, start, end, deadline=deadline)
+
+    def intraday_bars(self, provider, symbol, interval, start, end, deadline):
+        return get_nse_intraday_bars(symbol, INTRADAY_INTERVALS[interval], start, end, deadline=deadline)
@@ -4,6 +4,9 @@ from datetime import date, datetime
 from typing import Any, Optional, Union
 from dateutil.parser import parse
 import requests
+from jyapystock.http_client import HTTPCache, http_get
+from jyapystock.deadline import Deadline, DeadlineExceeded
+from jyapystock.sources import SourceBackend
 
 NYSE_QUOTES_URL = "https://www.nyse.com/api/nyseservice/v1/quotes"
 
@@ -119,13 +122,13 @@ def _normalize_history_row(row: dict[str, Any]) -> Optional[dict[str, Any]]:
     }
 
 
-def get_nyse_live_price(symbol: str) -> Optional[dict[str, Any]]:
+def get_nyse_live_price(symbol: str, deadline: Optional[Deadline] = None, http_cache: Optional[HTTPCache] = None) -> Optional[dict[str, Any]]:
     try:
-        response = requests.get(
-            NYSE_QUOTES_URL, params={"symbol": symbol}, timeout=10
+        response = http_get(
+            NYSE_QUOTES_URL, params={"symbol": symbol}, timeout=10, deadline=deadline, cache=http_cache
         )
         response.raise_for_status()
-    except requests.RequestException:
+    except (requests.RequestException, DeadlineExceeded):
         return None
 
     return _extract_latest_quote(response.json())
@@ -137,6 +140,8 @@ def get_nyse_historical_prices(
     end_date: Union[str, datetime],
     country: str,
     history_url: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+    http_cache: Optional[HTTPCache] = None,
 ) -> Optional[list[dict[str, Any]]]:
     if country != "usa":
         return None  # NYSE support only for USA
@@ -155,11 +160,9 @@ def get_nyse_historical_prices(
         "from": start_date.isoformat(),
         "to": end_date.isoformat(),
     }
-    try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException:
-        return None
+    # Request errors propagate, so windowed fetches retry the window instead of leaving a hole
+    response = http_get(url, params=params, timeout=10, deadline=deadline, cache=http_cache)
+    response.raise_for_status()
     payload = response.json()
     rows: list[dict[str, Any]] = []
     if isinstance(payload, list):
@@ -191,6 +194,21 @@ def get_nyse_historical_prices(
     return normalized
 
 
+class NYSEBackend(SourceBackend):
+    """NYSE's public quote API (USA)."""
+
+    name = "nyse"
+    countries = ("usa",)
+    exchanges = ("nyse",)
+
+    def live_price(self, provider, symbol, deadline):
+        return get_nyse_live_price(symbol, deadline=deadline, http_cache=provider.http_cache)
+
+    def historical_prices(self, provider, symbol, start, end, deadline):
+        return get_nyse_historical_prices(symbol, start, end, provider.country, deadline=deadline,
+                                          http_cache=provider.http_cache)
+
+
 if __name__ == "__main__":
     from datetime import date, timedelta
 
@@ -0,0 +1,191 @@
+"""
+Portfolio analytics for jyapystock.
+Closes for many symbols are loaded through a provider (so its sources, caches and
+deadlines apply) into one date-aligned NumPy matrix shaped (dates, symbols). Returns,
+rolling volatility, drawdowns and weighted portfolio returns are computed for every
+symbol at once; covariance and correlation matrices are computed in column blocks
+with pairwise-complete observations, so a few thousand symbols need only one
+(symbols x symbols) result plus (block x symbols) scratch arrays, and the result can
+be written straight into a memory-mapped array.
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
+from jyapystock import indicators
+from jyapystock.deadline import Deadline
+from jyapystock.indicators import TRADING_DAYS_PER_YEAR
+from jyapystock.resample import check_interval
+
+# Columns of the covariance/correlation matrix computed per block
+DEFAULT_BLOCK_SIZE = 256
+
+# Bars per year for each `get_historical_price` interval, used to annualize
+PERIODS_PER_YEAR = {"1d": TRADING_DAYS_PER_YEAR, "1wk": 52, "1mo": 12, "1q": 4}
+
+
+def load_closes(provider, symbols: Sequence[str], start, end, timeout: Union[float, Deadline, None] = None,
+                interval: str = "1d") -> Dict[str, list]:
+    """Fetch the history of every symbol through `provider`, up to `provider.max_workers` at a time."""
+    deadline = provider._deadline(timeout)
+    symbols = list(dict.fromkeys(symbols))
+    with ThreadPoolExecutor(max_workers=max(1, min(provider.max_workers, len(symbols) or 1))) as executor:
+        histories = executor.map(
+            lambda s: provider.get_historical_price(s, start, end, timeout=deadline, interval=interval), symbols)
+        return dict(zip(symbols, histories))
+
+
+def returns(close, log: bool = False) -> np.ndarray:
+    """Period returns along axis 0 (one row shorter than `close`); NaN where either close is missing."""
+    close = np.asarray(close, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if log:
+            return np.diff(np.log(close), axis=0)
+        return close[1:] / close[:-1] - 1.0
+
+
+def drawdowns(close) -> np.ndarray:
+    """Fractional distance of each close below its running peak (0 at a new high, negative below)."""
+    close = np.asarray(close, dtype=float)
+    peak = np.fmax.accumulate(close, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return close / peak - 1.0
+
+
+def max_drawdown(close) -> np.ndarray:
+    """Deepest drawdown per column (NaN for columns without closes)."""
+    dd = drawdowns(close)
+    out = np.full(dd.shape[1:], np.nan)
+    seen = ~np.isnan(dd).all(axis=0)
+    out[seen] = np.nanmin(dd[:, seen], axis=0)
+    return out
+
+
+def portfolio_returns(period_returns, weights) -> np.ndarray:
+    """Weighted return per period; missing returns count as 0 and weights are not renormalized."""
+    return np.nan_to_num(np.asarray(period_returns, dtype=float)) @ np.asarray(weights, dtype=float)
+
+
+def _pairwise(period_returns, block_size: int, min_periods: int, correlation: bool,
+              out: Optional[np.ndarray]) -> np.ndarray:
+    """Covariance or correlation over pairwise-complete rows, computed `block_size` columns at a time.
+
+    With X the returns (0 where missing) and M the presence mask, every pairwise sum is a
+    matrix product: n = M'M, sx = X'M, sy = M'X, sxy = X'X and sxx = (X*X)'M.
+    """
+    r = np.asarray(period_returns, dtype=float)
+    if r.ndim == 1:
+        r = r[:, None]
+    n_cols = r.shape[1]
+    mask = ~np.isnan(r)
+    x = np.where(mask, r, 0.0)
+    m = mask.astype(float)
+    x2 = x * x
+    if out is None:
+        out = np.empty((n_cols, n_cols))
+    for lo in range(0, n_cols, block_size):
+        hi = min(lo + block_size, n_cols)
+        xb, mb = x[:, lo:hi], m[:, lo:hi]
+        n = mb.T @ m
+        sx = xb.T @ m
+        sy = mb.T @ x
+        sxy = xb.T @ x
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if correlation:
+                sxx = x2[:, lo:hi].T @ m
+                syy = mb.T @ x2
+                block = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+                block = np.clip(block, -1.0, 1.0)
+            else:
+                block = (sxy - sx * sy / n) / (n - 1)
+        block[n < max(min_periods, 2)] = np.nan
+        out[lo:hi] = block
+    return out
+
+
+def covariance(period_returns, block_size: int = DEFAULT_BLOCK_SIZE, min_periods: int = 2,
+               annualize: bool = False, out: Optional[np.ndarray] = None,
+               periods_per_year: float = TRADING_DAYS_PER_YEAR) -> np.ndarray:
+    """Sample covariance matrix of the columns of `period_returns` over pairwise-complete rows.
+
+    `out` may be a preallocated (or memory-mapped) (N, N) float64 array to fill in place.
+    `annualize` scales by `periods_per_year`, the number of return periods per year.
+    """
+    cov = _pairwise(period_returns, block_size, min_periods, False, out)
+    if annualize:
+        cov *= periods_per_year
+    return cov
+
+
+def correlation(period_returns, block_size: int = DEFAULT_BLOCK_SIZE, min_periods: int = 2,
+                out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Pearson correlation matrix of the columns of `period_returns` over pairwise-complete rows."""
+    return _pairwise(period_returns, block_size, min_periods, True, out)
+
+
+class Portfolio:
+    """Date-aligned closes for a set of symbols and the analytics computed over them.
+
+    `dates` is a `datetime64[D]` array, `symbols` the column order and `close` a float64
+    array shaped (len(dates), len(symbols)) with NaN where a symbol has no bar. `interval`
+    is the bar size ('1d', '1wk', '1mo' or '1q'), which sets how figures are annualized.
+    """
+
+    def __init__(self, dates: np.ndarray, symbols: List[str], close: np.ndarray, interval: str = "1d"):
+        self.dates = dates
+        self.symbols = symbols
+        self.close = close
+        self.interval = interval
+        self.periods_per_year = PERIODS_PER_YEAR[check_interval(interval)]
+
+    @classmethod
+    def from_histories(cls, histories: Dict[str, Sequence[dict]], interval: str = "1d") -> "Portfolio":
+        """Build from per-symbol records as returned by `get_historical_price` (symbols without data are dropped)."""
+        dates, symbols, panels = indicators.build_panel(histories, fields=("close",))
+        return cls(dates, symbols, panels["close"], interval=interval)
+
+    @classmethod
+    def from_provider(cls, provider, symbols: Sequence[str], start, end, timeout: Union[float, Deadline, None] = None,
+                      interval: str = "1d") -> "Portfolio":
+        """Load closes for `symbols` through `provider`, reusing its caches and fallback sources."""
+        return cls.from_histories(load_closes(provider, symbols, start, end, timeout=timeout, interval=interval),
+                                  interval=interval)
+
+    def returns(self, log: bool = False) -> np.ndarray:
+        return returns(self.close, log=log)
+
+    def volatility(self, window: int = 20, annualize: bool = True) -> np.ndarray:
+        """Rolling volatility of log returns per symbol over `window` bars, aligned with `dates`.
+
+        Each symbol uses its own bars only: a later listing or a missing bar does not blank it out.
+        """
+        return indicators.volatility(self.close, window, annualize=annualize, periods_per_year=self.periods_per_year)
+
+    def drawdowns(self) -> np.ndarray:
+        return drawdowns(self.close)
+
+    def max_drawdown(self) -> Dict[str, float]:
+        return dict(zip(self.symbols, max_drawdown(self.close).tolist()))
+
+    def portfolio_returns(self, weights: Union[Dict[str, float], Sequence[float]]) -> np.ndarray:
+        """Weighted daily returns; `weights` maps symbols to weights (missing symbols weigh 0) or lists them in column order."""
+        if isinstance(weights, dict):
+            weights = [weights.get(s, 0.0) for s in self.symbols]
+        return portfolio_returns(self.returns(), weights)
+
+    def covariance(self, **options) -> np.ndarray:
+        options.setdefault("periods_per_year", self.periods_per_year)
+        return covariance(self.returns(), **options)
+
+    def correlation(self, **options) -> np.ndarray:
+        return correlation(self.returns(), **options)
+
+    def annualized_volatility(self) -> Dict[str, float]:
+        """Full-period sample volatility of log returns per symbol, annualized."""
+        r = self.returns(log=True)
+        counts = (~np.isnan(r)).sum(axis=0)
+        std = np.full(r.shape[1], np.nan)
+        enough = counts > 1
+        std[enough] = np.nanstd(r[:, enough], axis=0, ddof=1)
+        return dict(zip(self.symbols, (std * math.sqrt(self.periods_per_year)).tolist()))
@@ -0,0 +1,217 @@
+"""
+Shared-memory quote board for jyapystock.
+One refresher process publishes the latest live quotes into a fixed-size shared
+memory segment; any number of worker processes on the same host read them
+directly from the segment without locks, pickling or upstream calls.
+
+Layout: a 32-byte header followed by `capacity` fixed-width slots. Slots are
+addressed by an open-addressing symbol index (CRC32 of the symbol, linear
+probing) so readers find a symbol without any side structure. Each slot is
+guarded by a sequence counter (seqlock): the single writer makes it odd while
+updating and even again when done, and readers retry if it changed under them.
+"""
+
+import logging
+import math
+import struct
+import sys
+import threading
+import time
+import zlib
+from multiprocessing import shared_memory
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"JYAQB001"
+_HEADER = struct.Struct("<8sII16x")
+# seq, symbol, price, change_percent, updated_at (epoch seconds), timestamp
+_SLOT = struct.Struct("<Q32sddd48s")
+_SEQ = struct.Struct("<Q")
+MAX_SYMBOL_LENGTH = 32
+_READ_RETRIES = 100
+
+
+def _encode(text: str, size: int) -> bytes:
+    return text.encode("utf-8")[:size]
+
+
+def _float(value) -> float:
+    return float(value) if value is not None else math.nan
+
+
+class QuoteBoard:
+    """Fixed-size table of latest quotes in a named shared memory segment.
+
+    Create it once (`create=True`) in the process that owns the segment and
+    attach to it by `name` everywhere else. Only one process may `publish`.
+    """
+
+    def __init__(self, name: str, capacity: int = 4096, create: bool = False):
+        if create:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=_HEADER.size + capacity * _SLOT.size)
+            _HEADER.pack_into(self._shm.buf, 0, _MAGIC, capacity, _SLOT.size)
+        else:
+            self._shm = _attach(name)
+            magic, capacity, slot_size = _HEADER.unpack_from(self._shm.buf, 0)
+            if magic != _MAGIC or slot_size != _SLOT.size:
+                self._shm.close()
+                raise ValueError(f"Shared memory segment {name} is not a jyapystock quote board.")
+        self.name = name
+        self.capacity = capacity
+        self.owner = create
+        self._buf = self._shm.buf
+        # Writer-side cache of symbol -> slot, rebuilt lazily from the segment
+        self._slots = {}
+
+    def _offset(self, slot: int) -> int:
+        return _HEADER.size + slot * _SLOT.size
+
+    def _probe(self, key: bytes) -> Iterable[int]:
+        start = zlib.crc32(key) % self.capacity
+        for i in range(self.capacity):
+            yield (start + i) % self.capacity
+
+    def _slot_symbol(self, slot: int) -> bytes:
+        offset = self._offset(slot) + _SEQ.size
+        return bytes(self._buf[offset:offset + MAX_SYMBOL_LENGTH]).rstrip(b"\0")
+
+    def _find(self, key: bytes, claim: bool = False) -> Optional[int]:
+        for slot in self._probe(key):
+            symbol = self._slot_symbol(slot)
+            if symbol == key:
+                return slot
+            if not symbol:
+                return slot if claim else None
+        return None
+
+    def publish(self, symbol: str, quote: dict) -> bool:
+        """Write the quote for `symbol`; returns False if the board is full."""
+        key = _encode(symbol.upper(), MAX_SYMBOL_LENGTH)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._find(key, claim=True)
+            if slot is None:
+                logger.error(f"Quote board {self.name} is full ({self.capacity} symbols); dropping {symbol}.")
+                return False
+            self._slots[key] = slot
+        offset = self._offset(slot)
+        seq = _SEQ.unpack_from(self._buf, offset)[0]
+        # Odd sequence marks the slot as being written
+        _SEQ.pack_into(self._buf, offset, seq + 1)
+        _SLOT.pack_into(self._buf, offset, seq + 1, key, _float(quote.get("price")), _float(quote.get("change_percent")),
+                        time.time(), _encode(str(quote.get("timestamp") or ""), 48))
+        _SEQ.pack_into(self._buf, offset, seq + 2)
+        return True
+
+    def read(self, symbol: str, max_age: Optional[float] = None) -> Optional[dict]:
+        """Latest quote for `symbol`, or None if it is absent or older than `max_age` seconds.
+
+        The returned dict has the usual 'timestamp', 'price' and 'change_percent' keys plus
+        'updated_at', the epoch time the refresher published it.
+        """
+        key = _encode(symbol.upper(), MAX_SYMBOL_LENGTH)
+        slot = self._find(key)
+        if slot is None:
+            return None
+        offset = self._offset(slot)
+        for _ in range(_READ_RETRIES):
+            seq = _SEQ.unpack_from(self._buf, offset)[0]
+            if seq & 1:
+                continue
+            _, stored, price, change_percent, updated_at, timestamp = _SLOT.unpack_from(self._buf, offset)
+            if _SEQ.unpack_from(self._buf, offset)[0] != seq:
+                continue
+            if stored.rstrip(b"\0") != key or seq == 0:
+                return None
+            if max_age is not None and time.time() - updated_at > max_age:
+                return None
+            return {
+                "timestamp": timestamp.rstrip(b"\0").decode("utf-8", errors="replace"),
+                "price": None if math.isnan(price) else price,
+                "change_percent": None if math.isnan(change_percent) else change_percent,
+                "updated_at": updated_at,
+            }
+        return None
+
+    def symbols(self) -> List[str]:
+        return [s.decode("utf-8") for s in (self._slot_symbol(i) for i in range(self.capacity)) if s]
+
+    def close(self):
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self):
+        """Remove the segment; only the creating process should call this."""
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach without letting this process's resource tracker unlink the segment on exit."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+class QuoteBoardRefresher:
+    """Keeps a QuoteBoard up to date from a provider.
+
+    The provider passed here must not itself read from the board. Quotes are
+    refreshed every `interval` seconds, or every `provider.poll_interval()` when
+    `interval` is None, so refreshes follow the market session.
+    """
+
+    def __init__(self, provider, board: QuoteBoard, symbols: Iterable[str], interval: Optional[float] = None):
+        self.provider = provider
+        self.board = board
+        self.symbols = list(symbols)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> int:
+        """Fetch every symbol in one batch and publish the quotes; returns the number of quotes published.
+
+        The batch goes through `provider.get_live_prices`, so bulk endpoints and concurrent
+        fetches apply.
+        """
+        try:
+            quotes = self.provider.get_live_prices(self.symbols)
+        except Exception as e:
+            logger.error(f"Error refreshing quote board: {str(e)}")
+            return 0
+        published = 0
+        for symbol, quote in quotes.items():
+            if quote is not None and self.board.publish(symbol, dict(quote)):
+                published += 1
+        return published
+
+    def run(self):
+        """Refresh until `stop` is called."""
+        while not self._stop.is_set():
+            self.refresh()
+            interval = self.interval if self.interval is not None else self.provider.poll_interval()
+            self._stop.wait(interval)
+
+    def start(self) -> "QuoteBoardRefresher":
+        """Run the refresh loop in a daemon thread."""
+        self._thread = threading.Thread(target=self.run, name="jyapystock-quote-board", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,149 @@
+"""
+Refresh-ahead for jyapystock's provider caches.
+`BackgroundRefresher` watches the live-quote, stock-info and history caches of a
+`StockPriceProvider` and re-fetches entries callers used recently shortly before
+they expire, so reads keep hitting warm data instead of paying upstream latency.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRefresher:
+    """Refresh hot cache entries of `provider` in a daemon thread.
+
+    An entry is hot if a caller read it in the last `hot_window` seconds. Hot entries
+    are re-fetched once less than `ahead` (a fraction of their TTL) remains, or as soon
+    as they are missing. The cache is checked every `interval` seconds; failed
+    refreshes are retried after `retry_after` seconds. History entries only re-fetch their
+    tail, from the last cached bar to the end of the cached range, and merge it in.
+    """
+
+    def __init__(self, provider, interval: float = 1.0, ahead: float = 0.2, hot_window: float = 600.0,
+                 retry_after: float = 30.0, max_workers: Optional[int] = None):
+        self.provider = provider
+        self.interval = interval
+        self.ahead = ahead
+        self.hot_window = hot_window
+        self.retry_after = retry_after
+        self.max_workers = max_workers or provider.max_workers
+        self.running = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[Tuple[str, str]] = set()
+        self._failed: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def _ttl(self, kind: str) -> float:
+        if kind == "live":
+            return self.provider._live_quote_ttl()
+        if kind == "info":
+            return self.provider.info_ttl
+        return self.provider.history_ttl
+
+    def _cache(self, kind: str):
+        if kind == "live":
+            return self.provider.live_cache
+        if kind == "info":
+            return self.provider.info_cache
+        return self.provider.history_cache
+
+    def due(self, now: Optional[float] = None) -> list:
+        """(kind, key) entries that are hot and expire within the refresh-ahead margin."""
+        now = now if now is not None else time.time()
+        due = []
+        for entry, last_access in list(self.provider.last_access.items()):
+            if now - last_access > self.hot_window:
+                self.provider.last_access.pop(entry, None)
+                self._failed.pop(entry, None)
+                continue
+            kind, key = entry
+            cache = self._cache(kind)
+            ttl = self._ttl(kind)
+            if cache is None or ttl <= 0 or entry in self._pending:
+                continue
+            if now - self._failed.get(entry, 0.0) < self.retry_after:
+                continue
+            expires_at = cache.expires_at(key)
+            if expires_at is None and kind == "history":
+                # The requested range is only known while the entry exists; the next read refetches it
+                continue
+            if expires_at is None or expires_at - now <= self.ahead * ttl:
+                due.append(entry)
+        return due
+
+    def _refresh(self, entry: Tuple[str, str]):
+        kind, key = entry
+        provider = self.provider
+        try:
+            if kind == "live":
+                val = provider._fetch_live_price(key)
+            elif kind == "info":
+                val = provider._fetch_stock_info(key)
+            else:
+                cached = provider.history_cache.get(key)
+                val = provider._fetch_historical_price(key, _tail_start(cached), cached[1]) if cached is not None else []
+            if val is None:
+                self._failed[entry] = time.time()
+            else:
+                self._failed.pop(entry, None)
+        except Exception as e:
+            self._failed[entry] = time.time()
+            logger.error(f"Error refreshing {kind} for {key}: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard(entry)
+
+    def run_once(self) -> int:
+        """Schedule refreshes for every due entry; returns how many were scheduled."""
+        due = self.due()
+        with self._lock:
+            due = [e for e in due if e not in self._pending]
+            self._pending.update(due)
+        for entry in due:
+            if self._executor is not None:
+                self._executor.submit(self._refresh, entry)
+            else:
+                self._refresh(entry)
+        return len(due)
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Error in background refresher: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def start(self) -> "BackgroundRefresher":
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="jyapystock-refresh")
+        self._thread = threading.Thread(target=self.run, name="jyapystock-refresher", daemon=True)
+        self.running = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.running = False
+
+
+def _tail_start(cached: tuple) -> date:
+    """First day to re-fetch for a (start, end, records) history entry: its last cached bar."""
+    start, end, records = cached
+    if not records:
+        return start
+    return max(start, min(end, date.fromisoformat(records[-1]["date"][:10])))
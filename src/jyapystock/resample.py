@@ -0,0 +1,85 @@
+"""
+Higher-timeframe bars for jyapystock.
+Daily OHLCV records are aggregated into weekly, monthly or quarterly bars locally,
+so one (cached) daily fetch serves every timeframe. Each bar is labelled with the
+first calendar day of its period (Monday for weeks), like Yahoo's own weekly and
+monthly bars.
+"""
+
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List
+
+# Supported `interval` values for historical prices
+HISTORICAL_INTERVALS = ("1d", "1wk", "1mo", "1q")
+
+
+def _week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _quarter_start(day: date) -> date:
+    return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+
+
+_PERIOD_START: Dict[str, Callable[[date], date]] = {
+    "1wk": _week_start,
+    "1mo": _month_start,
+    "1q": _quarter_start,
+}
+
+
+def check_interval(interval: str) -> str:
+    if interval not in HISTORICAL_INTERVALS:
+        raise ValueError(f"Unsupported interval: {interval}. Valid options are: {list(HISTORICAL_INTERVALS)}")
+    return interval
+
+
+def period_bounds(day: date, interval: str) -> tuple:
+    """Return the inclusive (first, last) calendar days of the `interval` period containing `day`."""
+    if interval == "1d":
+        return day, day
+    first = _PERIOD_START[interval](day)
+    if interval == "1wk":
+        return first, first + timedelta(days=6)
+    months = 1 if interval == "1mo" else 3
+    year, month = divmod(first.month - 1 + months, 12)
+    return first, date(first.year + year, month + 1, 1) - timedelta(days=1)
+
+
+def resample_bars(records: Iterable[dict], interval: str) -> List[dict]:
+    """Aggregate date-sorted daily records into `interval` bars in one pass.
+
+    Open is the first available open of the period, high/low the extremes, close the last
+    available close and volume the sum; missing (None) values are skipped. '1d' returns the
+    records unchanged.
+    """
+    check_interval(interval)
+    if interval == "1d":
+        return list(records)
+    period_start = _PERIOD_START[interval]
+    bars = []
+    label = bar = None
+    for record in records:
+        day = record["date"]
+        day = date.fromisoformat(day[:10]) if isinstance(day, str) else day
+        start = period_start(day)
+        if start != label:
+            label = start
+            bar = {"date": start.isoformat(), "open": None, "high": None, "low": None, "close": None, "volume": None}
+            bars.append(bar)
+        if bar["open"] is None:
+            bar["open"] = record.get("open")
+        high, low = record.get("high"), record.get("low")
+        if high is not None and (bar["high"] is None or high > bar["high"]):
+            bar["high"] = high
+        if low is not None and (bar["low"] is None or low < bar["low"]):
+            bar["low"] = low
+        if record.get("close") is not None:
+            bar["close"] = record["close"]
+        if record.get("volume") is not None:
+            bar["volume"] = (bar["volume"] or 0) + record["volume"]
+    return bars
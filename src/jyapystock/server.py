@@ -0,0 +1,239 @@
+"""
+Local caching quote service for jyapystock (`jyapystock serve`).
+Runs one `StockPriceProvider` behind a small HTTP/JSON API so many clients share
+its caches and upstream connections. Identical concurrent requests are coalesced
+into a single upstream fetch, and quote updates can be streamed as server-sent events.
+
+Endpoints (symbols are comma separated):
+  GET /live?symbols=AAPL,MSFT
+  GET /historical?symbols=AAPL&start=2024-01-01&end=2024-12-31[&interval=1wk]
+  GET /info?symbols=AAPL
+  GET /stream?symbols=AAPL,MSFT[&interval=5]   (text/event-stream)
+  GET /health
+"""
+
+import json
+import logging
+import math
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from jyapystock.cache import SingleFlight, TTLCache
+from jyapystock.resample import check_interval
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on symbols per request, to keep one client from monopolising the upstream sources
+MAX_SYMBOLS_PER_REQUEST = 200
+
+
+class QuoteService:
+    """Shared, coalescing cache in front of a provider.
+
+    `live_ttl` keeps live quotes for a few seconds even during market hours so that
+    bursts from many clients collapse into one upstream call per symbol; historical
+    data and stock info are cached for `history_ttl` and `info_ttl` seconds.
+    """
+
+    def __init__(self, provider, live_ttl: float = 5.0, history_ttl: float = 900.0, info_ttl: float = 3600.0,
+                 max_entries: int = 10000):
+        self.provider = provider
+        self.live_ttl = live_ttl
+        self.history_ttl = history_ttl
+        self.info_ttl = info_ttl
+        self._cache = TTLCache(max_entries=max_entries)
+        self._flight = SingleFlight()
+
+    def _cached(self, key: tuple, ttl: float, fetch):
+        val = self._cache.get(key)
+        if val is not None:
+            return val
+
+        def load():
+            val = self._cache.get(key)
+            if val is None:
+                val = fetch()
+                if val is not None and ttl > 0:
+                    self._cache.set(key, val, ttl)
+            return val
+        return self._flight.do(key, load)
+
+    def live(self, symbols: List[str]) -> Dict[str, Optional[dict]]:
+        keys = [s.upper() for s in symbols]
+        result = {k: self._cache.get(("live", k)) for k in keys}
+        missing = [k for k, v in result.items() if v is None]
+        if len(missing) == 1:
+            result[missing[0]] = self._cached(("live", missing[0]), self.live_ttl,
+                                               lambda: _plain(self.provider.get_live_price(missing[0])))
+        elif missing:
+            # Let the provider batch the remaining symbols; coalesce the batch as a whole
+            fetched = self._flight.do(("live-batch", tuple(missing)),
+                                      lambda: self.provider.get_live_prices(missing))
+            for k in missing:
+                val = _plain(fetched.get(k))
+                if val is not None and self.live_ttl > 0:
+                    self._cache.set(("live", k), val, self.live_ttl)
+                result[k] = val
+        return result
+
+    def historical(self, symbols: List[str], start: str, end: str, interval: str = "1d") -> Dict[str, Optional[list]]:
+        options = {"interval": interval} if check_interval(interval) != "1d" else {}
+        return {
+            s.upper(): self._cached(("historical", s.upper(), start, end, interval), self.history_ttl,
+                                    lambda s=s: _plain(self.provider.get_historical_price(s, start, end, **options)))
+            for s in symbols
+        }
+
+    def info(self, symbols: List[str]) -> Dict[str, Optional[dict]]:
+        return {
+            s.upper(): self._cached(("info", s.upper()), self.info_ttl,
+                                    lambda s=s: self.provider.get_stock_info(s))
+            for s in symbols
+        }
+
+    def stream(self, symbols: List[str], interval: Optional[float] = None) -> Iterator[Tuple[str, dict]]:
+        """Yield (symbol, quote) whenever a symbol's quote changes, polling every `interval`
+        seconds (default: the provider's market-session poll interval, capped at 60 s)."""
+        last: Dict[str, Optional[dict]] = {}
+        while True:
+            for symbol, quote in self.live(symbols).items():
+                if quote is not None and quote != last.get(symbol):
+                    last[symbol] = quote
+                    yield symbol, quote
+            wait = interval if interval is not None else min(self.provider.poll_interval(), 60.0)
+            time.sleep(max(wait, self.live_ttl, 0.1))
+
+
+def _plain(val):
+    """Convert compact results (Quote, BarSeries) back to plain dicts/lists for JSON."""
+    if val is None:
+        return None
+    if hasattr(val, "to_records"):
+        return val.to_records()
+    if hasattr(val, "to_dict") and not isinstance(val, dict):
+        return val.to_dict()
+    return val
+
+
+def _json_default(value):
+    # NumPy/pandas scalars and timestamps that some sources leave in their records
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _sanitize(value):
+    """Replace NaN/inf (not valid JSON) with None."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _sanitize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_sanitize(v) for v in value]
+    return value
+
+
+def _dumps(value) -> bytes:
+    return json.dumps(_sanitize(value), default=_json_default).encode("utf-8")
+
+
+class QuoteRequestHandler(BaseHTTPRequestHandler):
+    server_version = "jyapystock"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> QuoteService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def _send_json(self, status: int, payload):
+        body = _dumps(payload)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _symbols(self, query) -> List[str]:
+        symbols = [s.strip() for raw in query.get("symbols", []) for s in raw.split(",") if s.strip()]
+        if not symbols:
+            raise ValueError("Missing 'symbols' parameter.")
+        if len(symbols) > MAX_SYMBOLS_PER_REQUEST:
+            raise ValueError(f"At most {MAX_SYMBOLS_PER_REQUEST} symbols per request.")
+        return list(dict.fromkeys(symbols))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        try:
+            if url.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            elif url.path == "/live":
+                self._send_json(200, self.service.live(self._symbols(query)))
+            elif url.path == "/historical":
+                if "start" not in query or "end" not in query:
+                    raise ValueError("Missing 'start' or 'end' parameter.")
+                interval = query["interval"][0] if "interval" in query else "1d"
+                self._send_json(200, self.service.historical(self._symbols(query), query["start"][0], query["end"][0], interval))
+            elif url.path == "/info":
+                self._send_json(200, self.service.info(self._symbols(query)))
+            elif url.path == "/stream":
+                interval = float(query["interval"][0]) if "interval" in query else None
+                self._stream(self._symbols(query), interval)
+            else:
+                self._send_json(404, {"error": f"Unknown endpoint: {url.path}"})
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:
+            logger.error(f"Error handling {self.path}: {str(e)}")
+            self._send_json(500, {"error": "Internal error"})
+
+    def _stream(self, symbols: List[str], interval: Optional[float]):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        # The status line is sent: from here on, failures end the stream with an error event
+        # instead of going to do_GET's handlers, which would write a second response into the body
+        try:
+            for symbol, quote in self.service.stream(symbols, interval):
+                self.wfile.write(b"event: quote\ndata: " + _dumps(dict(quote, symbol=symbol)) + b"\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:
+            logger.error(f"Error streaming {','.join(symbols)}: {str(e)}")
+            try:
+                self.wfile.write(b"event: error\ndata: " + _dumps({"error": "Internal error"}) + b"\n\n")
+                self.wfile.flush()
+            except OSError:
+                pass
+
+
+def make_server(provider, host: str = "127.0.0.1", port: int = 8050, **service_options) -> ThreadingHTTPServer:
+    """Build (but do not start) the HTTP server; `service_options` are passed to `QuoteService`."""
+    server = ThreadingHTTPServer((host, port), QuoteRequestHandler)
+    server.daemon_threads = True
+    server.service = QuoteService(provider, **service_options)
+    return server
+
+
+def serve(provider, host: str = "127.0.0.1", port: int = 8050, **service_options):
+    """Serve `provider` over HTTP until interrupted."""
+    server = make_server(provider, host, port, **service_options)
+    logger.info(f"jyapystock serving on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,171 @@
+"""
+Source backends for jyapystock.
+Every data source (yfinance, NSE, NASDAQ, ...) is a `SourceBackend` registered
+under its name. `StockPriceProvider` resolves its `source` setting against the
+registry once, at construction, into ready-to-walk chains per operation, so calls
+only iterate a list. Built-in backends live next to their fetchers in the
+`*_support` modules and are loaded on first use; a backend whose client library
+is not installed is recorded in `UNAVAILABLE_SOURCES` instead.
+
+Third-party backends register with `register_source`, or through the
+`jyapystock.sources` entry-point group:
+
+    [project.entry-points."jyapystock.sources"]
+    inhouse = "inhouse_feed.jyapystock:InHouseBackend"
+"""
+
+import importlib
+import logging
+import threading
+from datetime import date, datetime
+from importlib.metadata import entry_points
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "jyapystock.sources"
+
+# Operations a backend can implement, as used for the provider's per-operation chains
+SOURCE_OPERATIONS = ("live_price", "historical_prices", "intraday_bars", "stock_info")
+
+# Built-in backends in 'auto' fallback order: (name, "module:Class", extra providing its libraries)
+BUILTIN_SOURCES = (
+    ("yfinance", "jyapystock.yfinance_support:YFinanceBackend", "yfinance"),
+    ("nse", "jyapystock.nse_support:NSEBackend", "india"),
+    ("bse", "jyapystock.bse_support:BSEBackend", "india"),
+    ("nasdaq", "jyapystock.nasdaq_support:NasdaqBackend", None),
+    ("alphavantage", "jyapystock.alpha_vantage_support:AlphaVantageBackend", None),
+    ("nyse", "jyapystock.nyse_support:NYSEBackend", None),
+)
+
+# Sources whose client libraries are not installed, mapped to the missing module
+UNAVAILABLE_SOURCES: Dict[str, str] = {}
+SOURCE_EXTRAS = {name: extra for name, _, extra in BUILTIN_SOURCES if extra}
+
+
+class SourceBackend:
+    """Base class for a data source.
+
+    Subclasses set `name`, the `countries` and `exchanges` they cover and override the
+    operations they support; the provider only routes an operation to backends that
+    override it. Each operation gets the calling provider (for `country`, `exchange`,
+    `alpha_vantage_api_key`, ...) and the call's `Deadline`, and returns None when the
+    source has no data so the provider falls back to the next source.
+    """
+
+    name = ""
+    countries: Sequence[str] = ()
+    exchanges: Sequence[str] = ()
+
+    def supports(self, country: str, exchange: Optional[str] = None) -> bool:
+        """Whether the backend serves `country` (and `exchange`, if one is set)."""
+        return country in self.countries and (not exchange or exchange in self.exchanges)
+
+    def enabled(self, provider) -> bool:
+        """Whether the backend can be used with this provider's settings (e.g. an API key is set)."""
+        return True
+
+    def implements(self, operation: str) -> bool:
+        return getattr(type(self), operation, None) is not getattr(SourceBackend, operation)
+
+    def live_price(self, provider, symbol: str, deadline) -> Optional[dict]:
+        """Live quote with 'timestamp', 'price' and 'change_percent'."""
+        return None
+
+    def historical_prices(self, provider, symbol: str, start: date, end: date, deadline) -> Optional[list]:
+        """Daily records with date/open/high/low/close/volume for the inclusive range [start, end]."""
+        return None
+
+    def intraday_bars(self, provider, symbol: str, interval: str, start: datetime, end: datetime, deadline) -> Optional[list]:
+        """Intraday records with datetime/open/high/low/close/volume; `interval` is e.g. '5m'."""
+        return None
+
+    def stock_info(self, provider, symbol: str, deadline) -> Optional[dict]:
+        return None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+_registry: Dict[str, SourceBackend] = {}
+_loaded = False
+_lock = threading.RLock()
+
+
+def _instantiate(obj) -> SourceBackend:
+    backend = obj() if isinstance(obj, type) else obj
+    if not isinstance(backend, SourceBackend):
+        raise TypeError(f"{obj!r} is not a SourceBackend")
+    return backend
+
+
+def _load_entry_points():
+    eps = entry_points()
+    group = eps.select(group=ENTRY_POINT_GROUP) if hasattr(eps, "select") else eps.get(ENTRY_POINT_GROUP, [])
+    for ep in group:
+        try:
+            backend = _instantiate(ep.load())
+            backend.name = backend.name or ep.name
+            _registry.setdefault(backend.name, backend)
+        except Exception as e:
+            logger.error(f"Failed to load jyapystock source backend '{ep.name}': {str(e)}")
+
+
+def _ensure_loaded():
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if _loaded:
+            return
+        for name, target, _ in BUILTIN_SOURCES:
+            module_name, class_name = target.split(":")
+            try:
+                module = importlib.import_module(module_name)
+            except ImportError as e:
+                UNAVAILABLE_SOURCES[name] = e.name
+                continue
+            _registry.setdefault(name, getattr(module, class_name)())
+        _load_entry_points()
+        _loaded = True
+
+
+def register_source(backend, replace: bool = False) -> SourceBackend:
+    """Register a backend (instance or class) under its `name`; it joins the end of the 'auto' order.
+
+    Registering a name that already exists raises ValueError unless `replace` is True, in which
+    case the new backend takes the old one's place in the order.
+    """
+    backend = _instantiate(backend)
+    if not backend.name:
+        raise ValueError("Source backends need a name.")
+    _ensure_loaded()
+    with _lock:
+        if backend.name in _registry and not replace:
+            raise ValueError(f"Source '{backend.name}' is already registered.")
+        _registry[backend.name] = backend
+        UNAVAILABLE_SOURCES.pop(backend.name, None)
+    return backend
+
+
+def unregister_source(name: str) -> Optional[SourceBackend]:
+    _ensure_loaded()
+    with _lock:
+        return _registry.pop(name, None)
+
+
+def get_source(name: str) -> Optional[SourceBackend]:
+    _ensure_loaded()
+    return _registry.get(name)
+
+
+def registered_sources() -> List[str]:
+    """Names of the registered (installed) backends, in 'auto' fallback order."""
+    _ensure_loaded()
+    return list(_registry)
+
+
+def known_sources() -> List[str]:
+    """Registered backends plus built-in ones whose libraries are missing."""
+    _ensure_loaded()
+    return list(_registry) + [name for name in UNAVAILABLE_SOURCES if name not in _registry]
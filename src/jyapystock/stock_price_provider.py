@@ -3,23 +3,100 @@ jyapystock: Stock price library supporting live and historical prices for Indian
 Sources: yfinance (default), Alpha Vantage (optional)
 """
 
-from datetime import datetime
-from typing import Optional, Union, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterator, Optional, Tuple, Union, List
+import logging
 import os
-from jyapystock.alpha_vantage_support import get_alpha_vantage_live_price, get_alpha_vantage_historical_price
-from jyapystock.yfinance_support import get_yfinance_live_price, get_yfinance_historical_prices, get_yfinance_stock_info
-from jyapystock.nasdaq_support import get_nasdaq_live_price, get_nasdaq_historical_prices
-from jyapystock.nse_support import get_nse_live_price, get_nse_historical_prices
-from jyapystock.bse_support import get_bse_live_price, get_bse_historical_prices
-from jyapystock.nyse_support import get_nyse_live_price, get_nyse_historical_prices
+import threading
+import time
+from dateutil.parser import parse
+from jyapystock.alpha_vantage_support import get_alpha_vantage_live_prices
+from jyapystock.nasdaq_support import get_nasdaq_screener
+try:
+    from jyapystock.nse_support import get_nse_index_quotes, get_nse_bhavcopy
+except ImportError:
+    pass  # the `nse` client is not installed; the nse source is unavailable
+from jyapystock.sources import SOURCE_EXTRAS, SOURCE_OPERATIONS, UNAVAILABLE_SOURCES, get_source, known_sources, registered_sources
+from jyapystock.intraday_cache import IntradayBarCache, INTRADAY_INTERVALS, to_epoch
+from jyapystock.models import Quote, BarSeries, ListingTable
+from jyapystock.trading_calendar import TradingCalendar, get_calendar, DEFAULT_EXCHANGE_PER_COUNTRY, PRE_MARKET, OPEN, POST_MARKET, CLOSED
+from jyapystock.cache import TTLCache
+from jyapystock.http_client import HTTPCache
+from jyapystock.windowed import DEFAULT_WINDOW_DAYS, IncompleteHistory, fetch_windowed, split_range
+from jyapystock.resample import check_interval, period_bounds, resample_bars
+from jyapystock.deadline import Deadline
+from jyapystock.quote_board import QuoteBoard
+from jyapystock.refresh import BackgroundRefresher
+from jyapystock.throttle import set_host_limits
+
+logger = logging.getLogger(__name__)
+
+# Seconds between live-quote polls per market session state. Outside the regular
+# session quotes are also served from cache for this long; after the close they
+# are cached until the next pre-market session starts.
+DEFAULT_POLL_INTERVALS = {
+    PRE_MARKET: 60,
+    OPEN: 15,
+    POST_MARKET: 60,
+}
+
+# NSE indices whose constituent listings serve as one-request bulk quotes, tried in order.
+# The bulk path is used for batches of at least NSE_BULK_MIN_SYMBOLS uncached symbols when
+# an index covers at least NSE_BULK_MIN_COVERAGE of them.
+NSE_BULK_INDICES = ("NIFTY 50", "NIFTY 500")
+NSE_BULK_MIN_SYMBOLS = 5
+NSE_BULK_MIN_COVERAGE = 0.5
+
+# Shortest run of missing weekdays treated as a data gap in years without a holiday list
+MIN_UNKNOWN_YEAR_GAP = 2
+
+# Entries kept per provider cache before the ones closest to expiry are evicted. History
+# entries hold whole date ranges of bars, so fewer of them are kept.
+DEFAULT_CACHE_MAX_ENTRIES = {
+    "live": 4096,
+    "info": 1024,
+    "history": 256,
+}
 
 class StockPriceProvider:
-    def __init__(self, country: str, source: Optional[Union[str, List[str]]] = None, alpha_vantage_api_key: Optional[str] = None, exchange: Optional[str] = None):
+    def __init__(self, country: str, source: Optional[Union[str, List[str]]] = None, alpha_vantage_api_key: Optional[str] = None, exchange: Optional[str] = None, intraday_cache_dir: Optional[str] = None, compact: bool = False, cache_live_quotes: bool = True, poll_intervals: Optional[dict] = None, http_cache: Union[bool, HTTPCache, None] = None, max_workers: int = 4, history_windows: Optional[dict] = None, timeout: Optional[float] = None, quote_board: Union[str, QuoteBoard, None] = None, quote_board_max_age: Optional[float] = None, info_ttl: float = 3600, history_ttl: float = 900, host_limits: Optional[dict] = None, snapshot_ttl: float = 300, cache_max_entries: Optional[dict] = None):
         """Create a provider.
 
         If `source` is None or 'auto', the provider will try available free sources
         in order (yfinance first, then Alpha Vantage if an API key is provided).
         Otherwise specify `source` as a string (e.g., 'yfinance') or a list of sources (e.g., ['yfinance'] or ['alphavantage', 'yfinance']).
+        Intraday bars are cached in memory; pass `intraday_cache_dir` to also keep them on disk across runs.
+        With `compact=True`, live prices are returned as slotted `Quote` objects and historical
+        prices as array-backed `BarSeries`, both of which keep dict/list style access.
+        Outside regular trading hours live quotes are served from cache (see `poll_interval`);
+        pass `cache_live_quotes=False` to always hit the upstream sources, or `poll_intervals`
+        to override `DEFAULT_POLL_INTERVALS` per session state.
+        `http_cache=True` (or an `HTTPCache` instance, which providers may share) gives this provider
+        a conditional-request cache for the NASDAQ and NYSE endpoints; without one, the process-wide
+        cache installed with `jyapystock.http_client.set_http_cache` (if any) is used.
+        Long historical ranges are split into per-source windows (`history_windows`, days per
+        source, defaulting to `DEFAULT_WINDOW_DAYS`) fetched with up to `max_workers` threads.
+        `timeout` is the default end-to-end budget in seconds for every call (None: unbounded);
+        each method also takes its own `timeout` (seconds or a `Deadline`) that overrides it.
+        The remaining budget caps every source and symbol-variant request, and the fallback
+        chain stops once it is spent.
+        With `quote_board` (a `QuoteBoard` or the name of its shared memory segment), live prices
+        are read from the board first and only fetched upstream when the symbol is missing or older
+        than `quote_board_max_age` seconds (default: two poll intervals).
+        Stock info and historical data are cached for `info_ttl` and `history_ttl` seconds (0 disables);
+        `warm` pre-fetches a watchlist and `start_refresher` keeps recently used entries fresh.
+        The live, info and history caches hold at most `cache_max_entries` entries each (overrides
+        `DEFAULT_CACHE_MAX_ENTRIES` per cache; None means unbounded); the access times the refresher
+        uses are dropped with the entries evicted and kept to the same total.
+        Requests to NASDAQ, NYSE, NSE, BSE and Alpha Vantage go through process-wide per-host limiters
+        that back off on throttling; `host_limits` overrides them per source, e.g.
+        `{"nasdaq": {"max_concurrency": 8, "rate": 10.0}}` (see `jyapystock.throttle`).
+        Exchange-wide snapshots (`get_market_snapshot`) are cached for `snapshot_ttl` seconds.
+        Sources whose client libraries are not installed (see `jyapystock.sources`) are skipped,
+        so a lightweight install without pandas, yfinance, nse or bse works with the HTTP-only sources.
+        If no installed source covers the country and exchange, an ImportError names the extras to install.
         """
         self.country = country.lower()
         self.check_country_validity()
@@ -31,7 +108,7 @@ class StockPriceProvider:
         else:
             self.source = ["auto"]
         self.check_source_validity()
-        self.alpha_vantage_api_key = alpha_vantage_api_key
+        self.alpha_vantage_api_key = alpha_vantage_api_key or os.environ.get("ALPHAVANTAGE_API_KEY")
         self.exchange = exchange
         if self.exchange:
             self.exchange = self.exchange.lower()
@@ -41,30 +118,49 @@ class StockPriceProvider:
             "india": ["nse", "bse"]
         }
         self.check_exchange_validity()
-        
-        self.exchange_per_source = {
-            "yfinance":["nse", "bse", "nasdaq", "nyse"],
-            "alphavantage":["nasdaq", "nyse"], 
-            "nasdaq":["nasdaq"], 
-            "nyse": ["nyse"],
-            "nse":["nse"], 
-            "bse":["bse"]
-        }
-        self.country_per_source = {
-            "yfinance":["india", "usa"],
-            "alphavantage":["usa"], 
-            "nasdaq":["usa"], 
-            "nyse": ["usa"],
-            "nse":["india"], 
-            "bse":["india"]
-        }
+        # Eligible backends in fallback order, and per operation the ones implementing it
+        self.backends = self._resolve_sources()
+        if not self.backends and "auto" in self.source:
+            self._raise_no_sources()
+        self.source_chains = {op: [b for b in self.backends if b.implements(op)] for op in SOURCE_OPERATIONS}
+        self.calendar = get_calendar(self.exchange or DEFAULT_EXCHANGE_PER_COUNTRY[self.country])
+        self.intraday_cache = IntradayBarCache(intraday_cache_dir)
+        self.compact = compact
+        self.poll_intervals = dict(DEFAULT_POLL_INTERVALS, **(poll_intervals or {}))
+        self.cache_max_entries = dict(DEFAULT_CACHE_MAX_ENTRIES, **(cache_max_entries or {}))
+        # (kind, KEY) -> last time a caller asked for it, oldest first; the background refresher keeps these warm
+        self.last_access = {}
+        self._access_lock = threading.Lock()
+        self.live_cache = self._bounded_cache("live") if cache_live_quotes else None
+        self.http_cache = http_cache if isinstance(http_cache, HTTPCache) else (HTTPCache() if http_cache else None)
+        for source_or_host, limits in (host_limits or {}).items():
+            set_host_limits(source_or_host, **limits)
+        self.max_workers = max_workers
+        self.history_windows = dict(DEFAULT_WINDOW_DAYS, **(history_windows or {}))
+        self.timeout = timeout
+        self.quote_board = QuoteBoard(quote_board) if isinstance(quote_board, str) else quote_board
+        self.quote_board_max_age = quote_board_max_age
+        self.info_ttl = info_ttl
+        self.history_ttl = history_ttl
+        self.info_cache = self._bounded_cache("info")
+        self.history_cache = self._bounded_cache("history")
+        self.refresher = None
+        # Constituents seen per NSE index, to skip bulk requests for indices that would not cover a batch
+        self.nse_index_members = TTLCache()
+        self.snapshot_ttl = snapshot_ttl
+        self.snapshot_cache = TTLCache()
+        # Called with (symbol, quote) for every live quote fetched upstream (see add_quote_listener)
+        self.quote_listeners = []
 
     def check_source_validity(self):
         """Check if the provided source is valid."""
-        valid_sources = ["yfinance", "alphavantage", "nasdaq", "nse", "bse", "nyse", "auto"]
+        valid_sources = known_sources() + ["auto"]
         for s in self.source:
             if s not in valid_sources:
                 raise ValueError(f"Unknown source: {s}. Valid options are: {valid_sources}")
+            if get_source(s) is None and s != "auto":
+                raise ImportError(f"Source '{s}' needs the '{UNAVAILABLE_SOURCES[s]}' package; "
+                                  f"install it with: pip install 'jyapystock[{SOURCE_EXTRAS[s]}]'")
 
     def check_country_validity(self):
         """Check if the provided country is valid."""
@@ -79,110 +175,574 @@ class StockPriceProvider:
             raise ValueError(f"Unknown exchange: {self.exchange}. Valid options are: {self.exchange_per_country[self.country]}")
     
     def is_valid_source(self, src):
-        if not self.country in self.country_per_source[src]:
-            return False
-        if not self.exchange:
-            return True
-        return self.exchange in self.exchange_per_source[src]
+        backend = get_source(src)
+        return backend is not None and backend.supports(self.country, self.exchange)
+
+    def _raise_no_sources(self):
+        """'auto' found nothing to use: name the extras whose sources are missing, if any."""
+        where = f"{self.country}/{self.exchange}" if self.exchange else self.country
+        extras = sorted({SOURCE_EXTRAS[name] for name in UNAVAILABLE_SOURCES if name in SOURCE_EXTRAS})
+        if extras:
+            options = " or ".join(f"pip install 'jyapystock[{extra}]'" for extra in extras)
+            raise ImportError(f"No installed source covers {where}; install one with: {options}")
+        raise ValueError(f"No registered source covers {where}.")
+
+    def _resolve_sources(self) -> list:
+        """Backends for `source` in order ('auto' expands to every registered backend), keeping
+        those installed, covering this country/exchange and enabled by the provider's settings."""
+        chain = []
+        for src in self.source:
+            for name in registered_sources() if src == "auto" else [src]:
+                backend = get_source(name)
+                if backend is None or backend in chain:
+                    continue
+                if backend.supports(self.country, self.exchange) and backend.enabled(self):
+                    chain.append(backend)
+        return chain
+
+    def _deadline(self, timeout: Union[float, Deadline, None]) -> Deadline:
+        """Start the budget for one call: the given timeout/Deadline, else the provider default."""
+        return Deadline.coerce(timeout if timeout is not None else self.timeout)
+
+    def _bounded_cache(self, kind: str) -> TTLCache:
+        """Cache for `kind` ('live', 'info' or 'history') sized by `cache_max_entries`; evicting an entry forgets its access."""
+        return TTLCache(self.cache_max_entries.get(kind), on_evict=lambda key: self._forget_access(kind, key))
+
+    def _forget_access(self, kind: str, key: str):
+        with self._access_lock:
+            self.last_access.pop((kind, key), None)
+
+    def _touch(self, kind: str, key: str, now: Optional[float] = None):
+        """Record a caller's access to (kind, key); beyond the caches' total size the oldest accesses are dropped."""
+        entry = (kind, key)
+        with self._access_lock:
+            self.last_access.pop(entry, None)
+            self.last_access[entry] = now if now is not None else time.time()
+            limits = [self.cache_max_entries.get(k) for k in DEFAULT_CACHE_MAX_ENTRIES]
+            if None not in limits:
+                while len(self.last_access) > sum(limits):
+                    del self.last_access[next(iter(self.last_access))]
         
-    def get_live_price(self, symbol: str) -> Optional[dict]:
+    def get_live_price(self, symbol: str, timeout: Union[float, Deadline, None] = None) -> Optional[dict]:
         """
         Get the live price for the given symbol.
         :param symbol: Symbol to fetch the live price for
         :type symbol: str
+        :param timeout: End-to-end budget in seconds (or a `Deadline`) across all sources
         :return: Returns a dict with 'timestamp', 'price', and 'change_percent' (% change from previous day close),
-                 or None if not available.
-        :rtype: dict | None
+                 or None if not available. A `Quote` is returned instead of a dict when the provider is `compact`.
+        :rtype: dict | Quote | None
         """
-        for src in self.source:
-            # yfinance first, respecting country-specific variants
-            if (src == "yfinance" or src == "auto") and self.is_valid_source("yfinance"):
-                val = get_yfinance_live_price(symbol, self.country, self.exchange)
-                if val is not None:
-                    return val
-            
-            # Try NSE for India stocks
-            if (src == "nse" or src == "auto") and self.is_valid_source("nse"):
-                val = get_nse_live_price(symbol)
-                if val is not None:
-                    return val
-            
-            # Try BSE for India stocks
-            if (src == "bse" or src == "auto") and self.is_valid_source("bse"):
-                val = get_bse_live_price(symbol)
-                if val is not None:
-                    return val
-            
-            # Try NASDAQ-specific provider for USA symbols
-            if (src == "nasdaq" or src == "auto") and self.is_valid_source("nasdaq"):
-                val = get_nasdaq_live_price(symbol, self.country)
-                if val is not None:
-                    return val
-            
-            if (src == "alphavantage" or src == "auto") and self.is_valid_source("alphavantage"):
-                # Try Alpha Vantage if API key available
-                av_key = self.alpha_vantage_api_key or os.environ.get("ALPHAVANTAGE_API_KEY")
-                if av_key:
-                    val = get_alpha_vantage_live_price(symbol, av_key)
-                    if val is not None:
-                        return val
+        key = symbol.upper()
+        self._touch("live", key)
+        val = self.live_cache.get(key) if self.live_cache is not None else None
+        if val is not None:
+            val = dict(val)
+        else:
+            val = self._read_quote_board(key)
+        if val is None:
+            val = self._fetch_live_price(symbol, self._deadline(timeout))
+        return Quote.from_dict(val) if self.compact else val
+
+    def _fetch_live_price(self, symbol: str, deadline: Optional[Deadline] = None) -> Optional[dict]:
+        """Fetch a live price from the sources and cache it for the current session's TTL."""
+        val = self._get_live_price_from_sources(symbol, deadline)
+        if val is not None and self.live_cache is not None:
+            ttl = self._live_quote_ttl()
+            if ttl > 0:
+                self.live_cache.set(symbol.upper(), dict(val), ttl)
+        if val is not None:
+            self._notify_quote(symbol, val)
+        return val
+
+    def add_quote_listener(self, listener: Callable[[str, dict], None]):
+        """
+        Call `listener(symbol, quote)` for every live quote fetched from an upstream source, including
+        batch requests and background refreshes (cache hits are not repeated). Listeners run on the
+        fetching thread; exceptions are logged and do not affect the caller.
+        """
+        self.quote_listeners.append(listener)
+
+    def remove_quote_listener(self, listener: Callable[[str, dict], None]):
+        if listener in self.quote_listeners:
+            self.quote_listeners.remove(listener)
+
+    def _notify_quote(self, symbol: str, quote: dict):
+        for listener in list(self.quote_listeners):
+            try:
+                listener(symbol, quote)
+            except Exception as e:
+                logger.error(f"Quote listener failed for {symbol}: {str(e)}")
+
+    def get_live_prices(self, symbols: List[str], timeout: Union[float, Deadline, None] = None) -> dict:
+        """
+        Get live prices for several symbols, fetching up to `max_workers` of them concurrently.
+        :param timeout: End-to-end budget in seconds (or a `Deadline`) for the whole batch
+        :return: Returns a dict mapping each requested symbol to its quote (as `get_live_price`), or None.
+        :rtype: dict
+
+        For Indian symbols, when NSE is an allowed source and most of the batch belongs to one of
+        `NSE_BULK_INDICES`, their quotes come from that index's constituent listing in a single request.
+        When Alpha Vantage is the first source, quotes are fetched with its bulk endpoint, up to 100
+        symbols per request. Symbols a bulk request does not cover are fetched one by one.
+        """
+        deadline = self._deadline(timeout)
+        symbols = list(dict.fromkeys(symbols))
+        result = {}
+        pending = symbols
+        live_chain = [b.name for b in self.source_chains["live_price"]]
+        use_nse = len(symbols) >= NSE_BULK_MIN_SYMBOLS and "nse" in live_chain
+        av_key = self.alpha_vantage_api_key if live_chain[:1] == ["alphavantage"] else None
+        if len(symbols) > 1 and (use_nse or av_key):
+            for s in symbols:
+                cached = self.live_cache.get(s.upper()) if self.live_cache is not None else None
+                if cached is not None:
+                    result[s] = Quote.from_dict(cached) if self.compact else dict(cached)
+            pending = [s for s in symbols if s not in result]
+            if use_nse:
+                result.update(self._get_nse_bulk_quotes(pending, deadline))
+                pending = [s for s in pending if s not in result]
+            if av_key and len(pending) > 1:
+                result.update(self._store_bulk_quotes(get_alpha_vantage_live_prices(pending, av_key, deadline=deadline)))
+                pending = [s for s in pending if s not in result]
+        if len(pending) == 1:
+            result[pending[0]] = self.get_live_price(pending[0], timeout=deadline)
+        elif pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(pending)))) as executor:
+                result.update(zip(pending, executor.map(lambda s: self.get_live_price(s, timeout=deadline), pending)))
+        return {s: result.get(s) for s in symbols}
+
+    def _get_nse_bulk_quotes(self, symbols: List[str], deadline: Deadline) -> dict:
+        """Quotes for `symbols` from NSE index listings, for indices that cover most of them."""
+        names = {}
+        for s in symbols:
+            name = s.upper()
+            for suffix in (".NS", ".BO"):
+                if name.endswith(suffix):
+                    name = name[:-len(suffix)]
+            names.setdefault(name, s)
+        found = {}
+        for index in NSE_BULK_INDICES:
+            remaining = [n for n in names if n not in found]
+            if len(remaining) < NSE_BULK_MIN_SYMBOLS or deadline.expired():
+                break
+            members = self.nse_index_members.get(index)
+            if members is not None and len(members.intersection(remaining)) < NSE_BULK_MIN_COVERAGE * len(remaining):
+                continue
+            quotes = get_nse_index_quotes(index, deadline=deadline)
+            if not quotes:
+                continue
+            self.nse_index_members.set(index, frozenset(quotes), 24 * 3600)
+            covered = [n for n in remaining if n in quotes]
+            if len(covered) >= NSE_BULK_MIN_COVERAGE * len(remaining):
+                found.update((n, quotes[n]) for n in covered)
+
+        return self._store_bulk_quotes({names[name]: quote for name, quote in found.items()})
+
+    def _store_bulk_quotes(self, quotes: dict) -> dict:
+        """Record access to and cache quotes fetched in bulk, converted as `get_live_price` returns them."""
+        ttl = self._live_quote_ttl()
+        now = time.time()
+        result = {}
+        for symbol, quote in quotes.items():
+            self._touch("live", symbol.upper(), now)
+            if self.live_cache is not None and ttl > 0:
+                self.live_cache.set(symbol.upper(), dict(quote), ttl)
+            result[symbol] = Quote.from_dict(quote) if self.compact else dict(quote)
+            self._notify_quote(symbol, quote)
+        return result
+
+    def _read_quote_board(self, key: str) -> Optional[dict]:
+        """Quote published to the shared quote board, if there is a board and the quote is fresh enough."""
+        if self.quote_board is None:
+            return None
+        max_age = self.quote_board_max_age if self.quote_board_max_age is not None else 2 * self.poll_interval()
+        val = self.quote_board.read(key, max_age=max_age)
+        if val is not None:
+            val.pop("updated_at", None)
+        return val
 
-            # Try NYSE-specific provider for USA symbols
-            if (src == "nyse" or src == "auto") and self.is_valid_source("nyse"):
-                val = get_nyse_live_price(symbol)
-                if val is not None:
-                    return val
+    def poll_interval(self, now: Optional[datetime] = None) -> float:
+        """
+        Seconds a caller polling `get_live_price` should wait before the next poll.
+        Follows the market session of the provider's exchange: short during regular hours,
+        longer in pre/post-market and until the next pre-market session once the market is closed.
+        """
+        state = self.calendar.session_state(now)
+        if state == CLOSED:
+            now = now or datetime.now().astimezone()
+            if now.tzinfo is None:
+                now = now.replace(tzinfo=self.calendar.tz)
+            return max((self.calendar.next_pre_open(now) - now).total_seconds(), 0.0)
+        return float(self.poll_intervals[state])
+
+    def _live_quote_ttl(self, now: Optional[datetime] = None) -> float:
+        """How long a freshly fetched live quote may be served from cache.
+
+        0 while the market is open, unless the background refresher is running: it renews
+        quotes before they expire, so they are cached for one regular-session poll interval.
+        """
+        if self.calendar.session_state(now) == OPEN:
+            return float(self.poll_intervals[OPEN]) if self.refresher is not None and self.refresher.running else 0.0
+        return self.poll_interval(now)
+
+    def _get_live_price_from_sources(self, symbol: str, deadline: Optional[Deadline] = None) -> Optional[dict]:
+        deadline = deadline or Deadline()
+        for backend in self.source_chains["live_price"]:
+            if deadline.expired():
+                break
+            val = self._call_backend(backend, "live_price", symbol, deadline)
+            if val is not None:
+                return val
         # No sources returned a price
         return None
 
-    def get_historical_price(self, symbol: str, start: Union[str, datetime], end: Union[str, datetime]) -> Optional[list]:
-        for src in self.source:
-            # yfinance first (respecting country-specific variants)
-            if src == "yfinance" or src == "auto":
-                val = get_yfinance_historical_prices(symbol, start, end, self.country, self.exchange)
-                if val is not None:
-                    return val
-            
-            # NSE for India stocks
-            if (src == "nse" or src == "auto") and self.is_valid_source("nse"):
-                val = get_nse_historical_prices(symbol, start, end)
-                if val is not None:
-                    return val
-            
-            # BSE for India stocks
-            if (src == "bse" or src == "auto") and self.is_valid_source("bse"):
-                val = get_bse_historical_prices(symbol, start, end)
-                if val is not None:
-                    return val
-            
-            # NASDAQ historical provider (USA)
-            if (src == "nasdaq" or src == "auto") and self.is_valid_source("nasdaq"):
-                val = get_nasdaq_historical_prices(symbol, start, end, self.country)
-                if val is not None:
-                    return val
-            
-            if src == "alphavantage" or src == "auto":
-                av_key = self.alpha_vantage_api_key or os.environ.get("ALPHAVANTAGE_API_KEY")
-                if av_key:
-                    val = get_alpha_vantage_historical_price(symbol, start, end, av_key)
+    def _call_backend(self, backend, operation: str, symbol: str, *args):
+        """Run one backend operation; a failing backend counts as having no data."""
+        try:
+            return getattr(backend, operation)(self, symbol, *args)
+        except Exception as e:
+            logger.error(f"Source {backend.name} failed in {operation} for {symbol}: {str(e)}")
+            return None
+
+    def get_historical_price(self, symbol: str, start: Union[str, datetime], end: Union[str, datetime], timeout: Union[float, Deadline, None] = None, interval: str = "1d") -> Optional[list]:
+        """
+        Get daily (or weekly, monthly, quarterly) historical prices for the given symbol.
+        :param timeout: End-to-end budget in seconds (or a `Deadline`); when it runs out the
+                        records gathered so far are returned
+        :param interval: '1d', '1wk', '1mo' or '1q'. Longer bars are built locally from the daily
+                         history, which is fetched (and cached) for whole periods, so every
+                         timeframe is served from the same daily data.
+        :return: Returns a list of records with date/open/high/low/close/volume, or None if not available.
+                 A `BarSeries` is returned instead of a list when the provider is `compact`.
+        :rtype: list | BarSeries | None
+        """
+        check_interval(interval)
+        start_d = _to_date(start)
+        end_d = _to_date(end)
+        if interval != "1d":
+            # Whole periods, so the first and last bars are complete
+            start_d = period_bounds(start_d, interval)[0]
+            end_d = max(end_d, min(period_bounds(end_d, interval)[1], date.today()))
+        key = symbol.upper()
+        self._touch("history", key)
+        cached = self.history_cache.get(key)
+        if cached is not None and cached[0] <= start_d and end_d <= cached[1]:
+            lo, hi = start_d.isoformat(), end_d.isoformat()
+            # Copies, so callers cannot change what later hits are served
+            val = [dict(r) for r in cached[2] if lo <= r["date"][:10] <= hi]
+        else:
+            val = self._fetch_historical_price(symbol, start_d, end_d, self._deadline(timeout))
+        if val and interval != "1d":
+            val = resample_bars(val, interval)
+        return BarSeries.from_records(val) if self.compact else val
+
+    def _fetch_historical_price(self, symbol: str, start: date, end: date, deadline: Optional[Deadline] = None) -> Optional[list]:
+        """Fetch history from the sources; complete results are cached per symbol with their date range.
+
+        The cache keeps its own copies of the records, so the returned list is the caller's to modify.
+        """
+        deadline = deadline or Deadline()
+        val, complete = self._get_historical_price_from_sources(symbol, start, end, deadline)
+        # A result cut short by the deadline or a failed request may have gaps, so it is not kept
+        if val and complete and self.history_ttl > 0 and not deadline.expired():
+            key = symbol.upper()
+            stored = [dict(r) for r in val]
+            cached = self.history_cache.get(key)
+            if cached is not None and cached[0] <= end and start <= cached[1]:
+                # Overlapping ranges are merged so one entry keeps serving both; fetched records win
+                val_all = _merge_records(stored, cached[2])
+                self.history_cache.set(key, (min(start, cached[0]), max(end, cached[1]), val_all), self.history_ttl)
+            else:
+                self.history_cache.set(key, (start, end, stored), self.history_ttl)
+        return val
+
+    def iter_historical(self, symbols: Union[str, List[str]], start: Union[str, datetime], end: Union[str, datetime],
+                        chunk_days: int = 365, prefetch: Optional[int] = None,
+                        timeout: Union[float, Deadline, None] = None) -> Iterator[Tuple[str, list]]:
+        """
+        Stream daily historical prices as (symbol, records) chunks of at most `chunk_days` calendar days.
+        Symbols are yielded in order, each in date order. Up to `prefetch` chunks (default `max_workers`)
+        are fetched ahead in the background while the caller processes the current one, so memory stays
+        bounded by the chunks in flight rather than the whole range. Chunks are read from the history
+        cache when it covers them but are not added to it; chunks without data are skipped.
+        :param timeout: End-to-end budget in seconds (or a `Deadline`) for the whole iteration
+        :return: Yields (symbol, records) with records as in `get_historical_price` (`BarSeries` when `compact`).
+        :rtype: Iterator[tuple]
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        deadline = self._deadline(timeout)
+        start_d = _to_date(start)
+        end_d = _to_date(end)
+        tasks = ((symbol, window) for symbol in dict.fromkeys(symbols) for window in split_range(start_d, end_d, chunk_days))
+        prefetch = max(1, prefetch or self.max_workers)
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, prefetch)))
+        pending = deque()
+        try:
+            for symbol, window in tasks:
+                pending.append((symbol, executor.submit(self._historical_chunk, symbol, window[0], window[1], deadline)))
+                if len(pending) >= prefetch:
+                    break
+            while pending:
+                symbol, future = pending.popleft()
+                next_task = next(tasks, None)
+                if next_task is not None and not deadline.expired():
+                    pending.append((next_task[0], executor.submit(self._historical_chunk, next_task[0], next_task[1][0], next_task[1][1], deadline)))
+                records = future.result()
+                if records:
+                    yield symbol, BarSeries.from_records(records) if self.compact else records
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _historical_chunk(self, symbol: str, start: date, end: date, deadline: Deadline) -> Optional[list]:
+        """One chunk for `iter_historical`: from the history cache if it covers the range, else from the sources."""
+        if deadline.expired():
+            return None
+        cached = self.history_cache.get(symbol.upper())
+        if cached is not None and cached[0] <= start and end <= cached[1]:
+            lo, hi = start.isoformat(), end.isoformat()
+            return [dict(r) for r in cached[2] if lo <= r["date"][:10] <= hi]
+        return self._get_historical_price_from_sources(symbol, start, end, deadline)[0]
+
+    def get_eod_snapshot(self, day: Optional[Union[str, date, datetime]] = None, timeout: Union[float, Deadline, None] = None) -> Optional[dict]:
+        """
+        End-of-day bars for every equity on the exchange in one download (NSE daily bhavcopy; India only).
+        :param day: Trading day (defaults to the last completed session)
+        :return: Returns a dict mapping each symbol to a record with date/open/high/low/close/volume, or None.
+        :rtype: dict | None
+        """
+        if self.country != "india" or not self.is_valid_source("nse"):
+            raise ValueError("End-of-day snapshots are only available for Indian stocks from NSE.")
+        day = _to_date(day) if day is not None else self.calendar.last_completed_session()
+        return get_nse_bhavcopy(day, deadline=self._deadline(timeout))
+
+    def get_market_snapshot(self, exchange: Optional[str] = None, timeout: Union[float, Deadline, None] = None) -> Optional[ListingTable]:
+        """
+        Last price, percent change, market cap and its tier for every US-listed stock in one request
+        (NASDAQ stock screener; USA only). Cached for `snapshot_ttl` seconds.
+        :param exchange: 'nasdaq', 'nyse' or 'amex' (defaults to the provider's exchange, else all of them)
+        :return: Returns a `ListingTable` mapping each symbol to a record with name/sector/industry/price/
+                 change_percent/market_cap/volume/market_cap_type, or None if not available.
+        :rtype: ListingTable | None
+        """
+        if self.country != "usa":
+            raise ValueError("Market snapshots are only available for USA stocks from the NASDAQ screener.")
+        exchange = (exchange or self.exchange or "").lower() or None
+        table = self.snapshot_cache.get(exchange)
+        if table is not None:
+            return table
+        table = get_nasdaq_screener(exchange, deadline=self._deadline(timeout), http_cache=self.http_cache)
+        if table is not None and self.snapshot_ttl > 0:
+            self.snapshot_cache.set(exchange, table, self.snapshot_ttl)
+        return table
+
+    def _historical_sources(self, deadline: Optional[Deadline] = None):
+        """Yield (name, fetch) pairs in fallback order; fetch(symbol, start, end) takes inclusive dates.
+
+        Errors propagate, so windowed fetches can tell a failed window (retried) from one without data.
+        """
+        for backend in self.source_chains["historical_prices"]:
+            yield backend.name, lambda symbol, start, end, backend=backend: backend.historical_prices(self, symbol, start, end, deadline)
+
+    def _get_historical_price_from_sources(self, symbol: str, start: Union[str, datetime], end: Union[str, datetime], deadline: Optional[Deadline] = None) -> Tuple[Optional[list], bool]:
+        """Walk the source chain, asking each later source only for the days still missing.
+
+        Returns (records, complete); complete is False when a failed request left days
+        that no later source filled.
+        """
+        deadline = deadline or Deadline()
+        start_d = _to_date(start)
+        end_d = _to_date(end)
+        records = None
+        empty_result = None
+        failed = False
+        missing = [(start_d, end_d)]
+        for name, fetch in self._historical_sources(deadline):
+            if deadline.expired():
+                break
+            # Once some source had data, a gap the next source answers with an empty list (before a
+            # listing, or an unlisted closure) is not passed further down the chain
+            filling = bool(records)
+            unfilled = []
+            for gap_start, gap_end in missing:
+                if deadline.expired():
+                    break
+                window_days = self.history_windows.get(name)
+                try:
+                    if window_days:
+                        val = fetch_windowed(fetch, symbol, gap_start, gap_end, window_days, self.max_workers, deadline=deadline)
+                    else:
+                        val = fetch(symbol, gap_start, gap_end)
+                except IncompleteHistory as e:
+                    logger.error(f"Source {name} failed in historical_prices for {symbol}: {str(e)}")
+                    failed = True
+                    val = e.records
+                except Exception as e:
+                    logger.error(f"Source {name} failed in historical_prices for {symbol}: {str(e)}")
+                    failed = True
+                    val = None
+                if not val:
+                    # Only a definitive empty answer marks the gap; None (no answer) leaves it to the next source
                     if val is not None:
-                        return val
-            
-            # NYSE historical provider (USA)
-            if (src == "nyse" or src == "auto") and self.is_valid_source("nyse"):
-                val = get_nyse_historical_prices(symbol, start, end, self.country)
-                if val is not None:
-                    return val
-        return None
+                        if filling:
+                            unfilled.append((gap_start, gap_end))
+                        empty_result = val
+                    continue
+                records = _merge_records(records, val)
+            if records:
+                missing = [gap for gap in _missing_ranges(records, start_d, end_d, self.calendar)
+                           if not any(lo <= gap[0] and gap[1] <= hi for lo, hi in unfilled)]
+                if not missing:
+                    break
+        complete = not (failed and missing)
+        if records:
+            return records, complete
+        return empty_result, complete
 
-    def get_stock_info(self, symbol: str) -> Optional[dict]:
-        for src in self.source:
-            if src == "yfinance" or src == "auto":
-                val = get_yfinance_stock_info(symbol, self.country, self.exchange)
-                if val is not None:
-                    return val
+    def get_intraday_bars(self, symbol: str, interval: str, start: Optional[Union[str, datetime]] = None, end: Optional[Union[str, datetime]] = None, timeout: Union[float, Deadline, None] = None) -> Optional[list]:
+        """
+        Get intraday bars for the given symbol.
+        :param symbol: Symbol to fetch bars for
+        :param interval: Bar size, one of '1m', '2m', '5m', '15m', '30m', '60m', '1h', '90m'
+        :param start: Start of the range (defaults to 24 hours before `end`)
+        :param end: End of the range (defaults to now)
+        :param timeout: End-to-end budget in seconds (or a `Deadline`); cached bars are returned when it runs out
+        :return: Returns a list of records with datetime/open/high/low/close/volume, or None if not available.
+        :rtype: list | None
+
+        Bars are cached per symbol and interval. When the cache already covers `start`,
+        only bars from the last cached bar onwards are fetched and appended.
+        """
+        if interval not in INTRADAY_INTERVALS:
+            raise ValueError(f"Unknown interval: {interval}. Valid options are: {list(INTRADAY_INTERVALS)}")
+        end_dt = (parse(end) if isinstance(end, str) else end) if end is not None else datetime.now().astimezone()
+        start_dt = (parse(start) if isinstance(start, str) else start) if start is not None else end_dt - timedelta(days=1)
+
+        first_cached = self.intraday_cache.first_timestamp(symbol, interval)
+        last_cached = self.intraday_cache.last_timestamp(symbol, interval)
+        if first_cached is not None and first_cached <= to_epoch(start_dt):
+            if last_cached >= to_epoch(end_dt):
+                # Requested range already cached
+                return self.intraday_cache.get(symbol, interval, start_dt, end_dt) or None
+            # Refetch from the last cached bar, which may still have been forming
+            fetch_start = datetime.fromtimestamp(last_cached).astimezone()
+        else:
+            fetch_start = start_dt
+
+        deadline = self._deadline(timeout)
+        for backend in self.source_chains["intraday_bars"]:
+            if deadline.expired():
+                break
+            val = self._call_backend(backend, "intraday_bars", symbol, interval, fetch_start, end_dt, deadline)
+            if val is not None:
+                self.intraday_cache.merge(symbol, interval, val)
+                break
+        return self.intraday_cache.get(symbol, interval, start_dt, end_dt) or None
+
+    def get_stock_info(self, symbol: str, timeout: Union[float, Deadline, None] = None) -> Optional[dict]:
+        key = symbol.upper()
+        self._touch("info", key)
+        val = self.info_cache.get(key)
+        if val is not None:
+            return dict(val)
+        return self._fetch_stock_info(symbol, self._deadline(timeout))
+
+    def _fetch_stock_info(self, symbol: str, deadline: Optional[Deadline] = None) -> Optional[dict]:
+        deadline = deadline or Deadline()
+        for backend in self.source_chains["stock_info"]:
+            if deadline.expired():
+                break
+            val = self._call_backend(backend, "stock_info", symbol, deadline)
+            if val is not None:
+                if self.info_ttl > 0:
+                    self.info_cache.set(symbol.upper(), dict(val), self.info_ttl)
+                return val
         return None
 
+    def warm(self, symbols: List[str], live: bool = True, info: bool = True, history_days: Optional[int] = 365,
+             timeout: Union[float, Deadline, None] = None):
+        """
+        Pre-fetch live quotes, stock info and the last `history_days` of daily history for `symbols`
+        in parallel (up to `max_workers` at a time), so the first user request hits warm caches.
+        Warmed entries count as recently used, so a running refresher keeps them fresh.
+        """
+        deadline = self._deadline(timeout)
+        end_d = date.today()
+        start_d = end_d - timedelta(days=history_days) if history_days else None
+        tasks = []
+        now = time.time()
+        for symbol in dict.fromkeys(symbols):
+            key = symbol.upper()
+            if live:
+                self._touch("live", key, now)
+                tasks.append(lambda s=symbol: self._fetch_live_price(s, deadline))
+            if info:
+                self._touch("info", key, now)
+                tasks.append(lambda s=symbol: self._fetch_stock_info(s, deadline))
+            if start_d is not None:
+                self._touch("history", key, now)
+                tasks.append(lambda s=symbol: self._fetch_historical_price(s, start_d, end_d, deadline))
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            list(executor.map(lambda task: task(), tasks))
+
+    def start_refresher(self, **options):
+        """
+        Start a background thread that re-fetches recently used live quotes, stock info and history
+        shortly before their cache entries expire. `options` are passed to `BackgroundRefresher`.
+        """
+        if self.refresher is None or not self.refresher.running:
+            self.refresher = BackgroundRefresher(self, **options).start()
+        return self.refresher
+
+    def stop_refresher(self):
+        if self.refresher is not None:
+            self.refresher.stop()
+            self.refresher = None
+
+def _to_date(value: Union[str, date, datetime]) -> date:
+    if isinstance(value, str):
+        return parse(value).date()
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _merge_records(records: Optional[list], new_records: list) -> list:
+    """Merge daily records by date; dates already present keep their existing values."""
+    if not records:
+        return sorted(new_records, key=lambda r: r["date"])
+    seen = {r["date"] for r in records}
+    added = [r for r in new_records if r["date"] not in seen]
+    if not added:
+        return records
+    return sorted(records + added, key=lambda r: r["date"])
+
+
+def _missing_ranges(records: list, start: date, end: date, calendar: TradingCalendar) -> List[tuple]:
+    """Return (start, end) ranges of consecutive trading days absent from `records`.
+
+    Only sessions that have already closed are expected; today's bar may legitimately be missing.
+    In years whose holidays the calendar does not know, a lone missing weekday is most likely a
+    holiday, so only runs of at least `MIN_UNKNOWN_YEAR_GAP` trading days are reported there.
+    """
+    present = {r["date"][:10] for r in records if isinstance(r.get("date"), str)}
+    runs = []
+    run = []
+    for day in calendar.trading_days(start, min(end, calendar.last_completed_session())):
+        if day.isoformat() in present:
+            if run:
+                runs.append(run)
+                run = []
+            continue
+        run.append(day)
+    if run:
+        runs.append(run)
+    return [(run[0], run[-1]) for run in runs
+            if len(run) >= MIN_UNKNOWN_YEAR_GAP or all(calendar.knows_holidays(d.year) for d in run)]
+
 # Example usage:
 # provider = StockPriceProvider("USA")
 # price = provider.get_live_price("AAPL")
@@ -0,0 +1,224 @@
+"""
+Per-host request limits for jyapystock.
+Each upstream host gets a `HostLimiter` that bounds concurrent requests and the
+request rate. Limits adapt AIMD-style: a throttling signal (HTTP 429, or any other
+status the host throttles with such as NSE's and BSE's bare 403, a 403/503 carrying
+Retry-After, or a request that used its full timeout) halves them and pauses the host for a growing backoff, and every
+success raises them again step by step up to the configured maximum. Parallel
+workloads then settle at the highest rate a host tolerates instead of tripping
+its blocks.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+from urllib.parse import urlparse
+from jyapystock.deadline import Deadline, DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses that always signal throttling, unless a host configures its own `throttle_statuses`;
+# elsewhere 403 and 503 only count with a Retry-After header, since a plain 403 usually means a
+# rejected request (missing headers or cookies), not load
+THROTTLE_STATUSES = (429,)
+RETRY_AFTER_STATUSES = (403, 503)
+
+# Host each source talks to, so limits can be configured by source name
+SOURCE_HOSTS = {
+    "nasdaq": "api.nasdaq.com",
+    "nyse": "www.nyse.com",
+    "nse": "www.nseindia.com",
+    "bse": "api.bseindia.com",
+    "alphavantage": "www.alphavantage.co",
+}
+
+# Defaults per host: max concurrent requests, max requests per second (None: unlimited) and,
+# where they differ, the statuses that signal throttling. NSE and BSE answer load with a bare 403.
+DEFAULT_HOST_LIMITS = {
+    "api.nasdaq.com": {"max_concurrency": 4, "rate": 5.0},
+    "www.nyse.com": {"max_concurrency": 4, "rate": 5.0},
+    "www.nseindia.com": {"max_concurrency": 2, "rate": 3.0, "throttle_statuses": (403, 429)},
+    "api.bseindia.com": {"max_concurrency": 2, "rate": 3.0, "throttle_statuses": (403, 429)},
+    "www.alphavantage.co": {"max_concurrency": 1, "rate": 1.0},
+}
+
+_STATUS_IN_MESSAGE = re.compile(r"\b([1-5]\d\d):")
+
+
+def is_timeout_error(error: BaseException) -> bool:
+    """Whether `error` is a request timeout (not the caller's own `DeadlineExceeded`)."""
+    if isinstance(error, DeadlineExceeded):
+        return False
+    return isinstance(error, TimeoutError) or "Timeout" in type(error).__name__
+
+
+def is_throttle_error(error: BaseException, statuses=THROTTLE_STATUSES) -> bool:
+    """Whether an exception from a client library means the host is throttling us."""
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if is_timeout_error(error):
+        return True
+    response = getattr(error, "response", None)
+    if response is not None and throttled_response(response, statuses):
+        return True
+    # The NSE and BSE clients raise ConnectionError("<url> 429: Too Many Requests") / ("403: Forbidden")
+    match = _STATUS_IN_MESSAGE.search(str(error)) if isinstance(error, ConnectionError) else None
+    return match is not None and int(match.group(1)) in statuses
+
+
+class HostLimiter:
+    """Adaptive concurrency and rate limit for one host.
+
+    `limit` (concurrent requests) and `current_rate` (requests per second) start at
+    their maximums, are halved on every throttling signal and grow again additively
+    on success (by one request per `limit` successes, and `rate_step` of the maximum
+    rate per success). Throttling also blocks new requests for `backoff` seconds,
+    doubling up to `max_backoff` while throttling continues. `throttle_statuses` are
+    the HTTP statuses that count as throttling for this host.
+    """
+
+    def __init__(self, host: str, max_concurrency: int = 4, rate: Optional[float] = None, min_rate: float = 0.2,
+                 rate_step: float = 0.05, backoff: float = 1.0, max_backoff: float = 60.0,
+                 throttle_statuses: Tuple[int, ...] = THROTTLE_STATUSES):
+        self.host = host
+        self.throttle_statuses = tuple(throttle_statuses)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.rate_step = rate_step
+        self.initial_backoff = backoff
+        self.max_backoff = max_backoff
+        self.limit = float(self.max_concurrency)
+        self.current_rate = rate
+        self.in_flight = 0
+        self._backoff = backoff
+        self._blocked_until = 0.0
+        self._next_slot = 0.0
+        self._cond = threading.Condition()
+
+    def _wait_time(self, now: float) -> float:
+        """Seconds until a request may start, 0 if it may start now (caller holds the lock)."""
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self.in_flight >= int(self.limit):
+            return -1.0  # wait for a running request to finish
+        if self.current_rate is not None and now < self._next_slot:
+            return self._next_slot - now
+        return 0.0
+
+    def acquire(self, deadline: Optional[Deadline] = None):
+        """Block until a request may start; raises DeadlineExceeded if `deadline` runs out first."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(now)
+                if wait == 0.0:
+                    break
+                remaining = deadline.remaining() if deadline is not None else None
+                if remaining is not None and (remaining <= 0 or (wait > 0 and wait > remaining)):
+                    raise DeadlineExceeded(f"deadline exceeded waiting for {self.host}")
+                timeout = wait if wait > 0 else None
+                if remaining is not None:
+                    timeout = min(timeout, remaining) if timeout is not None else remaining
+                self._cond.wait(timeout)
+            self.in_flight += 1
+            if self.current_rate is not None:
+                self._next_slot = max(self._next_slot, now) + 1.0 / self.current_rate
+
+    def release(self, throttled: bool = False):
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self._on_throttle()
+            else:
+                self._on_success()
+            self._cond.notify_all()
+
+    def _on_throttle(self):
+        self.limit = max(1.0, self.limit / 2)
+        if self.current_rate is not None:
+            self.current_rate = max(self.min_rate, self.current_rate / 2)
+        now = time.monotonic()
+        if self._blocked_until <= now:
+            self._blocked_until = now + self._backoff
+            logger.error(f"{self.host} is throttling requests; backing off {self._backoff:.1f}s "
+                         f"(concurrency {int(self.limit)}, rate {self.current_rate}).")
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+
+    def _on_success(self):
+        self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+        if self.current_rate is not None:
+            self.current_rate = min(self.max_rate, self.current_rate + self.rate_step * self.max_rate)
+        self._backoff = self.initial_backoff
+
+    def call(self, fn: Callable[[], T], deadline: Optional[Deadline] = None,
+             is_throttled: Optional[Callable[[T], bool]] = None, timeout: Optional[float] = None) -> T:
+        """Run `fn` under this limit; throttling is detected from its exception or `is_throttled(result)`.
+
+        `timeout` is the full per-request timeout `fn` caps by `deadline`'s remaining budget. When
+        the budget is the tighter limit, a timeout is the caller running out of time rather than
+        the host being slow, so it does not count as throttling.
+        """
+        self.acquire(deadline)
+        remaining = deadline.remaining() if deadline is not None else None
+        budget_limited = timeout is not None and remaining is not None and remaining < timeout
+        throttled = False
+        try:
+            result = fn()
+            throttled = bool(is_throttled and is_throttled(result))
+            return result
+        except BaseException as e:
+            throttled = is_throttle_error(e, self.throttle_statuses) and not (budget_limited and is_timeout_error(e))
+            raise
+        finally:
+            self.release(throttled)
+
+    def throttled_response(self, response) -> bool:
+        """Whether `response` means this host is throttling us."""
+        return throttled_response(response, self.throttle_statuses)
+
+
+_limiters: Dict[str, HostLimiter] = {}
+_limits: Dict[str, dict] = {}
+_lock = threading.Lock()
+
+
+def set_host_limits(source_or_host: str, **limits):
+    """Configure the limiter for a source name ('nasdaq', 'nse', ...) or host.
+
+    Accepts `HostLimiter` keyword arguments, e.g. `max_concurrency=8, rate=10.0`;
+    `rate=None` removes the rate limit and `throttle_statuses=(403, 429)` makes a bare
+    403 back off too. Replaces any existing limiter for the host.
+    """
+    host = SOURCE_HOSTS.get(source_or_host.lower(), source_or_host.lower())
+    with _lock:
+        _limits[host] = {**DEFAULT_HOST_LIMITS.get(host, {}), **_limits.get(host, {}), **limits}
+        _limiters.pop(host, None)
+
+
+def get_limiter(host: str) -> HostLimiter:
+    """Return the shared limiter for `host` (a host name, source name or URL)."""
+    if "/" in host:
+        host = urlparse(host).netloc
+    host = SOURCE_HOSTS.get(host.lower(), host.lower())
+    limiter = _limiters.get(host)
+    if limiter is None:
+        with _lock:
+            limiter = _limiters.get(host)
+            if limiter is None:
+                limits = _limits.get(host, DEFAULT_HOST_LIMITS.get(host, {}))
+                limiter = _limiters[host] = HostLimiter(host, **limits)
+    return limiter
+
+
+def throttled_response(response, statuses=THROTTLE_STATUSES) -> bool:
+    """Whether `response` has one of `statuses`, or a 403/503 with Retry-After."""
+    status = getattr(response, "status_code", None)
+    if status in statuses:
+        return True
+    headers = getattr(response, "headers", None) or {}
+    return status in RETRY_AFTER_STATUSES and "Retry-After" in headers
@@ -0,0 +1,281 @@
+"""
+Trading calendars for the exchanges supported by jyapystock (NSE, BSE, NYSE, NASDAQ).
+Knows weekends, exchange holidays, early closes and session times so fetchers and
+caches can skip non-trading days and tell a data gap from a holiday.
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+from dateutil.easter import easter
+from dateutil.parser import parse
+from dateutil.relativedelta import relativedelta, MO, TH
+from dateutil.tz import gettz
+
+logger = logging.getLogger(__name__)
+
+# Session states returned by TradingCalendar.session_state
+PRE_MARKET = "pre_market"
+OPEN = "open"
+POST_MARKET = "post_market"
+CLOSED = "closed"
+
+# NSE and BSE share the trading holiday list published in the exchanges' annual
+# circulars. Indian holidays follow lunar calendars and cannot be derived from
+# rules, so this table has to be extended every year.
+_INDIA_HOLIDAYS = {
+    2024: [
+        "2024-01-22", "2024-01-26", "2024-03-08", "2024-03-25", "2024-03-29", "2024-04-11",
+        "2024-04-17", "2024-05-01", "2024-05-20", "2024-06-17", "2024-07-17", "2024-08-15",
+        "2024-10-02", "2024-11-01", "2024-11-15", "2024-11-20", "2024-12-25",
+    ],
+    2025: [
+        "2025-02-26", "2025-03-14", "2025-03-31", "2025-04-10", "2025-04-14", "2025-04-18",
+        "2025-05-01", "2025-08-15", "2025-08-27", "2025-10-02", "2025-10-21", "2025-10-22",
+        "2025-11-05", "2025-12-25",
+    ],
+    2026: [
+        "2026-01-15", "2026-01-26", "2026-03-03", "2026-03-26", "2026-03-31", "2026-04-03",
+        "2026-04-14", "2026-05-01", "2026-05-28", "2026-06-26", "2026-09-14", "2026-10-02",
+        "2026-10-20", "2026-11-10", "2026-11-24", "2026-12-25",
+    ],
+}
+
+# Unscheduled US market closures that do not follow the regular holiday rules
+_US_SPECIAL_CLOSURES = {
+    "2012-10-29", "2012-10-30",  # Hurricane Sandy
+    "2018-12-05",  # National day of mourning, George H. W. Bush
+    "2025-01-09",  # National day of mourning, Jimmy Carter
+}
+
+
+def _observed(day: date) -> date:
+    """US observance rule: Saturday holidays move to Friday, Sunday holidays to Monday."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def _us_holidays(year: int) -> Set[date]:
+    """NYSE/NASDAQ full-day holidays for `year`, derived from the exchange rules."""
+    holidays = set()
+    new_year = date(year, 1, 1)
+    # A Saturday New Year's Day is not observed on the preceding Friday
+    if new_year.weekday() != 5:
+        holidays.add(_observed(new_year))
+    holidays.add(date(year, 1, 1) + relativedelta(weekday=MO(+3)))  # Martin Luther King Jr. Day
+    holidays.add(date(year, 2, 1) + relativedelta(weekday=MO(+3)))  # Washington's Birthday
+    holidays.add(easter(year) - timedelta(days=2))  # Good Friday
+    holidays.add(date(year, 5, 31) + relativedelta(weekday=MO(-1)))  # Memorial Day
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    holidays.add(_observed(date(year, 7, 4)))  # Independence Day
+    holidays.add(date(year, 9, 1) + relativedelta(weekday=MO(+1)))  # Labor Day
+    holidays.add(date(year, 11, 1) + relativedelta(weekday=TH(+4)))  # Thanksgiving
+    holidays.add(_observed(date(year, 12, 25)))  # Christmas
+    holidays.update(d for d in (date.fromisoformat(s) for s in _US_SPECIAL_CLOSURES) if d.year == year)
+    return holidays
+
+
+def _us_early_closes(year: int) -> Set[date]:
+    """Days the US markets close at 13:00 ET: July 3, the day after Thanksgiving and Christmas Eve."""
+    holidays = _us_holidays(year)
+    candidates = [
+        date(year, 7, 3),
+        date(year, 11, 1) + relativedelta(weekday=TH(+4)) + timedelta(days=1),
+        date(year, 12, 24),
+    ]
+    return {d for d in candidates if d.weekday() < 5 and d not in holidays}
+
+
+def _india_holidays(year: int) -> Set[date]:
+    days = _INDIA_HOLIDAYS.get(year)
+    if days is None:
+        logger.warning(f"No NSE/BSE holiday list for {year}; only weekends are treated as non-trading days.")
+        return set()
+    return {date.fromisoformat(d) for d in days}
+
+
+def _to_date(value: Union[str, date, datetime]) -> date:
+    if isinstance(value, str):
+        return parse(value).date()
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class TradingCalendar:
+    """Trading days and session times for one exchange.
+
+    Times are exchange-local; `session_state` and `next_open` accept and return
+    timezone-aware datetimes (naive inputs are treated as exchange-local time).
+    """
+
+    def __init__(self, exchange: str, timezone: str, pre_open: time, open: time, close: time,
+                 post_close: time, holiday_rule, early_close_rule=None, early_close: Optional[time] = None,
+                 holiday_years: Optional[Iterable[int]] = None):
+        self.exchange = exchange
+        self.tz = gettz(timezone)
+        self.pre_open = pre_open
+        self.open = open
+        self.close = close
+        self.post_close = post_close
+        self.early_close = early_close
+        self._holiday_rule = holiday_rule
+        # Years the holiday rule has data for; None when it covers every year
+        self._holiday_years = holiday_years
+        self._early_close_rule = early_close_rule
+        self._holidays: Dict[int, Set[date]] = {}
+        self._early_closes: Dict[int, Set[date]] = {}
+        self._extra_holidays: Set[date] = set()
+
+    def holidays(self, year: int) -> Set[date]:
+        """Exchange holidays that fall in `year` (weekends excluded)."""
+        if year not in self._holidays:
+            self._holidays[year] = set(self._holiday_rule(year))
+        return self._holidays[year] | {d for d in self._extra_holidays if d.year == year}
+
+    def knows_holidays(self, year: int) -> bool:
+        """Whether the holidays of `year` are known, so a weekday without a bar is a real gap."""
+        return self._holiday_years is None or year in self._holiday_years
+
+    def add_holidays(self, days: Iterable[Union[str, date, datetime]]):
+        """Register additional closures, e.g. ones announced after this release."""
+        self._extra_holidays.update(_to_date(d) for d in days)
+
+    def is_trading_day(self, day: Union[str, date, datetime]) -> bool:
+        day = _to_date(day)
+        return day.weekday() < 5 and day not in self.holidays(day.year)
+
+    def trading_days(self, start: Union[str, date, datetime], end: Union[str, date, datetime]) -> List[date]:
+        """All trading days in [start, end]."""
+        curr = _to_date(start)
+        end = _to_date(end)
+        days = []
+        while curr <= end:
+            if self.is_trading_day(curr):
+                days.append(curr)
+            curr += timedelta(days=1)
+        return days
+
+    def next_trading_day(self, day: Union[str, date, datetime]) -> date:
+        """First trading day strictly after `day`."""
+        curr = _to_date(day) + timedelta(days=1)
+        while not self.is_trading_day(curr):
+            curr += timedelta(days=1)
+        return curr
+
+    def previous_trading_day(self, day: Union[str, date, datetime]) -> date:
+        """Last trading day strictly before `day`."""
+        curr = _to_date(day) - timedelta(days=1)
+        while not self.is_trading_day(curr):
+            curr -= timedelta(days=1)
+        return curr
+
+    def close_time(self, day: Union[str, date, datetime]) -> time:
+        """Regular close for `day`, taking early closes into account."""
+        day = _to_date(day)
+        if self._early_close_rule is not None:
+            if day.year not in self._early_closes:
+                self._early_closes[day.year] = set(self._early_close_rule(day.year))
+            if day in self._early_closes[day.year]:
+                return self.early_close
+        return self.close
+
+    def session(self, day: Union[str, date, datetime]) -> Optional[Tuple[datetime, datetime]]:
+        """(open, close) of the regular session on `day`, or None on non-trading days."""
+        day = _to_date(day)
+        if not self.is_trading_day(day):
+            return None
+        return (datetime.combine(day, self.open, tzinfo=self.tz),
+                datetime.combine(day, self.close_time(day), tzinfo=self.tz))
+
+    def _localize(self, now: Optional[datetime]) -> datetime:
+        if now is None:
+            return datetime.now(self.tz)
+        if now.tzinfo is None:
+            return now.replace(tzinfo=self.tz)
+        return now.astimezone(self.tz)
+
+    def session_state(self, now: Optional[datetime] = None) -> str:
+        """One of PRE_MARKET, OPEN, POST_MARKET or CLOSED at `now` (default: current time)."""
+        now = self._localize(now)
+        day = now.date()
+        if not self.is_trading_day(day):
+            return CLOSED
+        t = now.time()
+        close = self.close_time(day)
+        # Extended hours last as long after an early close as after a regular one
+        extended = datetime.combine(day, self.post_close) - datetime.combine(day, self.close)
+        post_close = (datetime.combine(day, close) + extended).time()
+        if self.pre_open <= t < self.open:
+            return PRE_MARKET
+        if self.open <= t < close:
+            return OPEN
+        if close <= t < post_close:
+            return POST_MARKET
+        return CLOSED
+
+    def next_open(self, now: Optional[datetime] = None) -> datetime:
+        """Start of the next regular session after `now` (today's if it has not opened yet)."""
+        now = self._localize(now)
+        day = now.date()
+        if self.is_trading_day(day) and now.time() < self.open:
+            return datetime.combine(day, self.open, tzinfo=self.tz)
+        return datetime.combine(self.next_trading_day(day), self.open, tzinfo=self.tz)
+
+    def next_pre_open(self, now: Optional[datetime] = None) -> datetime:
+        """Start of the next pre-market session after `now`, i.e. when prices can start moving again."""
+        now = self._localize(now)
+        day = now.date()
+        if self.is_trading_day(day) and now.time() < self.pre_open:
+            return datetime.combine(day, self.pre_open, tzinfo=self.tz)
+        return datetime.combine(self.next_trading_day(day), self.pre_open, tzinfo=self.tz)
+
+    def last_completed_session(self, now: Optional[datetime] = None) -> date:
+        """Most recent trading day whose regular session has already closed."""
+        now = self._localize(now)
+        day = now.date()
+        if self.is_trading_day(day) and now.time() >= self.close_time(day):
+            return day
+        return self.previous_trading_day(day)
+
+
+def _india_calendar(exchange: str) -> TradingCalendar:
+    return TradingCalendar(exchange, "Asia/Kolkata", pre_open=time(9, 0), open=time(9, 15),
+                           close=time(15, 30), post_close=time(16, 0), holiday_rule=_india_holidays,
+                           holiday_years=_INDIA_HOLIDAYS.keys())
+
+
+def _us_calendar(exchange: str) -> TradingCalendar:
+    return TradingCalendar(exchange, "America/New_York", pre_open=time(4, 0), open=time(9, 30),
+                           close=time(16, 0), post_close=time(20, 0), holiday_rule=_us_holidays,
+                           early_close_rule=_us_early_closes, early_close=time(13, 0))
+
+
+_CALENDAR_FACTORIES = {
+    "nse": _india_calendar,
+    "bse": _india_calendar,
+    "nyse": _us_calendar,
+    "nasdaq": _us_calendar,
+}
+
+# Exchange whose calendar is used when only a country is known
+DEFAULT_EXCHANGE_PER_COUNTRY = {
+    "india": "nse",
+    "usa": "nyse",
+}
+
+_calendars: Dict[str, TradingCalendar] = {}
+
+
+def get_calendar(exchange: str) -> TradingCalendar:
+    """Return the shared calendar for 'nse', 'bse', 'nyse' or 'nasdaq'."""
+    exchange = exchange.lower()
+    if exchange not in _CALENDAR_FACTORIES:
+        raise ValueError(f"Unknown exchange: {exchange}. Valid options are: {list(_CALENDAR_FACTORIES)}")
+    if exchange not in _calendars:
+        _calendars[exchange] = _CALENDAR_FACTORIES[exchange](exchange)
+    return _calendars[exchange]
@@ -0,0 +1,102 @@
+"""
+Windowed historical fetching for jyapystock.
+Long date ranges are split into fixed-size windows that are fetched concurrently
+with bounded parallelism; windows whose request failed are retried on their own
+and the results are merged back in date order. Windows that still fail raise
+`IncompleteHistory`, so callers can tell a partial result from a complete one.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Callable, List, Optional, Tuple
+from jyapystock.deadline import Deadline, is_expired
+
+logger = logging.getLogger(__name__)
+
+# Window size in days per source. Sources missing here are fetched in one request.
+DEFAULT_WINDOW_DAYS = {
+    "nasdaq": 365,
+    "nyse": 365,
+    "nse": 365,
+    "bse": 31,
+}
+
+
+class IncompleteHistory(Exception):
+    """Some windows still failed after their retries; `records` holds what the other windows returned."""
+
+    def __init__(self, message: str, records: Optional[list] = None):
+        super().__init__(message)
+        self.records = records
+
+
+def split_range(start: date, end: date, window_days: int) -> List[Tuple[date, date]]:
+    """Split [start, end] into consecutive inclusive windows of at most `window_days` days."""
+    windows = []
+    curr = start
+    while curr <= end:
+        window_end = min(curr + timedelta(days=window_days - 1), end)
+        windows.append((curr, window_end))
+        curr = window_end + timedelta(days=1)
+    return windows
+
+
+def fetch_windowed(fetch: Callable[[str, date, date], Optional[list]], symbol: str, start: date, end: date,
+                   window_days: int, max_workers: int = 4, retries: int = 1, deadline: Optional[Deadline] = None) -> Optional[list]:
+    """Fetch [start, end] as windows of `window_days` using up to `max_workers` threads.
+
+    `fetch(symbol, window_start, window_end)` returns a list of daily records, or None
+    (or an empty list) when the source has no data for the window, e.g. before a listing.
+    `fetch` raises when the request itself failed (e.g. throttled); only those windows are
+    retried, up to `retries` more times, while a window without data is final. The merged,
+    date-ordered records are returned; None if no window returned data. Windows still
+    failing after the retries raise `IncompleteHistory` with the records of the others.
+    Windows not yet started when `deadline` expires are skipped.
+    """
+    windows = split_range(start, end, window_days)
+    if len(windows) <= 1:
+        return fetch(symbol, start, end)
+
+    def attempt(window) -> Tuple[Optional[list], bool]:
+        """(records, failed): failed is True only when the request raised."""
+        if is_expired(deadline):
+            return None, False
+        try:
+            return fetch(symbol, window[0], window[1]), False
+        except Exception as e:
+            logger.error(f"Error fetching {symbol} for {window[0]} to {window[1]}: {str(e)}")
+            return None, True
+
+    results: List[Optional[list]] = [None] * len(windows)
+    pending = list(range(len(windows)))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(windows)))) as executor:
+        for _ in range(retries + 1):
+            if not pending or is_expired(deadline):
+                break
+            failed = []
+            for i, (val, error) in zip(pending, executor.map(attempt, [windows[i] for i in pending])):
+                results[i] = val
+                if error:
+                    failed.append(i)
+            pending = failed
+
+    records = _merge_windows(results)
+    if pending:
+        raise IncompleteHistory(f"{len(pending)} of {len(windows)} windows failed for {symbol} after {retries} retries.", records)
+    return records
+
+
+def _merge_windows(results: List[Optional[list]]) -> Optional[list]:
+    """Merge per-window records in date order, dropping duplicate dates; None if no window had data."""
+    if not any(results):
+        return None
+    records = []
+    seen = set()
+    for window_records in results:
+        for record in window_records or []:
+            if record.get("date") not in seen:
+                seen.add(record.get("date"))
+                records.append(record)
+    records.sort(key=lambda r: r.get("date") or "")
+    return records
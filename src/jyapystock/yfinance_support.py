@@ -4,10 +4,23 @@ Provides helper functions to fetch live and historical prices using yfinance
 and to try country-specific symbol variants (e.g., .NS/.BO for India).
 """
 
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from typing import Optional, Union
 import yfinance as yf
+from yfinance.data import YfData
 from dateutil.parser import parse
+from dateutil.tz import gettz
+from .indicators import last_sma
+from .models import market_cap_type
+from .deadline import Deadline, is_expired, request_timeout
+from .sources import SourceBackend
+
+# Yahoo chart endpoint; its metadata carries the latest quote fields
+_CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{symbol}"
+
+# `Ticker.info` makes two Yahoo requests; with less budget left than this it is not started
+_MIN_INFO_BUDGET = 1.0
 
 
 
@@ -27,19 +40,30 @@ def get_symbol_variants(symbol: str, country: str, exchange:Optional[str] = None
             variants = [symbol.replace(".", "-"), symbol]
     return variants
 
-def get_yfinance_live_price(symbol: str, country: str, exchange:Optional[str] = None) -> Optional[dict]:
+def get_yfinance_live_price(symbol: str, country: str, exchange:Optional[str] = None, deadline: Optional[Deadline] = None) -> Optional[dict]:
     """Try live price with possible symbol variants for the given country.
 
     Returns a dict with 'timestamp', 'price', and 'change_percent' (% change from previous day close),
     or None if not available.
+    Uses the lightweight chart quote fields first and only falls back to a 2-day history download.
+    Variants are no longer tried once `deadline` has expired.
     """
     variants = get_symbol_variants(symbol, country, exchange)
 
     for s in variants:
+        if is_expired(deadline):
+            return None
+        quote = _fetch_quote_meta(s, timeout=request_timeout(deadline, 10))
+        if quote is not None:
+            return quote
+
+    for s in variants:
+        if is_expired(deadline):
+            return None
         try:
             ticker = yf.Ticker(s)
             # Get last 2 days of data to compute % change
-            data = ticker.history(period="2d")
+            data = ticker.history(period="2d", timeout=request_timeout(deadline, 10))
             if not data.empty:
                 last_close = float(data["Close"].iloc[-1])
                 prev_close = float(data["Close"].iloc[-2]) if len(data) > 1 else last_close
@@ -55,7 +79,34 @@ def get_yfinance_live_price(symbol: str, country: str, exchange:Optional[str] =
     return None
 
 
-def get_yfinance_historical_prices(symbol: str, start: Union[str, datetime], end: Union[str, datetime], country: str, exchange:Optional[str] = None) -> Optional[list]:
+def _fetch_quote_meta(symbol: str, timeout: float = 10) -> Optional[dict]:
+    """Read last price and previous close from the chart metadata, without building a DataFrame."""
+    try:
+        response = YfData().get(url=_CHART_URL.format(symbol=symbol), params={"range": "1d", "interval": "1d"}, timeout=timeout)
+        meta = response.json()["chart"]["result"][0]["meta"]
+        price = meta.get("regularMarketPrice")
+        prev_close = meta.get("chartPreviousClose") or meta.get("previousClose")
+        if price is None or prev_close is None:
+            return None
+        price = float(price)
+        prev_close = float(prev_close)
+        change_percent = ((price - prev_close) / prev_close * 100) if prev_close != 0 else 0.0
+        market_time = meta.get("regularMarketTime")
+        if market_time:
+            tz = gettz(meta.get("exchangeTimezoneName") or "UTC")
+            timestamp = datetime.fromtimestamp(int(market_time), tz=tz).isoformat()
+        else:
+            timestamp = ""
+        return {
+            "timestamp": timestamp,
+            "price": price,
+            "change_percent": round(change_percent, 2)
+        }
+    except Exception:
+        return None
+
+
+def get_yfinance_historical_prices(symbol: str, start: Union[str, datetime], end: Union[str, datetime], country: str, exchange:Optional[str] = None, deadline: Optional[Deadline] = None) -> Optional[list]:
     """Try historical price retrieval with symbol variants.
 
     Returns a list of records with Open/High/Low/Close/Volume or None if not found.
@@ -72,9 +123,11 @@ def get_yfinance_historical_prices(symbol: str, start: Union[str, datetime], end
     except Exception:
         end_dt = end
     for s in variants:
+        if is_expired(deadline):
+            return None
         try:
             ticker = yf.Ticker(s)
-            data = ticker.history(start=start_dt, end=end_dt)
+            data = ticker.history(start=start_dt, end=end_dt, timeout=request_timeout(deadline, 10))
             if not data.empty:
                 # Ensure dates are included in the records
                 df = data.reset_index()
@@ -87,22 +140,63 @@ def get_yfinance_historical_prices(symbol: str, start: Union[str, datetime], end
             continue
     return None
 
+
+def get_yfinance_intraday_bars(symbol: str, interval: str, start: Union[str, datetime], end: Union[str, datetime], country: str, exchange:Optional[str] = None, deadline: Optional[Deadline] = None) -> Optional[list]:
+    """Try intraday bar retrieval (e.g. interval '1m', '5m', '60m') with symbol variants.
+
+    Returns a list of records with datetime/open/high/low/close/volume or None if not found.
+    """
+    variants = get_symbol_variants(symbol, country, exchange)
+    start_dt = parse(start) if isinstance(start, str) else start
+    end_dt = parse(end) if isinstance(end, str) else end
+    for s in variants:
+        if is_expired(deadline):
+            return None
+        try:
+            ticker = yf.Ticker(s)
+            data = ticker.history(start=start_dt, end=end_dt, interval=interval, timeout=request_timeout(deadline, 10))
+            if not data.empty:
+                return [
+                    {
+                        "datetime": ts.isoformat(),
+                        "open": float(row["Open"]),
+                        "high": float(row["High"]),
+                        "low": float(row["Low"]),
+                        "close": float(row["Close"]),
+                        "volume": _volume(row["Volume"]),
+                    }
+                    for ts, row in zip(data.index, data[["Open", "High", "Low", "Close", "Volume"]].to_dict("records"))
+                ]
+        except Exception:
+            continue
+    return None
+
+def _volume(value) -> Optional[int]:
+    """Bar volume as int; None when Yahoo has no volume for the bar (NaN), as for NSE bars."""
+    if value is None or value != value:
+        return None
+    return int(value)
+
 def _get_value(info: dict, key: str) -> Optional[object]:
     return info.get(key)
 
-def get_yfinance_stock_info(symbol: str, country: str, exchange:Optional[str] = None) -> Optional[dict]:
+def get_yfinance_stock_info(symbol: str, country: str, exchange:Optional[str] = None, deadline: Optional[Deadline] = None) -> Optional[dict]:
     variants = get_symbol_variants(symbol, country, exchange)
     for s in variants:
-        info = _fetch_stock_info(s)
+        if is_expired(deadline):
+            return None
+        info = _fetch_stock_info(s, deadline)
         if info is not None:
             return info
     return None
 
-def _fetch_stock_info(symbol: str) -> Optional[dict]:
+def _fetch_stock_info(symbol: str, deadline: Optional[Deadline] = None) -> Optional[dict]:
     try:
         stock = yf.Ticker(symbol)
-        info = stock.info or {}
-        history = stock.history(period="1y")
+        info = _ticker_info(stock, deadline)
+        if info is None:
+            return None
+        history = None if is_expired(deadline) else stock.history(period="1y", timeout=request_timeout(deadline, 10))
 
         market_cap = _get_value(info, "marketCap")
         ma_20 = _moving_average(history, 20)
@@ -122,7 +216,7 @@ def _fetch_stock_info(symbol: str) -> Optional[dict]:
             "trailing_pe": _get_value(info, "trailingPE"),
             "forward_pe": _get_value(info, "forwardPE"),
             "market_cap": market_cap,
-            "market_cap_type": _market_cap_type(market_cap),
+            "market_cap_type": market_cap_type(market_cap),
             "dividend_yield": _get_value(info, "dividendYield"),
             "moving_average_20": ma_20,
             "moving_average_50": ma_50,
@@ -132,18 +226,31 @@ def _fetch_stock_info(symbol: str) -> Optional[dict]:
         print(f"Exception {ex}. Failed to fetch data for symbol: {symbol}")
         return None
 
-def _market_cap_type(market_cap: Optional[object]) -> str:
-    if not isinstance(market_cap, (int, float)):
-        return "N/A"
+def _ticker_info(stock, deadline: Optional[Deadline] = None) -> Optional[dict]:
+    """`stock.info` within `deadline`; None when the budget is nearly spent or runs out first.
+
+    yfinance takes no timeout for `.info`, so under a deadline it is read in a daemon
+    thread that is abandoned once the budget is spent.
+    """
+    remaining = deadline.remaining() if deadline is not None else None
+    if remaining is None:
+        return stock.info or {}
+    if remaining < _MIN_INFO_BUDGET:
+        return None
+    result = {}
 
-    if market_cap < 2_000_000_000:
-        return "small_cap"
-    if market_cap < 10_000_000_000:
-        return "mid_cap"
-    if market_cap < 200_000_000_000:
-        return "large_cap"
-    return "mega_cap"
+    def fetch():
+        try:
+            result["info"] = stock.info or {}
+        except Exception as e:
+            result["error"] = e
 
+    thread = threading.Thread(target=fetch, name="jyapystock-yfinance-info", daemon=True)
+    thread.start()
+    thread.join(remaining)
+    if "error" in result:
+        raise result["error"]
+    return result.get("info")
 
 def _moving_average(history, window: int) -> Optional[float]:
     if history is None or history.empty or "Close" not in history:
@@ -151,4 +258,26 @@ def _moving_average(history, window: int) -> Optional[float]:
     series = history["Close"].dropna()
     if series.empty:
         return None
-    return float(series.rolling(window=window).mean().iloc[-1])
+    # Only the latest value is needed: average the last window instead of a full rolling mean
+    return last_sma(series.to_numpy(), window)
+
+
+class YFinanceBackend(SourceBackend):
+    """Yahoo Finance through yfinance, trying country-specific symbol variants."""
+
+    name = "yfinance"
+    countries = ("india", "usa")
+    exchanges = ("nse", "bse", "nasdaq", "nyse")
+
+    def live_price(self, provider, symbol, deadline):
+        return get_yfinance_live_price(symbol, provider.country, provider.exchange, deadline=deadline)
+
+    def historical_prices(self, provider, symbol, start, end, deadline):
+        # yfinance's `end` is exclusive
+        return get_yfinance_historical_prices(symbol, start, end + timedelta(days=1), provider.country, provider.exchange, deadline=deadline)
+
+    def intraday_bars(self, provider, symbol, interval, start, end, deadline):
+        return get_yfinance_intraday_bars(symbol, interval, start, end, provider.country, provider.exchange, deadline=deadline)
+
+    def stock_info(self, provider, symbol, deadline):
+        return get_yfinance_stock_info(symbol, provider.country, provider.exchange, deadline=deadline)
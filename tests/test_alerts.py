@@ -0,0 +1,81 @@
+import unittest
+from unittest import mock
+from jyapystock.alerts import AlertEngine
+from jyapystock.models import Quote
+from jyapystock.stock_price_provider import StockPriceProvider
+
+
+def quote(price, change_percent=0.0):
+    return {"timestamp": "t", "price": price, "change_percent": change_percent}
+
+
+class TestAlertEngine(unittest.TestCase):
+    def test_only_crossed_thresholds_fire(self):
+        engine = AlertEngine()
+        alerts = {t: engine.add("RELIANCE", "above", t) for t in (2900, 3000, 3100, 3200)}
+        low = engine.add("reliance", "below", 2800)
+        self.assertEqual(engine.on_quote("RELIANCE", quote(2850)), [])
+        fired = engine.on_quote("RELIANCE", quote(3100))
+        self.assertEqual({a.threshold for a in fired}, {2900, 3000, 3100})
+        self.assertEqual(engine.on_quote("RELIANCE", quote(3150)), [])
+        self.assertEqual(engine.on_quote("RELIANCE", quote(2700)), [low])
+        self.assertEqual(engine.alerts("RELIANCE"), [alerts[3200]])
+
+    def test_repeating_alert_fires_on_each_crossing(self):
+        engine = AlertEngine()
+        alert = engine.add("AAPL", "above", 200, once=False)
+        results = [engine.on_quote("AAPL", quote(p)) for p in (190, 201, 205, 195, 200)]
+        self.assertEqual(results, [[], [alert], [], [], [alert]])
+
+    def test_percent_move_and_callbacks(self):
+        seen = []
+        engine = AlertEngine(callback=lambda alert, q: seen.append((alert.direction, q["change_percent"])))
+        engine.add_move("AAPL", 3)
+        engine.on_quote("AAPL", Quote("t", 100.0, 1.5))
+        engine.on_quote("AAPL", Quote("t", 95.0, -3.4))
+        self.assertEqual(seen, [("below", -3.4)])
+        self.assertEqual(len(engine), 1)
+
+    def test_alert_added_when_condition_holds_fires_next_quote(self):
+        engine = AlertEngine()
+        engine.on_quote("TCS", quote(3500))
+        alert = engine.add("TCS", "above", 3000)
+        self.assertEqual(engine.on_quote("TCS", quote(3510)), [alert])
+
+    def test_pending_alert_waits_for_a_quote_with_its_field(self):
+        engine = AlertEngine()
+        engine.on_quote("TCS", quote(3500, change_percent=4.0))
+        alert = engine.add_move("TCS", 3)[0]
+        self.assertEqual(engine.on_quote("TCS", {"timestamp": "t", "price": 3510, "change_percent": None}), [])
+        self.assertEqual(engine.on_quote("TCS", quote(3520, change_percent=4.5)), [alert])
+
+    def test_remove(self):
+        engine = AlertEngine()
+        alert = engine.add("TCS", "below", 3000)
+        self.assertTrue(engine.remove(alert))
+        self.assertFalse(engine.remove(alert.id))
+        self.assertEqual(engine.on_quote("TCS", quote(2000)), [])
+
+
+class TestProviderQuoteListener(unittest.TestCase):
+    def test_attached_engine_sees_fetched_quotes(self):
+        provider = StockPriceProvider(country="USA", source="yfinance", cache_live_quotes=False)
+        fired = []
+        engine = AlertEngine(callback=lambda alert, q: fired.append((alert, q["price"])))
+        alert = engine.add("AAPL", "above", 250)
+        engine.attach(provider)
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_live_price", return_value=quote(273.81)):
+            provider.get_live_price("AAPL")
+        self.assertEqual(fired, [(alert, 273.81)])
+        engine.detach(provider)
+        self.assertEqual(provider.quote_listeners, [])
+
+    def test_listener_errors_do_not_break_fetches(self):
+        provider = StockPriceProvider(country="USA", source="yfinance", cache_live_quotes=False)
+        provider.add_quote_listener(mock.Mock(side_effect=RuntimeError("boom")))
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_live_price", return_value=quote(1.0)):
+            self.assertEqual(provider.get_live_price("AAPL")["price"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from jyapystock.alpha_vantage_support import get_alpha_vantage_live_prices
+from jyapystock.stock_price_provider import StockPriceProvider
+
+
+def bulk_response(url, **kwargs):
+    symbols = url.split("symbol=")[1].split("&")[0].split(",")
+    rows = [{"symbol": s, "timestamp": "2025-12-24 16:00:00.000", "close": "100.5", "change_percent": "1.234"}
+            for s in symbols if s != "UNKNOWN"]
+    return SimpleNamespace(status_code=200, json=lambda: {"endpoint": "Realtime Bulk Quotes", "data": rows})
+
+
+class TestAlphaVantageBulkQuotes(unittest.TestCase):
+    def test_symbols_are_chunked_into_maximal_batches(self):
+        symbols = [f"S{i}" for i in range(250)]
+        with mock.patch("jyapystock.alpha_vantage_support.http_get", side_effect=bulk_response) as get:
+            quotes = get_alpha_vantage_live_prices(symbols, "key")
+        self.assertEqual(get.call_count, 3)
+        self.assertEqual(len(quotes), 250)
+        self.assertEqual(quotes["S7"], {"timestamp": "2025-12-24 16:00:00.000", "price": 100.5, "change_percent": 1.23})
+
+    def test_no_data_stops_batching(self):
+        premium = SimpleNamespace(status_code=200, json=lambda: {"Information": "premium endpoint"})
+        with mock.patch("jyapystock.alpha_vantage_support.http_get", return_value=premium) as get:
+            self.assertEqual(get_alpha_vantage_live_prices([f"S{i}" for i in range(150)], "key"), {})
+        get.assert_called_once()
+
+    def test_provider_falls_back_per_symbol(self):
+        provider = StockPriceProvider(country="USA", source=["alphavantage"], alpha_vantage_api_key="key",
+                                      cache_live_quotes=False)
+        single = {"timestamp": "2025-12-24", "price": 1.0, "change_percent": 0.0}
+        with mock.patch("jyapystock.alpha_vantage_support.http_get", side_effect=bulk_response) as get, \
+             mock.patch("jyapystock.alpha_vantage_support.get_alpha_vantage_live_price", return_value=single) as one:
+            quotes = provider.get_live_prices(["aapl", "MSFT", "UNKNOWN"])
+        get.assert_called_once()
+        one.assert_called_once_with("UNKNOWN", "key", deadline=mock.ANY)
+        self.assertEqual(quotes["aapl"]["price"], 100.5)
+        self.assertEqual(quotes["UNKNOWN"], single)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import time
+import unittest
+from unittest import mock
+from jyapystock import StockPriceProvider
+from jyapystock.deadline import Deadline, request_timeout
+
+
+class TestDeadline(unittest.TestCase):
+    def test_timeout_is_capped_by_remaining_budget(self):
+        self.assertEqual(request_timeout(None, 10), 10)
+        self.assertEqual(Deadline().timeout(10), 10)
+        self.assertLessEqual(Deadline(2).timeout(10), 2)
+        self.assertEqual(Deadline(30).timeout(10), 10)
+
+    def test_expired(self):
+        self.assertFalse(Deadline().expired())
+        self.assertTrue(Deadline(0).expired())
+        deadline = Deadline(5)
+        self.assertIs(Deadline.coerce(deadline), deadline)
+
+    def test_chain_stops_when_budget_is_spent(self):
+        provider = StockPriceProvider(country="USA", cache_live_quotes=False)
+
+        def slow_yfinance(*args, deadline=None, **kwargs):
+            time.sleep(0.05)
+            return None
+
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_live_price", side_effect=slow_yfinance), \
+             mock.patch("jyapystock.nasdaq_support.get_nasdaq_live_price") as nasdaq, \
+             mock.patch("jyapystock.nyse_support.get_nyse_live_price") as nyse:
+            self.assertIsNone(provider.get_live_price("UNKNOWN", timeout=0.01))
+        nasdaq.assert_not_called()
+        nyse.assert_not_called()
+
+    def test_remaining_budget_is_passed_to_sources(self):
+        provider = StockPriceProvider(country="USA", source="nasdaq", cache_live_quotes=False, timeout=3)
+        with mock.patch("jyapystock.nasdaq_support.get_nasdaq_live_price", return_value=None) as nasdaq:
+            provider.get_live_price("AAPL")
+        deadline = nasdaq.call_args.kwargs["deadline"]
+        self.assertLessEqual(deadline.remaining(), 3)
+
+    def test_stock_info_is_bounded_by_the_budget(self):
+        from jyapystock import yfinance_support
+
+        class Ticker:
+            calls = 0
+
+            def __init__(self, delay):
+                self.delay = delay
+
+            @property
+            def info(self):
+                Ticker.calls += 1
+                time.sleep(self.delay)
+                return {"symbol": "AAPL"}
+
+        started = time.monotonic()
+        self.assertIsNone(yfinance_support._ticker_info(Ticker(3), Deadline(1.1)))
+        self.assertLess(time.monotonic() - started, 2)
+        # Not even started with the budget nearly spent
+        self.assertIsNone(yfinance_support._ticker_info(Ticker(0), Deadline(0.5)))
+        self.assertEqual(Ticker.calls, 1)
+        self.assertEqual(yfinance_support._ticker_info(Ticker(0), Deadline(5)), {"symbol": "AAPL"})
+        self.assertEqual(yfinance_support._ticker_info(Ticker(0), None), {"symbol": "AAPL"})
+
+if __name__ == "__main__":
+    unittest.main()
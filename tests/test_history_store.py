@@ -0,0 +1,34 @@
+import tempfile
+import unittest
+import numpy as np
+from jyapystock.history_store import HistoryStore
+
+
+class TestHistoryStore(unittest.TestCase):
+    def test_write_merge_and_slice(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = HistoryStore(tmp)
+            store.write("AAPL", [
+                {"date": "2023-01-03", "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 100},
+                {"date": "2023-01-05", "open": 3.0, "high": 4.0, "low": 2.5, "close": 3.5, "volume": 300},
+            ])
+            store.write("AAPL", [
+                {"date": "2023-01-04", "open": 2.0, "high": 3.0, "low": 1.5, "close": 2.5, "volume": None},
+            ])
+            view = store.open("AAPL")
+            self.assertEqual(len(view), 3)
+            self.assertIsInstance(view.close, np.memmap)
+            self.assertEqual(list(view.close), [1.5, 2.5, 3.5])
+
+            window = store.read("AAPL", "2023-01-04", "2023-01-10")
+            self.assertEqual([str(d) for d in window.dates], ["2023-01-04", "2023-01-05"])
+            records = window.to_records()
+            self.assertEqual(records[0]["date"], "2023-01-04")
+            self.assertIsNone(records[0]["volume"])
+            self.assertIs(type(records[1]["volume"]), int)
+            self.assertEqual(records[1]["volume"], 300)
+            self.assertIsNone(store.open("MSFT"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import unittest
+from unittest import mock
+import requests
+from jyapystock.deadline import Deadline
+from jyapystock.http_client import HTTPCache, get_http_cache, http_get
+from jyapystock.stock_price_provider import StockPriceProvider
+from jyapystock.throttle import set_host_limits, get_limiter
+
+
+def response(status, body=b"", headers=None):
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = body
+    resp.headers.update(headers or {})
+    resp.url = "https://api.nasdaq.com/api/quote/AAPL/info"
+    return resp
+
+
+class TestLimitedGet(unittest.TestCase):
+    def test_deadline_capped_timeout_does_not_back_off(self):
+        set_host_limits("nasdaq", max_concurrency=4, rate=5.0)
+        limiter = get_limiter("nasdaq")
+        with mock.patch("jyapystock.http_client.requests.get", side_effect=requests.exceptions.ReadTimeout()) as get:
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                http_get("https://api.nasdaq.com/api/quote/AAPL/info", timeout=10, deadline=Deadline(0.3))
+        self.assertLessEqual(get.call_args.kwargs["timeout"], 0.3)
+        self.assertEqual((limiter.limit, limiter.current_rate), (4, 5.0))
+
+
+class TestProviderHTTPCache(unittest.TestCase):
+    def test_cache_belongs_to_the_provider(self):
+        cached = StockPriceProvider(country="USA", source="nasdaq", http_cache=True)
+        plain = StockPriceProvider(country="USA", source="nasdaq")
+        self.assertIsInstance(cached.http_cache, HTTPCache)
+        self.assertIsNone(plain.http_cache)
+        self.assertIsNone(get_http_cache())
+        with mock.patch("jyapystock.nasdaq_support.http_get", return_value=response(404)) as get:
+            cached.get_live_price("AAPL")
+        self.assertIs(get.call_args.kwargs["cache"], cached.http_cache)
+
+
+class TestHTTPCache(unittest.TestCase):
+    def test_conditional_revalidation(self):
+        cache = HTTPCache()
+        url = "https://api.nasdaq.com/api/quote/AAPL/info"
+        with mock.patch("jyapystock.http_client.requests.get") as get:
+            get.return_value = response(200, b'{"data": {"price": 1}}', {"ETag": '"v1"'})
+            first = cache.get(url, params={"assetclass": "stocks"})
+            self.assertEqual(first.json(), {"data": {"price": 1}})
+
+            get.return_value = response(304, headers={"ETag": '"v1"'})
+            second = cache.get(url, params={"assetclass": "stocks"})
+            self.assertEqual(get.call_args.kwargs["headers"]["If-None-Match"], '"v1"')
+            # Served from the stored body; each caller gets its own parsed objects
+            self.assertEqual(second.json(), {"data": {"price": 1}})
+            second.json()["data"]["price"] = 2
+            self.assertEqual(first.json(), {"data": {"price": 1}})
+
+    def test_body_is_parsed_once_per_entry(self):
+        cache = HTTPCache()
+        url = "https://api.nasdaq.com/api/quote/AAPL/historical"
+        with mock.patch("jyapystock.http_client.requests.get") as get, \
+             mock.patch("jyapystock.http_client.json.loads", wraps=json.loads) as loads:
+            get.return_value = response(200, b'{"rows": [1, 2]}', {"ETag": '"v1"'})
+            self.assertEqual(cache.get(url).json(), {"rows": [1, 2]})
+            get.return_value = response(304, headers={"ETag": '"v1"'})
+            self.assertEqual(cache.get(url).json(), {"rows": [1, 2]})
+            self.assertEqual(loads.call_count, 1)
+            get.return_value = response(200, b'{"rows": [3]}', {"ETag": '"v2"'})
+            self.assertEqual(cache.get(url).json(), {"rows": [3]})
+            self.assertEqual(loads.call_count, 2)
+
+    def test_max_age_serves_without_request(self):
+        cache = HTTPCache()
+        url = "https://www.nyse.com/api/nyseservice/v1/quotes"
+        with mock.patch("jyapystock.http_client.requests.get") as get:
+            get.return_value = response(200, b'[{"last": 10}]', {"Cache-Control": "max-age=60"})
+            cache.get(url, params={"symbol": "BAC"})
+            self.assertEqual(cache.get(url, params={"symbol": "BAC"}).json(), [{"last": 10}])
+        get.assert_called_once()
+
+    def test_no_store_is_not_cached(self):
+        cache = HTTPCache()
+        url = "https://www.nyse.com/api/nyseservice/v1/quotes"
+        with mock.patch("jyapystock.http_client.requests.get") as get:
+            get.return_value = response(200, b'[]', {"Cache-Control": "no-store", "ETag": '"v1"'})
+            cache.get(url)
+            cache.get(url)
+        self.assertEqual(get.call_count, 2)
+        self.assertNotIn("If-None-Match", get.call_args.kwargs["headers"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import math
+import unittest
+import numpy as np
+from jyapystock import indicators
+
+
+def _bars(n, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    high = close + rng.uniform(0, 2, n)
+    low = close - rng.uniform(0, 2, n)
+    return [{"date": f"2023-01-{i + 1:02d}", "open": c, "high": h, "low": l, "close": c, "volume": 1000}
+            for i, (c, h, l) in enumerate(zip(close, high, low))]
+
+
+class TestPanelIndicators(unittest.TestCase):
+    def test_build_panel_aligns_dates(self):
+        dates, symbols, panels = indicators.build_panel({
+            "A": [{"date": "2023-01-02", "close": 1.0}, {"date": "2023-01-03", "close": 2.0}],
+            "B": [{"date": "2023-01-03", "close": 5.0}],
+        }, fields=("close",))
+        self.assertEqual(symbols, ["A", "B"])
+        self.assertEqual([str(d) for d in dates], ["2023-01-02", "2023-01-03"])
+        self.assertTrue(np.isnan(panels["close"][0, 1]))
+        self.assertEqual(panels["close"][1].tolist(), [2.0, 5.0])
+
+    def test_sma_matches_naive_mean_per_column(self):
+        panel = np.arange(20, dtype=float).reshape(10, 2)
+        out = indicators.sma(panel, 3)
+        self.assertTrue(np.isnan(out[:2]).all())
+        for t in range(2, 10):
+            np.testing.assert_allclose(out[t], panel[t - 2:t + 1].mean(axis=0))
+
+    def test_ragged_panel_skips_missing_rows(self):
+        days = np.arange(np.datetime64("2023-01-02"), np.datetime64("2023-01-02") + 80).astype(str)
+        full = [dict(bar, date=day) for bar, day in zip(_bars(31) + _bars(31, 2) + _bars(18, 3), days)]
+        histories = {"A": full, "LATE": full[30:], "GAP": full[:40] + full[43:]}
+        _, symbols, panels = indicators.build_panel(histories)
+        close, high, low = panels["close"], panels["high"], panels["low"]
+        checks = {
+            "sma": lambda c, h, l: indicators.sma(c, 5),
+            "ema": lambda c, h, l: indicators.ema(c, 10),
+            "rsi": lambda c, h, l: indicators.rsi(c, 14),
+            "atr": lambda c, h, l: indicators.atr(h, l, c, 14),
+            "volatility": lambda c, h, l: indicators.volatility(c, 20),
+            "high": lambda c, h, l: indicators.rolling_high(h, 20),
+        }
+        for name, fn in checks.items():
+            panel = fn(close, high, low)
+            for col, symbol in enumerate(symbols):
+                valid = ~np.isnan(close[:, col])
+                own = fn(close[valid, col], high[valid, col], low[valid, col])
+                np.testing.assert_allclose(panel[valid, col], own, err_msg=f"{name} {symbol}")
+                self.assertTrue(np.isnan(panel[~valid, col]).all())
+                self.assertFalse(np.isnan(panel[-1, col]), f"{name} {symbol}")
+
+    def test_rolling_high_low(self):
+        values = np.array([3.0, 1.0, 4.0, 1.0, 5.0])
+        self.assertEqual(indicators.rolling_high(values, 2)[1:].tolist(), [3.0, 4.0, 4.0, 5.0])
+        self.assertEqual(indicators.rolling_low(values, 2)[1:].tolist(), [1.0, 1.0, 1.0, 1.0])
+
+    def test_last_sma(self):
+        self.assertEqual(indicators.last_sma([1.0, 2.0, 3.0, 4.0], 2), 3.5)
+        self.assertTrue(math.isnan(indicators.last_sma([1.0], 2)))
+
+
+class TestIndicatorEngine(unittest.TestCase):
+    def test_incremental_matches_vectorized(self):
+        bars = _bars(60)
+        close = np.array([b["close"] for b in bars])
+        high = np.array([b["high"] for b in bars])
+        low = np.array([b["low"] for b in bars])
+        engine = indicators.IndicatorEngine(sma_windows=(5,), ema_spans=(10,), high_low_window=20)
+        engine.seed("X", bars[:-1])
+        values = engine.update("X", bars[-1])
+
+        self.assertAlmostEqual(values["sma_5"], indicators.sma(close, 5)[-1])
+        self.assertAlmostEqual(values["ema_10"], indicators.ema(close, 10)[-1])
+        self.assertAlmostEqual(values["rsi"], indicators.rsi(close, 14)[-1])
+        self.assertAlmostEqual(values["atr"], indicators.atr(high, low, close, 14)[-1])
+        self.assertAlmostEqual(values["volatility"], indicators.volatility(close, 20)[-1])
+        self.assertAlmostEqual(values["high_52w"], indicators.rolling_high(high, 20)[-1])
+        self.assertAlmostEqual(values["low_52w"], indicators.rolling_low(low, 20)[-1])
+        self.assertEqual(engine.values("X"), values)
+
+    def test_warm_up_is_nan(self):
+        engine = indicators.IndicatorEngine(sma_windows=(5,))
+        values = engine.seed("X", _bars(3))
+        self.assertTrue(math.isnan(values["sma_5"]))
+        self.assertTrue(math.isnan(values["rsi"]))
+        self.assertIsNone(engine.values("Y"))
+
+    def test_high_low_agree_with_vectorized_before_window_is_full(self):
+        bars = _bars(30)
+        high = np.array([b["high"] for b in bars])
+        low = np.array([b["low"] for b in bars])
+        engine = indicators.IndicatorEngine(high_low_window=20)
+        seen = [engine.update("X", bar) for bar in bars]
+        np.testing.assert_allclose([v["high_52w"] for v in seen], indicators.rolling_high(high, 20))
+        np.testing.assert_allclose([v["low_52w"] for v in seen], indicators.rolling_low(low, 20))
+        self.assertTrue(math.isnan(seen[18]["high_52w"]))
+        self.assertFalse(math.isnan(seen[19]["low_52w"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
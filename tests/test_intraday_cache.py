@@ -0,0 +1,51 @@
+import math
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from jyapystock.intraday_cache import IntradayBarCache
+from jyapystock.yfinance_support import get_yfinance_intraday_bars
+
+
+def bar(ts, close):
+    return {"datetime": ts, "open": close, "high": close, "low": close, "close": close, "volume": 100}
+
+
+class TestIntradayBarCache(unittest.TestCase):
+    def test_merge_appends_and_replaces_last_bar(self):
+        cache = IntradayBarCache()
+        cache.merge("AAPL", "1m", [bar("2025-12-24T09:30:00-05:00", 1.0), bar("2025-12-24T09:31:00-05:00", 2.0)])
+        # The 09:31 bar was still forming and is replaced by the refreshed one
+        cache.merge("AAPL", "1m", [bar("2025-12-24T09:31:00-05:00", 2.5), bar("2025-12-24T09:32:00-05:00", 3.0)])
+        bars = cache.get("AAPL", "1m")
+        self.assertEqual([b["close"] for b in bars], [1.0, 2.5, 3.0])
+        window = cache.get("AAPL", "1m", "2025-12-24T09:31:00-05:00", "2025-12-24T09:31:30-05:00")
+        self.assertEqual([b["close"] for b in window], [2.5])
+
+    def test_disk_cache_reloads(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = IntradayBarCache(tmp)
+            cache.merge("SBIN", "5m", [bar("2025-12-24T09:15:00+05:30", 1.0)])
+            cache.merge("SBIN", "5m", [bar("2025-12-24T09:15:00+05:30", 1.5), bar("2025-12-24T09:20:00+05:30", 2.0)])
+            reloaded = IntradayBarCache(tmp)
+            self.assertEqual([b["close"] for b in reloaded.get("SBIN", "5m")], [1.5, 2.0])
+            self.assertIsNotNone(reloaded.last_timestamp("SBIN", "5m"))
+            reloaded.clear("SBIN", "5m")
+            self.assertEqual(IntradayBarCache(tmp).get("SBIN", "5m"), [])
+
+
+
+class TestYFinanceIntradayBars(unittest.TestCase):
+    def test_missing_volume_becomes_none(self):
+        index = pd.to_datetime(["2025-12-24 09:30:00-05:00", "2025-12-24 09:35:00-05:00"])
+        frame = pd.DataFrame({"Open": [1.0, 2.0], "High": [1.0, 2.0], "Low": [1.0, 2.0], "Close": [1.0, 2.0],
+                              "Volume": [100.0, math.nan]}, index=index)
+        with mock.patch("jyapystock.yfinance_support.yf.Ticker") as ticker:
+            ticker.return_value.history.return_value = frame
+            bars = get_yfinance_intraday_bars("AAPL", "5m", "2025-12-24T09:30:00-05:00", "2025-12-24T09:40:00-05:00", "usa")
+        self.assertEqual([b["volume"] for b in bars], [100, None])
+        ticker.assert_called_once_with("AAPL")
+
+
+if __name__ == "__main__":
+    unittest.main()
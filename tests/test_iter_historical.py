@@ -0,0 +1,55 @@
+import threading
+import time
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+from jyapystock.models import BarSeries
+from jyapystock.stock_price_provider import StockPriceProvider
+
+
+def fake_history(symbol, start, end, *args, **kwargs):
+    # yfinance's `end` is exclusive
+    days = (end - start).days
+    return [{"date": (start + timedelta(days=i)).isoformat(), "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0,
+             "volume": 1} for i in range(days)]
+
+
+class TestIterHistorical(unittest.TestCase):
+    def test_chunks_cover_range_in_order(self):
+        provider = StockPriceProvider(country="USA", source="yfinance")
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_historical_prices", side_effect=fake_history):
+            chunks = list(provider.iter_historical(["AAPL", "MSFT"], "2020-01-01", "2020-03-31", chunk_days=30))
+        self.assertEqual([s for s, _ in chunks], ["AAPL"] * 4 + ["MSFT"] * 4)
+        self.assertTrue(all(len(records) <= 30 for _, records in chunks))
+        dates = [r["date"] for s, records in chunks if s == "AAPL" for r in records]
+        self.assertEqual(dates[0], "2020-01-01")
+        self.assertEqual(dates[-1], "2020-03-31")
+        self.assertEqual(dates, sorted(set(dates)))
+        self.assertIsNone(provider.history_cache.get("AAPL"))
+
+    def test_prefetch_is_bounded(self):
+        provider = StockPriceProvider(country="USA", source="yfinance", compact=True)
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow_history(*args, **kwargs):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+            return fake_history(*args)
+
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_historical_prices", side_effect=slow_history) as get:
+            stream = provider.iter_historical("AAPL", date(2000, 1, 1), date(2009, 12, 31), chunk_days=365, prefetch=2)
+            symbol, first = next(stream)
+            stream.close()
+        self.assertIsInstance(first, BarSeries)
+        self.assertLessEqual(max(peak), 2)
+        self.assertLessEqual(get.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+import textwrap
+import unittest
+
+# Runs in a fresh interpreter where the optional dependencies cannot be imported (a lightweight install)
+LIGHTWEIGHT_CHECK = textwrap.dedent("""
+    import sys
+    for name in ("pandas", "numpy", "yfinance", "nse", "bse"):
+        sys.modules[name] = None
+
+    from jyapystock import StockPriceProvider
+    from jyapystock.sources import UNAVAILABLE_SOURCES, registered_sources
+
+    assert registered_sources() == ["nasdaq", "alphavantage", "nyse"], registered_sources()
+    assert sorted(UNAVAILABLE_SOURCES) == ["bse", "nse", "yfinance"], UNAVAILABLE_SOURCES
+    provider = StockPriceProvider(country="USA", source="nasdaq")
+    assert provider.is_valid_source("nasdaq")
+    assert not provider.is_valid_source("nse")
+    try:
+        StockPriceProvider(country="India")
+    except ImportError as e:
+        assert "jyapystock[india]" in str(e) and "jyapystock[yfinance]" in str(e), e
+    else:
+        raise AssertionError("India without the india or yfinance extras should have no sources")
+    assert [name for name, _ in StockPriceProvider(country="USA")._historical_sources()] == ["nasdaq", "nyse"]
+    try:
+        StockPriceProvider(country="USA", source="yfinance")
+    except ImportError as e:
+        assert "jyapystock[yfinance]" in str(e), e
+    else:
+        raise AssertionError("explicit yfinance source should need the yfinance extra")
+    assert not any(m in sys.modules and sys.modules[m] is not None for m in ("pandas", "numpy"))
+""")
+
+
+class TestLightweightInstall(unittest.TestCase):
+    def test_provider_works_without_optional_dependencies(self):
+        result = subprocess.run([sys.executable, "-c", LIGHTWEIGHT_CHECK], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
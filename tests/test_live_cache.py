@@ -0,0 +1,43 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+from jyapystock.stock_price_provider import StockPriceProvider
+
+QUOTE = {"timestamp": "2025-12-24T13:00:00-05:00", "price": 273.81, "change_percent": 0.53}
+
+
+class TestMarketHoursCache(unittest.TestCase):
+    def test_poll_interval_follows_session(self):
+        provider = StockPriceProvider(country="USA")
+        self.assertEqual(provider.poll_interval(datetime(2025, 12, 23, 10, 0)), 15)
+        self.assertEqual(provider.poll_interval(datetime(2025, 12, 23, 8, 0)), 60)
+        # Christmas Eve closes early; the next pre-market starts Friday 04:00
+        self.assertEqual(provider.poll_interval(datetime(2025, 12, 24, 20, 0)), 32 * 3600)
+        self.assertEqual(provider._live_quote_ttl(datetime(2025, 12, 23, 10, 0)), 0)
+
+    def test_closed_market_serves_cached_quote(self):
+        provider = StockPriceProvider(country="USA", source="yfinance")
+        with mock.patch.object(StockPriceProvider, "_live_quote_ttl", return_value=3600), \
+             mock.patch("jyapystock.yfinance_support.get_yfinance_live_price", return_value=dict(QUOTE)) as fetch:
+            self.assertEqual(provider.get_live_price("AAPL"), QUOTE)
+            self.assertEqual(provider.get_live_price("aapl"), QUOTE)
+        fetch.assert_called_once()
+
+    def test_open_market_always_fetches(self):
+        provider = StockPriceProvider(country="USA", source="yfinance")
+        with mock.patch.object(StockPriceProvider, "_live_quote_ttl", return_value=0), \
+             mock.patch("jyapystock.yfinance_support.get_yfinance_live_price", return_value=dict(QUOTE)) as fetch:
+            provider.get_live_price("AAPL")
+            provider.get_live_price("AAPL")
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_batch_returns_every_symbol(self):
+        provider = StockPriceProvider(country="USA", source="yfinance", cache_live_quotes=False)
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_live_price",
+                        side_effect=lambda symbol, *args, **kwargs: dict(QUOTE) if symbol != "NOPE" else None):
+            quotes = provider.get_live_prices(["AAPL", "MSFT", "NOPE", "AAPL"])
+        self.assertEqual(quotes, {"AAPL": QUOTE, "MSFT": QUOTE, "NOPE": None})
+
+
+if __name__ == "__main__":
+    unittest.main()
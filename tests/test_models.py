@@ -0,0 +1,34 @@
+import unittest
+from jyapystock.models import Quote, BarSeries
+
+
+class TestQuote(unittest.TestCase):
+    def test_dict_compatibility(self):
+        quote = Quote.from_dict({"timestamp": "2025-12-24", "price": 273.81, "change_percent": 0.53})
+        self.assertEqual(quote["price"], 273.81)
+        self.assertEqual(quote.get("change_percent"), 0.53)
+        self.assertIn("timestamp", quote)
+        self.assertEqual(quote, {"timestamp": "2025-12-24", "price": 273.81, "change_percent": 0.53})
+        self.assertFalse(hasattr(quote, "__dict__"))
+
+
+class TestBarSeries(unittest.TestCase):
+    def test_list_compatibility(self):
+        records = [
+            {"date": "2023-01-03", "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 100.0},
+            {"date": "2023-01-04", "open": 1.5, "high": 2.5, "low": 1.0, "close": 2.0, "volume": None},
+        ]
+        series = BarSeries.from_records(records)
+        self.assertEqual(len(series), 2)
+        self.assertEqual(series, records)
+        self.assertEqual(series[-1]["date"], "2023-01-04")
+        self.assertIsNone(series[1]["volume"])
+        self.assertIs(type(series[0]["volume"]), int)
+        self.assertEqual(BarSeries.from_records([dict(records[0], volume=12.5)])[0]["volume"], 12.5)
+        self.assertEqual(series[1:].to_records(), records[1:])
+        self.assertEqual(list(series.column("close")), [1.5, 2.0])
+        self.assertEqual(series.nbytes, 2 * 8 * 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import math
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from jyapystock.models import market_cap_type
+from jyapystock.nasdaq_support import get_nasdaq_screener
+from jyapystock.stock_price_provider import StockPriceProvider
+
+SCREENER = {
+    "data": {
+        "asOf": "Last price as of Dec 24, 2025",
+        "headers": {"symbol": "Symbol", "name": "Name", "lastsale": "Last Sale", "pctchange": "% Change"},
+        "rows": [
+            {"symbol": "AAPL", "name": "Apple Inc. Common Stock", "lastsale": "$273.81", "netchange": "1.45",
+             "pctchange": "0.532%", "marketCap": "4,046,000,000,000.00", "volume": "17910574",
+             "sector": "Technology", "industry": "Computer Manufacturing"},
+            {"symbol": "TINY", "name": "Tiny Corp", "lastsale": "$1.02", "pctchange": "-3.1%",
+             "marketCap": "15,000,000.00", "volume": "1200", "sector": "", "industry": ""},
+            {"symbol": "NEWCO", "name": "New Co", "lastsale": "$10.00", "pctchange": "NA", "marketCap": "",
+             "volume": "0"},
+        ],
+    }
+}
+
+
+def response(payload, status_code=200):
+    return SimpleNamespace(status_code=status_code, json=lambda: payload)
+
+
+class TestMarketCapType(unittest.TestCase):
+    def test_tiers(self):
+        self.assertEqual(market_cap_type(1_999_999_999), "small_cap")
+        self.assertEqual(market_cap_type(2_000_000_000), "mid_cap")
+        self.assertEqual(market_cap_type(150e9), "large_cap")
+        self.assertEqual(market_cap_type(4e12), "mega_cap")
+        self.assertEqual(market_cap_type(None), "N/A")
+        self.assertEqual(market_cap_type(math.nan), "N/A")
+
+
+class TestNasdaqScreener(unittest.TestCase):
+    def test_rows_are_normalized_column_wise(self):
+        with mock.patch("jyapystock.nasdaq_support.http_get", return_value=response(SCREENER)) as get:
+            table = get_nasdaq_screener("NYSE")
+        self.assertTrue(get.call_args[0][0].endswith("&exchange=nyse"))
+        self.assertEqual(list(table), ["AAPL", "TINY", "NEWCO"])
+        self.assertEqual(table.timestamp, "Last price as of Dec 24, 2025")
+        self.assertEqual(table["aapl"]["price"], 273.81)
+        self.assertEqual(table["AAPL"]["market_cap_type"], "mega_cap")
+        self.assertIsNone(table["NEWCO"]["change_percent"])
+        self.assertEqual(table.column("change_percent")[1], -3.1)
+        self.assertEqual(table.market_cap_types(), ["mega_cap", "small_cap", "N/A"])
+
+    def test_failures_return_none(self):
+        with mock.patch("jyapystock.nasdaq_support.http_get", return_value=response({}, 403)):
+            self.assertIsNone(get_nasdaq_screener())
+        with mock.patch("jyapystock.nasdaq_support.http_get", return_value=response({"data": {"rows": []}})):
+            self.assertIsNone(get_nasdaq_screener())
+        with self.assertRaises(ValueError):
+            get_nasdaq_screener("lse")
+
+    def test_provider_caches_snapshot(self):
+        provider = StockPriceProvider(country="USA")
+        with mock.patch("jyapystock.nasdaq_support.http_get", return_value=response(SCREENER)) as get:
+            first = provider.get_market_snapshot()
+            second = provider.get_market_snapshot()
+        self.assertIs(first, second)
+        get.assert_called_once()
+        with self.assertRaises(ValueError):
+            StockPriceProvider(country="India").get_market_snapshot()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+from jyapystock import nse_support
+from jyapystock.nse_support import get_nse_bhavcopy
+from jyapystock.stock_price_provider import StockPriceProvider
+
+UDIFF = """TradDt,BizDt,Sgmt,Src,FinInstrmTp,FinInstrmId,ISIN,TckrSymb,SctySrs,XpryDt,FininstrmActlXpryDt,StrkPric,OptnTp,FinInstrmNm,OpnPric,HghPric,LwPric,ClsPric,LastPric,PrvsClsgPric,UndrlygPric,SttlmPric,OpnIntrst,ChngInOpnIntrst,TtlTradgVol,TtlTrfVal,TtlNbOfTxsExctd,SsnId,NewBrdLotQty,Rmks,Rsvd1,Rsvd2,Rsvd3,Rsvd4
+2025-01-02,2025-01-02,CM,NSE,STK,2885,INE002A01018,RELIANCE,EQ,,,,,RELIANCE INDUSTRIES LTD,1215.00,1248.00,1211.00,1243.75,1244.00,1215.50,,1243.75,,,13026218,16043390000.00,245000,F1,1,,,,,
+2025-01-02,2025-01-02,CM,NSE,STK,11536,INE467B01029,TCS,EQ,,,,,TATA CONSULTANCY SERV LT,4110.00,4150.00,4090.00,4138.15,4140.00,4110.20,,4138.15,,,1828611,7548000000.00,98000,F1,1,,,,,
+2025-01-02,2025-01-02,CM,NSE,STK,99999,INE000000000,SOMEBOND,GS,,,,,SOME BOND,100.00,100.00,100.00,100.00,100.00,100.00,,100.00,,,10,1000.00,1,F1,1,,,,,
+"""
+
+OLD = """SYMBOL,SERIES,OPEN,HIGH,LOW,CLOSE,LAST,PREVCLOSE,TOTTRDQTY,TOTTRDVAL,TIMESTAMP,TOTALTRADES,ISIN,
+RELIANCE,EQ,2560,2580.5,2550,2575.25,2576,2547.2,4321000,11100000000,02-JAN-2023,150000,INE002A01018,
+INFY,EQ,1510,1520,1500,1515.5,1516,1509,2000000,3030000000,02-JAN-2023,80000,INE009A01021,
+"""
+
+
+class FakeNSE:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def equityBhavcopy(self, day):
+        self.calls += 1
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w") as f:
+            f.write(self.content)
+        return path
+
+
+class TestNSEBhavcopy(unittest.TestCase):
+    def setUp(self):
+        nse_support._bhavcopy_cache.clear()
+
+    def test_udiff_format_is_parsed_and_cached(self):
+        fake = FakeNSE(UDIFF)
+        with mock.patch("jyapystock.nse_support._get_nse_instance", return_value=fake):
+            bars = get_nse_bhavcopy("2025-01-02")
+            again = get_nse_bhavcopy(date(2025, 1, 2))
+        self.assertEqual(sorted(bars), ["RELIANCE", "TCS"])
+        self.assertEqual(bars["RELIANCE"], {"date": "2025-01-02", "open": 1215.0, "high": 1248.0, "low": 1211.0,
+                                            "close": 1243.75, "volume": 13026218})
+        self.assertIs(again, bars)
+        self.assertEqual(fake.calls, 1)
+
+    def test_old_format_and_all_series(self):
+        with mock.patch("jyapystock.nse_support._get_nse_instance", return_value=FakeNSE(OLD)):
+            bars = get_nse_bhavcopy("2023-01-02", series=None)
+        self.assertEqual(bars["INFY"]["close"], 1515.5)
+        self.assertEqual(bars["INFY"]["date"], "2023-01-02")
+
+    def test_missing_report_returns_none(self):
+        fake = mock.Mock()
+        fake.equityBhavcopy.side_effect = RuntimeError("Report unavailable")
+        with mock.patch("jyapystock.nse_support._get_nse_instance", return_value=fake):
+            self.assertIsNone(get_nse_bhavcopy("2025-01-26"))
+
+    def test_snapshot_requires_nse(self):
+        with self.assertRaises(ValueError):
+            StockPriceProvider(country="USA").get_eod_snapshot("2025-01-02")
+        provider = StockPriceProvider(country="India", source="nse")
+        with mock.patch("jyapystock.nse_support._get_nse_instance", return_value=FakeNSE(UDIFF)):
+            self.assertEqual(provider.get_eod_snapshot("2025-01-02")["TCS"]["volume"], 1828611)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+from jyapystock.nse_support import get_nse_index_quotes
+from jyapystock.stock_price_provider import StockPriceProvider
+
+NIFTY_50 = {
+    "name": "NIFTY 50",
+    "timestamp": "24-Dec-2025 16:00:00",
+    "data": [
+        {"priority": 1, "symbol": "NIFTY 50", "lastPrice": 26142.1, "pChange": -0.14},
+        {"priority": 0, "symbol": "RELIANCE", "lastPrice": 1570.4, "pChange": 0.213, "lastUpdateTime": "24-Dec-2025 16:00:00"},
+        {"priority": 0, "symbol": "TCS", "lastPrice": 3311.0, "pChange": -1.0},
+        {"priority": 0, "symbol": "INFY", "lastPrice": 1650.5, "pChange": 0.5},
+        {"priority": 0, "symbol": "HDFCBANK", "lastPrice": 990.0, "pChange": 0.0},
+        {"priority": 0, "symbol": "ITC", "lastPrice": 405.0, "pChange": 1.234},
+    ],
+}
+
+
+class FakeNSE:
+    def __init__(self):
+        self.calls = []
+
+    def listEquityStocksByIndex(self, index="NIFTY 50"):
+        self.calls.append(index)
+        return NIFTY_50 if index == "NIFTY 50" else {"data": []}
+
+
+class TestNSEIndexQuotes(unittest.TestCase):
+    def test_constituents_are_normalized(self):
+        with mock.patch("jyapystock.nse_support._get_nse_instance", return_value=FakeNSE()):
+            quotes = get_nse_index_quotes("NIFTY 50")
+        self.assertNotIn("NIFTY 50", quotes)
+        self.assertEqual(quotes["RELIANCE"], {"timestamp": "24-Dec-2025 16:00:00", "price": 1570.4, "change_percent": 0.21})
+        self.assertEqual(quotes["TCS"]["timestamp"], "24-Dec-2025 16:00:00")
+
+    def test_batch_uses_one_index_request(self):
+        fake = FakeNSE()
+        provider = StockPriceProvider(country="India", source="nse", cache_live_quotes=False)
+        symbols = ["RELIANCE", "TCS.NS", "INFY", "HDFCBANK", "ITC", "ZOMATO"]
+        with mock.patch("jyapystock.nse_support._get_nse_instance", return_value=fake), \
+             mock.patch("jyapystock.nse_support.get_nse_live_price",
+                        return_value={"timestamp": "t", "price": 250.0, "change_percent": 2.0}) as single:
+            quotes = provider.get_live_prices(symbols)
+        self.assertEqual(list(quotes), symbols)
+        self.assertEqual(quotes["TCS.NS"]["price"], 3311.0)
+        self.assertEqual(quotes["ZOMATO"]["price"], 250.0)
+        self.assertEqual(fake.calls, ["NIFTY 50"])
+        single.assert_called_once()
+
+    def test_small_batches_skip_bulk_path(self):
+        provider = StockPriceProvider(country="India", source="nse", cache_live_quotes=False)
+        with mock.patch("jyapystock.stock_price_provider.get_nse_index_quotes") as bulk, \
+             mock.patch("jyapystock.nse_support.get_nse_live_price", return_value=None):
+            provider.get_live_prices(["RELIANCE", "TCS"])
+        bulk.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from datetime import date
+from unittest import mock
+from jyapystock.stock_price_provider import StockPriceProvider, _missing_ranges
+from jyapystock.trading_calendar import get_calendar
+
+
+def bars(*days):
+    return [{"date": d, "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1} for d in days]
+
+
+class TestPartialRangeFallback(unittest.TestCase):
+    def test_missing_ranges_groups_consecutive_trading_days(self):
+        # 2023-01-06 is a Friday; the weekend in between does not split the gap
+        # and 2023-01-02 (New Year's Day observed) is not expected at all
+        records = bars("2023-01-03", "2023-01-04", "2023-01-05")
+        self.assertEqual(
+            _missing_ranges(records, date(2023, 1, 2), date(2023, 1, 10), get_calendar("nyse")),
+            [(date(2023, 1, 6), date(2023, 1, 10))],
+        )
+
+    def test_single_days_are_only_gaps_in_years_with_a_holiday_list(self):
+        nse = get_calendar("nse")
+        # 2023-01-26 (Republic Day) is not in the holiday table, 2024-01-26 is
+        self.assertEqual(_missing_ranges(bars("2023-01-25", "2023-01-27"), date(2023, 1, 25), date(2023, 1, 27), nse), [])
+        self.assertEqual(_missing_ranges(bars("2023-01-23", "2023-01-27"), date(2023, 1, 23), date(2023, 1, 27), nse),
+                         [(date(2023, 1, 24), date(2023, 1, 26))])
+        self.assertEqual(_missing_ranges(bars("2024-01-24", "2024-01-29"), date(2024, 1, 24), date(2024, 1, 29), nse),
+                         [(date(2024, 1, 25), date(2024, 1, 25))])
+
+    def test_gap_no_source_fills_is_not_passed_down_the_chain(self):
+        provider = StockPriceProvider(country="India", source=["yfinance", "nse", "bse"])
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_historical_prices",
+                        return_value=bars("2023-01-05", "2023-01-06")), \
+             mock.patch("jyapystock.nse_support.get_nse_historical_prices", return_value=[]) as nse, \
+             mock.patch("jyapystock.bse_support.get_bse_historical_prices") as bse:
+            hist = provider.get_historical_price("NEWCO", "2023-01-02", "2023-01-06")
+        nse.assert_called_once_with("NEWCO", date(2023, 1, 2), date(2023, 1, 4), deadline=mock.ANY)
+        bse.assert_not_called()
+        self.assertEqual([r["date"] for r in hist], ["2023-01-05", "2023-01-06"])
+
+    def test_gap_a_source_did_not_answer_is_passed_down_the_chain(self):
+        provider = StockPriceProvider(country="India", source=["yfinance", "nse", "bse"])
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_historical_prices",
+                        return_value=bars("2023-01-05", "2023-01-06")), \
+             mock.patch("jyapystock.nse_support.get_nse_historical_prices", return_value=None), \
+             mock.patch("jyapystock.bse_support.get_bse_historical_prices",
+                        return_value=bars("2023-01-03", "2023-01-04")) as bse:
+            hist = provider.get_historical_price("INFY", "2023-01-02", "2023-01-06")
+        bse.assert_called_once_with("INFY", date(2023, 1, 2), date(2023, 1, 4), deadline=mock.ANY)
+        self.assertEqual([r["date"] for r in hist], ["2023-01-03", "2023-01-04", "2023-01-05", "2023-01-06"])
+
+    def test_next_source_only_fills_gaps(self):
+        provider = StockPriceProvider(country="India", source=["yfinance", "nse"])
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_historical_prices",
+                        return_value=bars("2023-01-02", "2023-01-03", "2023-01-04")), \
+             mock.patch("jyapystock.nse_support.get_nse_historical_prices",
+                        return_value=bars("2023-01-05", "2023-01-06")) as nse:
+            hist = provider.get_historical_price("INFY", "2023-01-02", "2023-01-06")
+        nse.assert_called_once_with("INFY", date(2023, 1, 5), date(2023, 1, 6), deadline=mock.ANY)
+        self.assertEqual([r["date"] for r in hist],
+                         ["2023-01-02", "2023-01-03", "2023-01-04", "2023-01-05", "2023-01-06"])
+
+    def test_failed_window_is_not_cached(self):
+        provider = StockPriceProvider(country="India", source=["nse"], history_windows={"nse": 3})
+
+        def fetch(symbol, start, end, deadline=None):
+            if start == date(2023, 1, 5):
+                raise ConnectionError("https://www.nseindia.com 429: Too Many Requests")
+            return bars(start.isoformat())
+
+        with mock.patch("jyapystock.nse_support.get_nse_historical_prices", side_effect=fetch) as nse:
+            hist = provider.get_historical_price("INFY", "2023-01-02", "2023-01-10")
+            self.assertEqual([r["date"] for r in hist], ["2023-01-02", "2023-01-08"])
+            self.assertIsNone(provider.history_cache.get("INFY"))
+            provider.get_historical_price("INFY", "2023-01-02", "2023-01-10")
+        # Both calls went upstream: 3 windows, the failing one retried once
+        self.assertEqual(nse.call_count, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from unittest import mock
+import numpy as np
+from jyapystock import indicators, portfolio
+from jyapystock.portfolio import Portfolio
+from jyapystock.stock_price_provider import StockPriceProvider
+
+
+def _returns(n=120, cols=7, seed=3):
+    rng = np.random.default_rng(seed)
+    r = rng.normal(0, 0.01, (n, cols))
+    r[:, 1] += 0.5 * r[:, 0]
+    r[rng.random((n, cols)) < 0.1] = np.nan
+    return r
+
+
+def _naive(r, corr):
+    cols = r.shape[1]
+    out = np.empty((cols, cols))
+    for i in range(cols):
+        for j in range(cols):
+            both = ~np.isnan(r[:, i]) & ~np.isnan(r[:, j])
+            a, b = r[both, i], r[both, j]
+            out[i, j] = np.corrcoef(a, b)[0, 1] if corr else np.cov(a, b)[0, 1]
+    return out
+
+
+class TestPortfolioFunctions(unittest.TestCase):
+    def test_blocked_covariance_matches_pairwise_complete(self):
+        r = _returns()
+        np.testing.assert_allclose(portfolio.covariance(r, block_size=3), _naive(r, False), rtol=1e-9, atol=1e-15)
+        np.testing.assert_allclose(portfolio.correlation(r, block_size=2), _naive(r, True), rtol=1e-9)
+
+    def test_covariance_fills_preallocated_output(self):
+        r = _returns(cols=5)
+        out = np.zeros((5, 5))
+        self.assertIs(portfolio.covariance(r, block_size=2, out=out), out)
+        self.assertTrue(np.allclose(out, out.T))
+
+    def test_returns_and_drawdowns(self):
+        close = np.array([[100.0, 10.0], [110.0, np.nan], [99.0, 12.0], [121.0, 6.0]])
+        np.testing.assert_allclose(portfolio.returns(close)[:, 0], [0.1, -0.1, 121 / 99 - 1])
+        self.assertTrue(np.isnan(portfolio.returns(close)[0, 1]))
+        np.testing.assert_allclose(portfolio.drawdowns(close)[:, 0], [0.0, 0.0, -0.1, 0.0])
+        np.testing.assert_allclose(portfolio.max_drawdown(close), [-0.1, -0.5])
+
+
+class TestPortfolio(unittest.TestCase):
+    def test_from_provider_uses_provider_history(self):
+        history = {
+            "AAPL": [{"date": "2024-01-02", "close": 100.0}, {"date": "2024-01-03", "close": 102.0},
+                     {"date": "2024-01-04", "close": 99.96}],
+            "MSFT": [{"date": "2024-01-03", "close": 50.0}, {"date": "2024-01-04", "close": 55.0}],
+            "NONE": None,
+        }
+        provider = StockPriceProvider(country="USA")
+        with mock.patch.object(provider, "get_historical_price", side_effect=lambda s, *a, **k: history[s]) as get:
+            book = Portfolio.from_provider(provider, ["AAPL", "MSFT", "NONE"], "2024-01-01", "2024-01-05")
+        self.assertEqual(get.call_count, 3)
+        self.assertEqual(book.symbols, ["AAPL", "MSFT"])
+        self.assertEqual(book.close.shape, (3, 2))
+        np.testing.assert_allclose(book.portfolio_returns({"AAPL": 0.5, "MSFT": 0.5}), [0.01, 0.04])
+        self.assertAlmostEqual(book.max_drawdown()["AAPL"], -0.02)
+
+    def test_annualization_follows_the_bar_interval(self):
+        closes = [100.0, 102.0, 99.0, 104.0, 103.0, 107.0]
+        mondays = ["2024-01-01", "2024-01-08", "2024-01-15", "2024-01-22", "2024-01-29", "2024-02-05"]
+        histories = {"AAPL": [{"date": d, "close": c} for d, c in zip(mondays, closes)]}
+        daily = Portfolio.from_histories(histories)
+        weekly = Portfolio.from_histories(histories, interval="1wk")
+        self.assertEqual(weekly.periods_per_year, 52)
+        ratio = np.sqrt(252 / 52)
+        self.assertAlmostEqual(daily.annualized_volatility()["AAPL"], weekly.annualized_volatility()["AAPL"] * ratio)
+        np.testing.assert_allclose(daily.volatility(window=3), weekly.volatility(window=3) * ratio)
+        np.testing.assert_allclose(daily.covariance(annualize=True), weekly.covariance(annualize=True) * 252 / 52)
+
+    def test_ragged_histories_keep_rolling_volatility(self):
+        rng = np.random.default_rng(5)
+        days = np.arange(np.datetime64("2024-01-01"), np.datetime64("2024-01-01") + 60).astype(str)
+        closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 60)))
+        full = [{"date": d, "close": c} for d, c in zip(days, closes)]
+        book = Portfolio.from_histories({"OLD": full, "IPO": full[25:], "GAP": full[:30] + full[31:]})
+        vol = book.volatility(window=10)
+        self.assertFalse(np.isnan(vol[-1]).any())
+        gap = book.symbols.index("GAP")
+        valid = ~np.isnan(book.close[:, gap])
+        np.testing.assert_allclose(vol[valid, gap], indicators.volatility(book.close[valid, gap], 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
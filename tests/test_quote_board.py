@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+import unittest
+from unittest import mock
+from jyapystock import StockPriceProvider
+from jyapystock.quote_board import QuoteBoard, QuoteBoardRefresher
+
+
+def _read_in_child(name, symbol, queue):
+    board = QuoteBoard(name)
+    queue.put(board.read(symbol))
+    board.close()
+
+
+class TestQuoteBoard(unittest.TestCase):
+    def setUp(self):
+        self.name = f"jyaqb_test_{os.getpid()}"
+        self.board = QuoteBoard(self.name, capacity=8, create=True)
+
+    def tearDown(self):
+        self.board.close()
+        self.board.unlink()
+
+    def test_publish_and_read(self):
+        self.assertIsNone(self.board.read("AAPL"))
+        self.board.publish("aapl", {"timestamp": "2025-01-02T16:00:00-05:00", "price": 243.85, "change_percent": -2.62})
+        self.board.publish("AAPL", {"timestamp": "2025-01-03T16:00:00-05:00", "price": 243.36, "change_percent": None})
+        quote = self.board.read("AAPL")
+        self.assertEqual(quote["price"], 243.36)
+        self.assertIsNone(quote["change_percent"])
+        self.assertEqual(quote["timestamp"], "2025-01-03T16:00:00-05:00")
+        self.assertEqual(self.board.symbols(), ["AAPL"])
+        self.assertIsNone(self.board.read("AAPL", max_age=-1))
+
+    def test_full_board_drops_new_symbols(self):
+        for i in range(8):
+            self.assertTrue(self.board.publish(f"S{i}", {"price": float(i)}))
+        self.assertFalse(self.board.publish("ONE_TOO_MANY", {"price": 1.0}))
+        self.assertEqual(self.board.read("S5")["price"], 5.0)
+
+    def test_other_process_reads_without_upstream_calls(self):
+        self.board.publish("INFY", {"timestamp": "t", "price": 1890.5, "change_percent": 0.4})
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+        child = ctx.Process(target=_read_in_child, args=(self.name, "INFY", queue))
+        child.start()
+        quote = queue.get(timeout=30)
+        child.join()
+        self.assertEqual(quote["price"], 1890.5)
+
+    def test_provider_reads_board_before_sources(self):
+        writer = StockPriceProvider(country="USA", source="nasdaq", cache_live_quotes=False)
+        with mock.patch("jyapystock.nasdaq_support.get_nasdaq_live_price",
+                        return_value={"timestamp": "t", "price": 10.0, "change_percent": 1.0}):
+            QuoteBoardRefresher(writer, self.board, ["MSFT"]).refresh()
+
+        reader = StockPriceProvider(country="USA", source="nasdaq", cache_live_quotes=False,
+                                    quote_board=self.name, quote_board_max_age=60)
+        with mock.patch("jyapystock.nasdaq_support.get_nasdaq_live_price") as upstream:
+            self.assertEqual(reader.get_live_price("MSFT"), {"timestamp": "t", "price": 10.0, "change_percent": 1.0})
+        upstream.assert_not_called()
+        reader.quote_board.close()
+
+    def test_refresher_fetches_symbols_in_one_batch(self):
+        provider = mock.Mock()
+        provider.get_live_prices.return_value = {"INFY": {"timestamp": "t", "price": 1.0, "change_percent": 0.0},
+                                                 "TCS": None}
+        self.assertEqual(QuoteBoardRefresher(provider, self.board, ["INFY", "TCS"]).refresh(), 1)
+        provider.get_live_prices.assert_called_once_with(["INFY", "TCS"])
+        provider.get_live_price.assert_not_called()
+        self.assertEqual(self.board.read("INFY")["price"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import time
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+from jyapystock.stock_price_provider import StockPriceProvider
+from jyapystock.refresh import BackgroundRefresher
+
+QUOTE = {"timestamp": "t", "price": 10.0, "change_percent": 1.0}
+INFO = {"symbol": "AAPL", "name": "Apple Inc."}
+
+
+def bars(*dates):
+    return [{"date": d, "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1} for d in dates]
+
+
+class TestWarmAndRefresh(unittest.TestCase):
+    def test_warm_fills_info_and_history_caches(self):
+        provider = StockPriceProvider(country="USA", source="yfinance")
+        today = date.today()
+        history = bars((today - timedelta(days=3)).isoformat(), (today - timedelta(days=1)).isoformat())
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_stock_info", return_value=dict(INFO)) as info, \
+             mock.patch("jyapystock.yfinance_support.get_yfinance_historical_prices", return_value=history) as hist, \
+             mock.patch("jyapystock.yfinance_support.get_yfinance_live_price", return_value=dict(QUOTE)):
+            provider.warm(["AAPL"], history_days=30)
+            self.assertEqual(provider.get_stock_info("AAPL"), INFO)
+            recent = provider.get_historical_price("AAPL", today - timedelta(days=7), today)
+        self.assertEqual(recent, history)
+        info.assert_called_once()
+        hist.assert_called_once()
+
+    def test_hot_entries_are_refreshed_before_expiry(self):
+        provider = StockPriceProvider(country="USA", source="yfinance", info_ttl=10)
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_stock_info", return_value=dict(INFO)) as info:
+            provider.get_stock_info("AAPL")
+            refresher = BackgroundRefresher(provider, ahead=0.2)
+            self.assertEqual(refresher.due(), [])
+            # 9 of 10 seconds later the entry is inside the refresh-ahead margin
+            self.assertEqual(refresher.due(now=time.time() + 9), [("info", "AAPL")])
+            provider.info_cache.set("AAPL", dict(INFO), 1)
+            self.assertEqual(refresher.run_once(), 1)
+        self.assertEqual(info.call_count, 2)
+        self.assertGreater(provider.info_cache.expires_at("AAPL"), time.time() + 5)
+
+    def test_history_refresh_fetches_only_the_tail(self):
+        provider = StockPriceProvider(country="USA", source="yfinance", history_ttl=10)
+        start, end = date(2020, 1, 1), date(2020, 1, 10)
+        history = bars("2020-01-02", "2020-01-03", "2020-01-06")
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_historical_prices", return_value=history) as hist:
+            provider.get_historical_price("AAPL", start, end)
+            provider.history_cache.set("AAPL", provider.history_cache.get("AAPL"), 1)
+            self.assertEqual(BackgroundRefresher(provider).run_once(), 1)
+        self.assertEqual(hist.call_args_list[1].args[1:3], (date(2020, 1, 6), end + timedelta(days=1)))
+        cached = provider.history_cache.get("AAPL")
+        self.assertEqual((cached[0], cached[1], len(cached[2])), (start, end, 3))
+
+    def test_cached_history_is_not_shared_with_callers(self):
+        provider = StockPriceProvider(country="USA", source="yfinance")
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_historical_prices",
+                        return_value=bars("2020-01-02", "2020-01-03")):
+            first = provider.get_historical_price("AAPL", "2020-01-01", "2020-01-05")
+        first[0]["close"] = 99.0
+        first.clear()
+        again = provider.get_historical_price("AAPL", "2020-01-01", "2020-01-05")
+        self.assertEqual([r["close"] for r in again], [1.0, 1.0])
+        again.clear()
+        self.assertEqual(len(provider.get_historical_price("AAPL", "2020-01-01", "2020-01-05")), 2)
+
+    def test_cold_entries_are_dropped(self):
+        provider = StockPriceProvider(country="USA", source="yfinance")
+        provider.last_access[("info", "AAPL")] = time.time() - 3600
+        refresher = BackgroundRefresher(provider, hot_window=600)
+        self.assertEqual(refresher.due(), [])
+        self.assertEqual(provider.last_access, {})
+
+    def test_caches_are_bounded_and_evictions_forget_access(self):
+        provider = StockPriceProvider(country="USA", source="yfinance",
+                                      cache_max_entries={"live": 1, "info": 2, "history": 1})
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_stock_info",
+                        side_effect=lambda symbol, *args, **kwargs: dict(INFO, symbol=symbol)):
+            for symbol in ("AAPL", "MSFT", "NVDA"):
+                provider.get_stock_info(symbol)
+        self.assertEqual(len(provider.info_cache), 2)
+        self.assertEqual(sorted(provider.last_access), [("info", "MSFT"), ("info", "NVDA")])
+        # Accesses to keys that were never cached stay within the caches' total size
+        for i in range(10):
+            provider._touch("live", f"S{i}")
+        self.assertEqual(len(provider.last_access), 4)
+        self.assertIn(("live", "S9"), provider.last_access)
+        self.assertIsNone(StockPriceProvider(country="USA", cache_max_entries={"history": None}).history_cache.max_entries)
+
+    def test_running_refresher_caches_quotes_during_market_hours(self):
+        provider = StockPriceProvider(country="USA", source="yfinance")
+        with mock.patch.object(provider.calendar, "session_state", return_value="open"):
+            self.assertEqual(provider._live_quote_ttl(), 0)
+            provider.start_refresher(interval=60)
+            try:
+                self.assertEqual(provider._live_quote_ttl(), 15)
+            finally:
+                provider.stop_refresher()
+
+
+if __name__ == "__main__":
+    unittest.main()
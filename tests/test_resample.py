@@ -0,0 +1,62 @@
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+from jyapystock.resample import period_bounds, resample_bars
+from jyapystock.stock_price_provider import StockPriceProvider
+
+
+def daily(start: date, end: date) -> list:
+    records = []
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            n = day.toordinal() % 100
+            records.append({"date": day.isoformat(), "open": 100.0 + n, "high": 110.0 + n, "low": 90.0 + n,
+                            "close": 105.0 + n, "volume": 1000})
+        day += timedelta(days=1)
+    return records
+
+
+class TestResampleBars(unittest.TestCase):
+    def test_weekly_bars(self):
+        records = daily(date(2024, 1, 1), date(2024, 1, 14))
+        bars = resample_bars(records, "1wk")
+        self.assertEqual([b["date"] for b in bars], ["2024-01-01", "2024-01-08"])
+        week = records[:5]
+        self.assertEqual(bars[0], {"date": "2024-01-01", "open": week[0]["open"], "high": max(r["high"] for r in week),
+                                   "low": min(r["low"] for r in week), "close": week[-1]["close"], "volume": 5000})
+
+    def test_missing_values_are_skipped(self):
+        records = [{"date": "2024-02-01", "open": None, "high": 5.0, "low": None, "close": 4.0, "volume": None},
+                   {"date": "2024-02-02", "open": 4.5, "high": 4.8, "low": 4.1, "close": None, "volume": 10}]
+        self.assertEqual(resample_bars(records, "1mo"),
+                         [{"date": "2024-02-01", "open": 4.5, "high": 5.0, "low": 4.1, "close": 4.0, "volume": 10}])
+
+    def test_quarters_and_bounds(self):
+        bars = resample_bars(daily(date(2023, 11, 1), date(2024, 4, 30)), "1q")
+        self.assertEqual([b["date"] for b in bars], ["2023-10-01", "2024-01-01", "2024-04-01"])
+        self.assertEqual(period_bounds(date(2024, 2, 14), "1q"), (date(2024, 1, 1), date(2024, 3, 31)))
+        self.assertEqual(period_bounds(date(2024, 12, 5), "1mo"), (date(2024, 12, 1), date(2024, 12, 31)))
+        self.assertEqual(period_bounds(date(2024, 2, 14), "1wk"), (date(2024, 2, 12), date(2024, 2, 18)))
+        with self.assertRaises(ValueError):
+            resample_bars([], "2h")
+
+
+class TestProviderIntervals(unittest.TestCase):
+    def test_one_daily_fetch_serves_all_timeframes(self):
+        provider = StockPriceProvider(country="USA", source="yfinance")
+        history = daily(date(2024, 1, 1), date(2024, 6, 30))
+        with mock.patch("jyapystock.yfinance_support.get_yfinance_historical_prices", return_value=history) as hist:
+            monthly = provider.get_historical_price("AAPL", "2024-01-15", "2024-06-10", interval="1mo")
+            weekly = provider.get_historical_price("AAPL", "2024-03-01", "2024-03-31", interval="1wk")
+            quarterly = provider.get_historical_price("AAPL", "2024-01-01", "2024-06-30", interval="1q")
+        hist.assert_called_once()
+        self.assertEqual(hist.call_args[0][1:3], (date(2024, 1, 1), date(2024, 7, 1)))
+        self.assertEqual(len(monthly), 6)
+        self.assertEqual(monthly[0]["open"], history[0]["open"])
+        self.assertEqual(weekly[0]["date"], "2024-02-26")
+        self.assertEqual(quarterly[1]["close"], history[-1]["close"])
+
+
+if __name__ == "__main__":
+    unittest.main()
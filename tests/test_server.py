@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+import unittest
+from urllib.request import urlopen
+from jyapystock.cache import SingleFlight
+from jyapystock.server import QuoteService, make_server
+
+
+class FakeProvider:
+    def __init__(self):
+        self.live_calls = []
+        self.history_calls = 0
+        self.price = 100.0
+
+    def get_live_price(self, symbol):
+        self.live_calls.append(symbol)
+        time.sleep(0.05)
+        return {"timestamp": "t", "price": self.price, "change_percent": 0.5}
+
+    def get_live_prices(self, symbols):
+        return {s: self.get_live_price(s) for s in symbols}
+
+    def get_historical_price(self, symbol, start, end):
+        self.history_calls += 1
+        return [{"date": start, "open": 1.0, "high": 2.0, "low": 0.5, "close": float("nan"), "volume": 10}]
+
+    def get_stock_info(self, symbol):
+        return {"symbol": symbol, "name": "Fake"}
+
+    def poll_interval(self):
+        return 0.01
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return 42
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(len(calls), 1)
+
+
+class TestQuoteService(unittest.TestCase):
+    def setUp(self):
+        self.provider = FakeProvider()
+        self.server = make_server(self.provider, port=0, live_ttl=60)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get(self, path):
+        with urlopen(self.base + path, timeout=10) as response:
+            return response.status, json.loads(response.read())
+
+    def test_live_batch_is_cached_and_coalesced(self):
+        threads = [threading.Thread(target=self.get, args=("/live?symbols=AAPL",)) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        status, body = self.get("/live?symbols=AAPL,MSFT")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["AAPL"]["price"], 100.0)
+        self.assertEqual(sorted(self.provider.live_calls), ["AAPL", "MSFT"])
+
+    def test_historical_info_and_nan(self):
+        status, body = self.get("/historical?symbols=AAPL&start=2024-01-02&end=2024-01-05")
+        self.assertEqual(status, 200)
+        self.assertIsNone(body["AAPL"][0]["close"])
+        self.get("/historical?symbols=AAPL&start=2024-01-02&end=2024-01-05")
+        self.assertEqual(self.provider.history_calls, 1)
+        self.assertEqual(self.get("/info?symbols=AAPL")[1]["AAPL"]["name"], "Fake")
+
+    def test_bad_request(self):
+        with self.assertRaises(Exception) as ctx:
+            self.get("/live")
+        self.assertEqual(ctx.exception.code, 400)
+
+    def test_stream_emits_changed_quotes(self):
+        service = QuoteService(self.provider, live_ttl=0)
+        stream = service.stream(["AAPL"], interval=0)
+        self.assertEqual(next(stream)[1]["price"], 100.0)
+        self.provider.price = 101.0
+        self.assertEqual(next(stream)[1]["price"], 101.0)
+
+    def test_stream_error_ends_with_error_event(self):
+        def failing(symbol):
+            raise RuntimeError("upstream down")
+        self.provider.get_live_price = failing
+        with urlopen(self.base + "/stream?symbols=AAPL&interval=0", timeout=10) as response:
+            self.assertEqual(response.status, 200)
+            body = response.read()
+        self.assertEqual(body, b'event: error\ndata: {"error": "Internal error"}\n\n')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from unittest import mock
+from jyapystock import sources
+from jyapystock.sources import SourceBackend, register_source, unregister_source
+from jyapystock.stock_price_provider import StockPriceProvider
+
+
+class InHouseBackend(SourceBackend):
+    name = "inhouse"
+    countries = ("usa",)
+    exchanges = ("nasdaq",)
+
+    def live_price(self, provider, symbol, deadline):
+        return {"timestamp": "t", "price": 42.0, "change_percent": 0.5}
+
+
+class TestSourceBackends(unittest.TestCase):
+    def setUp(self):
+        register_source(InHouseBackend)
+
+    def tearDown(self):
+        unregister_source("inhouse")
+
+    def test_registered_backend_serves_explicit_source(self):
+        provider = StockPriceProvider(country="USA", source="inhouse", cache_live_quotes=False)
+        self.assertEqual([b.name for b in provider.source_chains["live_price"]], ["inhouse"])
+        self.assertEqual(provider.source_chains["historical_prices"], [])
+        self.assertEqual(provider.get_live_price("AAPL")["price"], 42.0)
+
+    def test_auto_appends_registered_backends_and_filters_exchange(self):
+        auto = StockPriceProvider(country="USA", source="auto")
+        self.assertEqual(auto.source_chains["live_price"][-1].name, "inhouse")
+        nyse = StockPriceProvider(country="USA", exchange="nyse")
+        self.assertNotIn("inhouse", [b.name for b in nyse.backends])
+        with self.assertRaises(ValueError):
+            register_source(InHouseBackend)
+
+    def test_alpha_vantage_needs_key_and_usa(self):
+        with mock.patch.dict("os.environ", {}, clear=True):
+            self.assertNotIn("alphavantage", [b.name for b in StockPriceProvider(country="USA").backends])
+        usa = StockPriceProvider(country="USA", alpha_vantage_api_key="key")
+        self.assertIn("alphavantage", [name for name, _ in usa._historical_sources()])
+        india = StockPriceProvider(country="India", alpha_vantage_api_key="key")
+        self.assertNotIn("alphavantage", [name for name, _ in india._historical_sources()])
+
+    def test_duplicate_sources_are_walked_once(self):
+        provider = StockPriceProvider(country="USA", source=["inhouse", "auto"])
+        names = [b.name for b in provider.backends]
+        self.assertEqual(names[0], "inhouse")
+        self.assertEqual(len(names), len(set(names)))
+        self.assertTrue(sources.get_source("nasdaq").implements("historical_prices"))
+        self.assertFalse(sources.get_source("nasdaq").implements("stock_info"))
+
+
+if __name__ == "__main__":
+    unittest.main()
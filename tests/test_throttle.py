@@ -0,0 +1,108 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from jyapystock.deadline import Deadline, DeadlineExceeded
+from jyapystock.throttle import HostLimiter, get_limiter, is_throttle_error, set_host_limits, throttled_response
+
+
+class TestHostLimiter(unittest.TestCase):
+    def test_concurrency_is_bounded(self):
+        limiter = HostLimiter("example.com", max_concurrency=2)
+        running = []
+        peak = []
+
+        def work():
+            running.append(1)
+            peak.append(len(running))
+            time.sleep(0.05)
+            running.pop()
+
+        threads = [threading.Thread(target=limiter.call, args=(work,)) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertLessEqual(max(peak), 2)
+
+    def test_throttling_halves_limits_and_success_ramps_back(self):
+        limiter = HostLimiter("example.com", max_concurrency=8, rate=100.0, backoff=0.01)
+        limiter.call(lambda: SimpleNamespace(status_code=429), is_throttled=throttled_response)
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.current_rate, 50.0)
+        time.sleep(0.02)
+        for _ in range(20):
+            limiter.call(lambda: SimpleNamespace(status_code=200), is_throttled=throttled_response)
+        self.assertGreater(limiter.limit, 6)
+        self.assertEqual(limiter.current_rate, 100.0)
+
+    def test_backoff_blocks_until_deadline(self):
+        limiter = HostLimiter("example.com", backoff=5.0)
+        with self.assertRaises(TimeoutError):
+            limiter.call(self._raise_timeout)
+        with self.assertRaises(DeadlineExceeded):
+            limiter.call(lambda: None, deadline=Deadline(0.05))
+
+    def test_timeout_cut_short_by_deadline_is_not_throttling(self):
+        limiter = HostLimiter("example.com", max_concurrency=4, rate=100.0)
+        with self.assertRaises(TimeoutError):
+            limiter.call(self._raise_timeout, deadline=Deadline(0.3), timeout=10)
+        with self.assertRaises(DeadlineExceeded):
+            limiter.call(lambda: Deadline(0).check())
+        self.assertEqual((limiter.limit, limiter.current_rate), (4, 100.0))
+        with self.assertRaises(TimeoutError):
+            limiter.call(self._raise_timeout, deadline=Deadline(30), timeout=10)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_rate_spaces_requests(self):
+        limiter = HostLimiter("example.com", rate=20.0)
+        started = time.monotonic()
+        for _ in range(4):
+            limiter.call(lambda: None)
+        self.assertGreaterEqual(time.monotonic() - started, 0.14)
+
+    @staticmethod
+    def _raise_timeout():
+        raise TimeoutError("read timed out")
+
+
+class TestThrottleHelpers(unittest.TestCase):
+    def test_is_throttle_error(self):
+        self.assertTrue(is_throttle_error(ConnectionError("https://www.nseindia.com/api/quote 429: Too Many Requests")))
+        self.assertFalse(is_throttle_error(ConnectionError("https://www.nseindia.com/api/quote 403: Forbidden")))
+        self.assertTrue(is_throttle_error(ConnectionError("https://www.nseindia.com/api/quote 403: Forbidden"), (403, 429)))
+        self.assertTrue(is_throttle_error(TimeoutError()))
+        self.assertFalse(is_throttle_error(DeadlineExceeded()))
+        self.assertFalse(is_throttle_error(ConnectionError("404: Not Found")))
+        self.assertFalse(is_throttle_error(ValueError("bad json")))
+
+    def test_forbidden_counts_only_with_retry_after(self):
+        self.assertTrue(throttled_response(SimpleNamespace(status_code=429, headers={})))
+        self.assertFalse(throttled_response(SimpleNamespace(status_code=403, headers={})))
+        self.assertTrue(throttled_response(SimpleNamespace(status_code=403, headers={"Retry-After": "30"})))
+
+    def test_nse_and_bse_back_off_on_bare_forbidden(self):
+        for source in ("nse", "bse"):
+            limiter = get_limiter(source)
+            self.assertTrue(limiter.throttled_response(SimpleNamespace(status_code=403, headers={})))
+        self.assertFalse(get_limiter("nasdaq").throttled_response(SimpleNamespace(status_code=403, headers={})))
+        limiter = HostLimiter("www.nseindia.com", backoff=0.01, throttle_statuses=(403, 429))
+        with self.assertRaises(ConnectionError):
+            limiter.call(self._raise_forbidden)
+        self.assertEqual(limiter.limit, 2)
+
+    @staticmethod
+    def _raise_forbidden():
+        raise ConnectionError("https://www.nseindia.com/api/historical/cm/equity 403: Forbidden")
+
+    def test_limits_configurable_by_source(self):
+        set_host_limits("nasdaq", max_concurrency=7, rate=None)
+        limiter = get_limiter("https://api.nasdaq.com/api/quote/AAPL/info")
+        self.assertEqual(limiter.max_concurrency, 7)
+        self.assertIsNone(limiter.max_rate)
+        self.assertIs(get_limiter("nasdaq"), limiter)
+        set_host_limits("nasdaq", max_concurrency=4, rate=5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import json
+import os
+import unittest
+from datetime import date, datetime, time
+from jyapystock.trading_calendar import get_calendar, PRE_MARKET, OPEN, POST_MARKET, CLOSED
+
+with open(os.path.join(os.path.dirname(__file__), "fixtures", "known_holidays.json")) as fh:
+    KNOWN = json.load(fh)
+
+
+class TestTradingCalendar(unittest.TestCase):
+    def test_known_holidays(self):
+        for exchange, days in KNOWN.items():
+            calendar = get_calendar(exchange)
+            for day in days["holidays"]:
+                self.assertFalse(calendar.is_trading_day(day), f"{exchange} {day} should be a holiday")
+            for day in days["trading_days"]:
+                self.assertTrue(calendar.is_trading_day(day), f"{exchange} {day} should be a trading day")
+            for day in days["early_closes"]:
+                self.assertEqual(calendar.close_time(day), time(13, 0), f"{exchange} {day} should close early")
+
+    def test_shared_calendars(self):
+        self.assertEqual(get_calendar("bse").holidays(2025), get_calendar("nse").holidays(2025))
+        self.assertEqual(get_calendar("nasdaq").holidays(2025), get_calendar("nyse").holidays(2025))
+
+    def test_weekends_are_skipped(self):
+        calendar = get_calendar("nse")
+        self.assertEqual(calendar.trading_days("2025-12-19", "2025-12-22"), [date(2025, 12, 19), date(2025, 12, 22)])
+
+    def test_session_states(self):
+        calendar = get_calendar("nyse")
+        self.assertEqual(calendar.session_state(datetime(2025, 12, 23, 8, 0)), PRE_MARKET)
+        self.assertEqual(calendar.session_state(datetime(2025, 12, 23, 10, 0)), OPEN)
+        self.assertEqual(calendar.session_state(datetime(2025, 12, 24, 14, 0)), POST_MARKET)
+        self.assertEqual(calendar.session_state(datetime(2025, 12, 25, 10, 0)), CLOSED)
+        self.assertEqual(calendar.next_open(datetime(2025, 12, 24, 14, 0)).date(), date(2025, 12, 26))
+        self.assertEqual(calendar.last_completed_session(datetime(2025, 12, 26, 9, 0)), date(2025, 12, 24))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from datetime import date
+from jyapystock.windowed import IncompleteHistory, fetch_windowed, split_range
+
+
+class TestWindowedFetch(unittest.TestCase):
+    def test_split_range(self):
+        self.assertEqual(split_range(date(2023, 1, 1), date(2023, 1, 10), 4), [
+            (date(2023, 1, 1), date(2023, 1, 4)),
+            (date(2023, 1, 5), date(2023, 1, 8)),
+            (date(2023, 1, 9), date(2023, 1, 10)),
+        ])
+
+    def test_only_failed_windows_are_retried(self):
+        calls = []
+
+        def fetch(symbol, start, end):
+            calls.append(start)
+            if start == date(2023, 1, 5) and calls.count(start) == 1:
+                raise ConnectionError("throttled")
+            return [{"date": start.isoformat()}, {"date": end.isoformat()}]
+
+        records = fetch_windowed(fetch, "AAPL", date(2023, 1, 1), date(2023, 1, 10), 4, max_workers=3)
+        self.assertEqual(sorted(calls), [date(2023, 1, 1), date(2023, 1, 5), date(2023, 1, 5), date(2023, 1, 9)])
+        self.assertEqual([r["date"] for r in records],
+                         ["2023-01-01", "2023-01-04", "2023-01-05", "2023-01-08", "2023-01-09", "2023-01-10"])
+
+    def test_windows_without_data_are_not_retried(self):
+        calls = []
+
+        def fetch(symbol, start, end):
+            calls.append(start)
+            # Listed on 2023-01-09: earlier windows have no data
+            return [{"date": end.isoformat()}] if start >= date(2023, 1, 9) else None
+
+        records = fetch_windowed(fetch, "NEWCO", date(2023, 1, 1), date(2023, 1, 10), 4, retries=2)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual([r["date"] for r in records], ["2023-01-10"])
+
+    def test_windows_failing_every_retry_raise_with_the_rest(self):
+        def fetch(symbol, start, end):
+            if start == date(2023, 1, 5):
+                raise ConnectionError("https://www.nseindia.com 429: Too Many Requests")
+            return [{"date": start.isoformat()}]
+
+        with self.assertRaises(IncompleteHistory) as ctx:
+            fetch_windowed(fetch, "INFY", date(2023, 1, 1), date(2023, 1, 10), 4)
+        self.assertEqual([r["date"] for r in ctx.exception.records], ["2023-01-01", "2023-01-09"])
+
+    def test_all_windows_failing_returns_none(self):
+        self.assertIsNone(fetch_windowed(lambda s, a, b: None, "AAPL", date(2023, 1, 1), date(2023, 3, 1), 10))
+
+
+if __name__ == "__main__":
+    unittest.main()